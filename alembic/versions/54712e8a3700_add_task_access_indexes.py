@@ -0,0 +1,41 @@
+"""add task access indexes
+
+Revision ID: 54712e8a3700
+Revises: 3b5866556292
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '54712e8a3700'
+down_revision: Union[str, Sequence[str], None] = '3b5866556292'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_user_id_due_date', 'tasks', ['user_id', 'due_date', 'id'])
+    op.create_index('ix_tasks_user_id_status', 'tasks', ['user_id', 'status', 'due_date', 'id'])
+    op.create_index('ix_tasks_user_id_priority', 'tasks', ['user_id', 'priority', 'due_date', 'id'])
+    op.create_index(
+        'ix_tasks_user_id_due_date_open',
+        'tasks',
+        ['user_id', 'due_date', 'id'],
+        postgresql_where=sa.text("status <> 'completed'")
+    )
+    op.create_index('ix_tasks_category_id', 'tasks', ['category_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_category_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_due_date_open', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_priority', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_status', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_due_date', table_name='tasks')
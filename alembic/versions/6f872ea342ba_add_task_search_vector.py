@@ -0,0 +1,66 @@
+"""add task search vector
+
+Revision ID: 6f872ea342ba
+Revises: 54712e8a3700
+Create Date: 2026-10-17 11:03:27.905412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f872ea342ba'
+down_revision: Union[str, Sequence[str], None] = '54712e8a3700'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    op.add_column('tasks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_tasks_user_id_search_vector',
+        'tasks',
+        ['user_id', 'search_vector'],
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_tasks_user_id_title_trgm',
+        'tasks',
+        ['user_id', 'title'],
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_tasks_user_id_description_trgm',
+        'tasks',
+        ['user_id', 'description'],
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_id_description_trgm', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_title_trgm', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_search_vector', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
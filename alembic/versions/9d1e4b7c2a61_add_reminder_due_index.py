@@ -0,0 +1,28 @@
+"""add reminder due index
+
+Revision ID: 9d1e4b7c2a61
+Revises: 6f872ea342ba
+Create Date: 2026-10-17 14:26:08.512730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d1e4b7c2a61'
+down_revision: Union[str, Sequence[str], None] = '6f872ea342ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_reminders_is_sent_reminder_time', 'reminders', ['is_sent', 'reminder_time'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reminders_is_sent_reminder_time', table_name='reminders')
@@ -0,0 +1,33 @@
+"""add sync indexes
+
+Revision ID: b7e2d4a91c56
+Revises: f3a7c9d21b84
+Create Date: 2026-10-17 20:14:53.218840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4a91c56'
+down_revision: Union[str, Sequence[str], None] = 'f3a7c9d21b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SYNC_TABLES = ['tasks', 'categories', 'reminders']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in SYNC_TABLES:
+        op.create_index(f'ix_{table}_user_id_updated_at', table, ['user_id', 'updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SYNC_TABLES:
+        op.drop_index(f'ix_{table}_user_id_updated_at', table_name=table)
@@ -0,0 +1,52 @@
+"""add reminder user id
+
+Revision ID: c41f0a9e7b52
+Revises: 9d1e4b7c2a61
+Create Date: 2026-10-17 15:02:44.187356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f0a9e7b52'
+down_revision: Union[str, Sequence[str], None] = '9d1e4b7c2a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reminders', sa.Column('user_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'reminders_user_id_fkey', 'reminders', 'users',
+        ['user_id'], ['id'], ondelete='CASCADE'
+    )
+
+    # Task reminders belong to the task owner. Existing task-less reminders
+    # were never tied to a user and stay ownerless.
+    op.execute("""
+        UPDATE reminders
+        SET user_id = tasks.user_id
+        FROM tasks
+        WHERE reminders.task_id = tasks.id
+    """)
+
+    op.create_index('ix_reminders_user_id', 'reminders', ['user_id'])
+    op.create_index(
+        'ix_reminders_user_id_upcoming',
+        'reminders',
+        ['user_id', 'reminder_time', 'id'],
+        postgresql_where=sa.text('is_sent = false')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reminders_user_id_upcoming', table_name='reminders')
+    op.drop_index('ix_reminders_user_id', table_name='reminders')
+    op.drop_constraint('reminders_user_id_fkey', 'reminders', type_='foreignkey')
+    op.drop_column('reminders', 'user_id')
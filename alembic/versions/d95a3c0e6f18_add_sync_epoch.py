@@ -0,0 +1,28 @@
+"""add sync epoch
+
+Revision ID: d95a3c0e6f18
+Revises: b7e2d4a91c56
+Create Date: 2026-10-17 22:41:07.512306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd95a3c0e6f18'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d4a91c56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('sync_epoch_seq')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence('sync_epoch_seq')))
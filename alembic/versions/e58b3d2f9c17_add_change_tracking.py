@@ -0,0 +1,108 @@
+"""add change tracking
+
+Revision ID: e58b3d2f9c17
+Revises: c41f0a9e7b52
+Create Date: 2026-10-17 16:40:12.774021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e58b3d2f9c17'
+down_revision: Union[str, Sequence[str], None] = 'c41f0a9e7b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRACKED_TABLES = ['users', 'categories', 'tasks', 'attachments', 'subtasks', 'comments', 'reminders']
+NEW_UPDATED_AT_TABLES = ['users', 'categories', 'attachments', 'subtasks', 'reminders']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in NEW_UPDATED_AT_TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    for table in TRACKED_TABLES:
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'])
+
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_deleted_at', 'tombstones', ['deleted_at'])
+    op.create_index('ix_tombstones_user_id_deleted_at', 'tombstones', ['user_id', 'deleted_at'])
+
+    # updated_at must move on every write, including bulk UPDATE statements
+    # that bypass the ORM; an explicitly assigned value is kept.
+    op.execute("""
+        CREATE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+                NEW.updated_at := now();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Rows without a user_id column are attributed through their task; the
+    # task may already be gone when the delete cascades from it.
+    op.execute("""
+        CREATE FUNCTION record_tombstone() RETURNS trigger AS $$
+        DECLARE
+            old_row jsonb := to_jsonb(OLD);
+            owner_id integer;
+        BEGIN
+            IF TG_TABLE_NAME = 'users' THEN
+                owner_id := OLD.id;
+            ELSIF old_row ? 'user_id' THEN
+                owner_id := (old_row ->> 'user_id')::integer;
+            ELSIF old_row ? 'task_id' THEN
+                SELECT user_id INTO owner_id FROM tasks WHERE id = (old_row ->> 'task_id')::integer;
+            END IF;
+
+            INSERT INTO tombstones (table_name, row_id, user_id)
+            VALUES (TG_TABLE_NAME, OLD.id, owner_id);
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in TRACKED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_set_updated_at
+            BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_record_tombstone
+            AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION record_tombstone()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_record_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER {table}_set_updated_at ON {table}")
+    op.execute("DROP FUNCTION record_tombstone()")
+    op.execute("DROP FUNCTION set_updated_at()")
+
+    op.drop_index('ix_tombstones_user_id_deleted_at', table_name='tombstones')
+    op.drop_index('ix_tombstones_deleted_at', table_name='tombstones')
+    op.drop_table('tombstones')
+
+    for table in TRACKED_TABLES:
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+    for table in NEW_UPDATED_AT_TABLES:
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,30 @@
+"""add user prefix indexes
+
+Revision ID: f3a7c9d21b84
+Revises: e58b3d2f9c17
+Create Date: 2026-10-17 18:02:41.906315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a7c9d21b84'
+down_revision: Union[str, Sequence[str], None] = 'e58b3d2f9c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_email_pattern', 'users', ['email'], postgresql_ops={'email': 'varchar_pattern_ops'})
+    op.create_index('ix_users_username_pattern', 'users', ['username'], postgresql_ops={'username': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_username_pattern', table_name='users')
+    op.drop_index('ix_users_email_pattern', table_name='users')
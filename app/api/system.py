@@ -8,7 +8,9 @@ from datetime import datetime
 from typing import Any
 
 from app.config import settings
+from app.core import get_password_hash_metrics
 from app.database import engine
+from app.services.reminder_dispatcher import reminder_dispatcher
 
 router = APIRouter(tags=["System"])
 
@@ -85,7 +87,9 @@ async def get_metrics() -> dict[str, Any]:
         "service": settings.API_TITLE,
         "version": settings.API_VERSION,
         "debug": settings.DEBUG,
-        "database_status": await _get_db_status()
+        "database_status": await _get_db_status(),
+        "password_hashing": get_password_hash_metrics(),
+        "reminders": await reminder_dispatcher.get_metrics()
     }
 
 
@@ -2,22 +2,27 @@
 Admin API endpoints for dashboard, backup, logs, and settings management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text
-from typing import Annotated, Any
-from datetime import datetime
-from pathlib import Path
+from typing import Annotated, Any, Literal
+from datetime import datetime, timedelta
+import asyncio
 import json
 import shutil
 import os
 
+from app.config import settings
 from app.database import get_db, engine
 from app.dependencies import get_admin
+from app.crud import reconcile_task_counters
 from app.models import User, Task, Category, Attachment, Subtask, Comment, Reminder
+from app.services import BACKUP_ROOT, create_job, get_job, run_backup, latest_manifest, backup_chain, run_restore, \
+                         LOG_LEVELS, log_path, normalize_level, tail_records, follow_records, get_or_compute
 from app.schemas.admin import (
     AdminDashboardOut,
+    AdminJobOut,
     AdminSettingsOut,
     AdminSettingsUpdate,
     BackupOut
@@ -29,212 +34,173 @@ router = APIRouter(
     dependencies=[Depends(get_admin)]
 )
 
-# Configuration
-BACKUP_ROOT = Path("backups")
-BACKUP_ROOT.mkdir(exist_ok=True)
+_DASHBOARD_MODELS = {
+    "users_count": User,
+    "tasks_count": Task,
+    "categories_count": Category,
+    "attachments_count": Attachment,
+    "subtasks_count": Subtask,
+    "comments_count": Comment,
+    "reminders_count": Reminder,
+}
+
+
+async def _estimate_table_counts(session: AsyncSession) -> dict[str, int]:
+    """Planner row estimates from pg_class; tables never analyzed are left out."""
+    tables = {model.__tablename__: field for field, model in _DASHBOARD_MODELS.items()}
+    result = await session.execute(
+        text(
+            "SELECT relname, reltuples::bigint AS estimate FROM pg_class "
+            "WHERE oid = ANY(CAST(:tables AS regclass[]))"
+        ),
+        {"tables": list(tables)}
+    )
+    return {tables[row.relname]: row.estimate for row in result if row.estimate >= 0}
+
+
+async def _compute_dashboard(session: AsyncSession, estimate: bool) -> dict[str, Any]:
+    counts: dict[str, int] = {}
+    if estimate and engine.dialect.name == "postgresql":
+        counts = await _estimate_table_counts(session)
+    
+    # Everything that is not estimated is counted in a single round trip
+    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+    columns = [
+        select(func.count()).select_from(model).scalar_subquery().label(field)
+        for field, model in _DASHBOARD_MODELS.items()
+        if field not in counts
+    ]
+    columns.append(
+        select(func.count()).select_from(User).where(User.last_login >= thirty_days_ago)
+        .scalar_subquery().label("active_users_count")
+    )
+    row = (await session.execute(select(*columns))).one()
+    counts.update(row._asdict())
+    
+    return AdminDashboardOut(
+        **{field: counts.get(field) or 0 for field in AdminDashboardOut.model_fields if field.endswith("_count")},
+        db_dialect=engine.dialect.name,
+        estimated=estimate and engine.dialect.name == "postgresql",
+        timestamp=datetime.utcnow()
+    ).model_dump(mode="json")
 
 
 @router.get("/dashboard", response_model=AdminDashboardOut)
 async def get_admin_dashboard(
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    estimate: Annotated[bool, Query(description="Use planner estimates for table sizes instead of exact counts")] = False
 ) -> AdminDashboardOut:
     """
     Get admin dashboard statistics.
     
-    Returns counts for all main entities and database information.
+    Returns counts for all main entities and database information. All
+    counts are fetched in one query, optionally using pg_class estimates for
+    the table sizes, and the result is cached for
+    ADMIN_DASHBOARD_CACHE_TTL_SECONDS and shared by every worker;
+    ``timestamp`` tells when it was computed.
     """
     try:
-        # Get counts for each model
-        users_count = await session.scalar(select(func.count(User.id)))
-        tasks_count = await session.scalar(select(func.count(Task.id)))
-        categories_count = await session.scalar(select(func.count(Category.id)))
-        attachments_count = await session.scalar(select(func.count(Attachment.id)))
-        subtasks_count = await session.scalar(select(func.count(Subtask.id)))
-        comments_count = await session.scalar(select(func.count(Comment.id)))
-        reminders_count = await session.scalar(select(func.count(Reminder.id)))
-        
-        # Get database info
-        db_dialect = engine.dialect.name
-        
-        # Get active users count (logged in within last 30 days)
-        from datetime import timedelta
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        active_users = await session.scalar(
-            select(func.count(User.id)).where(User.last_login >= thirty_days_ago)
-        )
-        
-        return AdminDashboardOut(
-            users_count=users_count or 0,
-            tasks_count=tasks_count or 0,
-            categories_count=categories_count or 0,
-            attachments_count=attachments_count or 0,
-            subtasks_count=subtasks_count or 0,
-            comments_count=comments_count or 0,
-            reminders_count=reminders_count or 0,
-            active_users_count=active_users or 0,
-            db_dialect=db_dialect,
-            timestamp=datetime.utcnow()
+        data = await get_or_compute(
+            f"admin_dashboard:{'estimate' if estimate else 'exact'}",
+            settings.ADMIN_DASHBOARD_CACHE_TTL_SECONDS,
+            lambda: _compute_dashboard(session, estimate)
         )
+        return AdminDashboardOut.model_validate(data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch dashboard data: {str(e)}")
 
 
-@router.get("/backup", response_model=BackupOut)
+@router.get("/backup", response_model=BackupOut, status_code=202)
 async def create_database_backup(
-    session: Annotated[AsyncSession, Depends(get_db)]
+    background_tasks: BackgroundTasks,
+    mode: Annotated[Literal["full", "incremental"], Query()] = "full"
 ) -> BackupOut:
     """
-    Create a database backup (PostgreSQL).
+    Start a database backup.
     
-    For PostgreSQL, creates a JSON export of key tables.
-    Returns metadata about the backup file.
+    Every table is streamed to a gzip-compressed NDJSON file in a background
+    job. An incremental backup only contains the rows changed and deleted
+    since the latest backup. Poll /admin/jobs/{job_id} for progress.
     """
-    try:
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"backup_{timestamp}.json"
-        backup_path = BACKUP_ROOT / backup_filename
-        
-        # Export data from all tables to JSON
-        backup_data = {
-            "backup_metadata": {
-                "created_at": datetime.utcnow().isoformat(),
-                "database_type": "postgresql",
-                "version": "1.0"
-            },
-            "users": [],
-            "tasks": [],
-            "categories": [],
-            "attachments": [],
-            "subtasks": [],
-            "comments": [],
-            "reminders": []
-        }
-        
-        # Export users (exclude sensitive data)
-        users = await session.execute(select(User))
-        for user in users.scalars():
-            backup_data["users"].append({
-                "id": user.id,
-                "email": user.email,
-                "username": user.username,
-                "is_active": user.is_active,
-                "is_verified": user.is_verified,
-                "is_superuser": user.is_superuser,
-                "created_at": user.created_at.isoformat() if user.created_at else None,
-                "timezone": user.timezone
-            })
-        
-        # Export tasks
-        tasks = await session.execute(select(Task))
-        for task in tasks.scalars():
-            backup_data["tasks"].append({
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "status": task.status,
-                "priority": task.priority,
-                "user_id": task.user_id,
-                "category_id": task.category_id,
-                "created_at": task.created_at.isoformat() if task.created_at else None,
-                "updated_at": task.updated_at.isoformat() if task.updated_at else None,
-                "due_date": task.due_date.isoformat() if task.due_date else None
-            })
-        
-        # Export categories
-        categories = await session.execute(select(Category))
-        for category in categories.scalars():
-            backup_data["categories"].append({
-                "id": category.id,
-                "name": category.name,
-                "user_id": category.user_id,
-                "created_at": category.created_at.isoformat() if category.created_at else None
-            })
-        
-        # Export attachments
-        attachments = await session.execute(select(Attachment))
-        for attachment in attachments.scalars():
-            backup_data["attachments"].append({
-                "id": attachment.id,
-                "filename": attachment.filename,
-                "file_path": attachment.file_path,
-                "mime_type": attachment.mime_type,
-                "file_size": attachment.file_size,
-                "task_id": attachment.task_id,
-                "user_id": attachment.user_id,
-                "created_at": attachment.created_at.isoformat() if attachment.created_at else None
-            })
-        
-        # Export subtasks
-        subtasks = await session.execute(select(Subtask))
-        for subtask in subtasks.scalars():
-            backup_data["subtasks"].append({
-                "id": subtask.id,
-                "title": subtask.title,
-                "is_completed": subtask.is_completed,
-                "task_id": subtask.task_id,
-                "created_at": subtask.created_at.isoformat() if subtask.created_at else None,
-                "updated_at": subtask.updated_at.isoformat() if subtask.updated_at else None
-            })
-        
-        # Export comments
-        comments = await session.execute(select(Comment))
-        for comment in comments.scalars():
-            backup_data["comments"].append({
-                "id": comment.id,
-                "content": comment.content,
-                "task_id": comment.task_id,
-                "user_id": comment.user_id,
-                "created_at": comment.created_at.isoformat() if comment.created_at else None,
-                "updated_at": comment.updated_at.isoformat() if comment.updated_at else None
-            })
-        
-        # Export reminders
-        reminders = await session.execute(select(Reminder))
-        for reminder in reminders.scalars():
-            backup_data["reminders"].append({
-                "id": reminder.id,
-                "message": reminder.message,
-                "remind_at": reminder.remind_at.isoformat() if reminder.remind_at else None,
-                "is_sent": reminder.is_sent,
-                "task_id": reminder.task_id,
-                "created_at": reminder.created_at.isoformat() if reminder.created_at else None
-            })
-        
-        # Write backup to file
-        with open(backup_path, 'w') as f:
-            json.dump(backup_data, f, indent=2)
-        
-        file_size = backup_path.stat().st_size
-        
-        return BackupOut(
-            detail="Backup created successfully",
-            backup_path=str(backup_path),
-            backup_filename=backup_filename,
-            created_at=datetime.utcnow(),
-            file_size=file_size
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create backup: {str(e)}")
+    if mode == "incremental" and await asyncio.to_thread(latest_manifest) is None:
+        raise HTTPException(status_code=400, detail="No previous backup to base an incremental backup on")
+    
+    job = await create_job("backup", mode=mode)
+    background_tasks.add_task(run_backup, job, mode)
+    
+    return BackupOut(
+        detail="Backup started",
+        job_id=job["job_id"],
+        status=job["status"],
+        backup_path=str(BACKUP_ROOT / job["job_id"]),
+        created_at=job["created_at"]
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=AdminJobOut)
+async def get_admin_job(job_id: str) -> AdminJobOut:
+    """Get the status and progress of a backup or restore job."""
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return AdminJobOut(**job)
 
 
-@router.post("/restore")
+@router.post("/restore", response_model=AdminJobOut, status_code=202)
 async def restore_database(
-    session: Annotated[AsyncSession, Depends(get_db)]
-) -> dict[str, str]:
+    background_tasks: BackgroundTasks,
+    backup_id: Annotated[str, Query(description="Id of the backup to restore")],
+    confirm: Annotated[bool, Query(description="Must be true: all current data is replaced")] = False
+) -> AdminJobOut:
+    """
+    Restore the database from a backup.
+    
+    Every backed up table is truncated and reloaded with COPY in a single
+    transaction by a background job. Poll /admin/jobs/{job_id} for progress.
     """
-    Restore database from backup.
+    if not confirm:
+        raise HTTPException(status_code=400, detail="Restore replaces all data; pass confirm=true to proceed")
     
-    NOTE: This is a sensitive operation. For PostgreSQL databases,
-    manual restore using pg_restore is recommended for production.
+    if await asyncio.to_thread(backup_chain, backup_id) is None:
+        raise HTTPException(status_code=404, detail="Backup, or a backup it depends on, not found or incomplete")
+    
+    job = await create_job("restore", backup_id=backup_id)
+    background_tasks.add_task(run_restore, job, backup_id)
+    return AdminJobOut(**job)
+
+
+@router.post("/task-counters/reconcile")
+async def reconcile_task_counter_cache(
+    session: Annotated[AsyncSession, Depends(get_db)]
+) -> dict[str, Any]:
+    """
+    Reconcile the per-user task counters.
     
-    This endpoint returns 501 (Not Implemented) for safety.
+    Recomputes every materialized counter hash from the tasks table, drops
+    the ones that drifted so the next read rebuilds them, and reports the
+    differences found.
     """
-    raise HTTPException(
-        status_code=501,
-        detail="Database restore must be performed manually using pg_restore. "
-               "Please use: pg_restore -U admin -d todo < backup_file"
-    )
+    try:
+        report = await reconcile_task_counters(session)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reconcile task counters: {str(e)}")
+    
+    return {
+        "detail": "Task counters reconciled",
+        **report
+    }
+
+
+def _parse_log_level(level: str | None) -> str | None:
+    if level is None:
+        return None
+    normalized = normalize_level(level)
+    if normalized is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown log level '{level}'. Use one of: {', '.join(LOG_LEVELS)}"
+        )
+    return normalized
 
 
 @router.get("/logs")
@@ -245,16 +211,18 @@ async def get_application_logs(
     """
     Get application logs.
     
-    Returns recent log entries. By default returns last 200 lines.
+    Returns the most recent log records, oldest first. The log is read
+    backwards from its end, continuing into rotated (and gzipped) segments
+    when needed, so the cost depends on the number of records requested and
+    not on the size of the log.
     
     Args:
-        lines: Number of lines to return (1-5000, default 200)
-        level: Filter by log level (optional)
+        lines: Number of records to return (1-5000, default 200)
+        level: Minimum log level, e.g. WARNING returns warnings, errors and critical records (optional)
     """
-    # Check if log file exists (configured log path)
-    log_file_path = Path("logs/app.log")
+    min_level = _parse_log_level(level)
     
-    if not log_file_path.exists():
+    if not log_path().exists():
         # Return a message that file logging is not configured
         return {
             "detail": "File logging not configured. Application logs to stdout only.",
@@ -263,26 +231,53 @@ async def get_application_logs(
         }
     
     try:
-        # Read last N lines efficiently
-        with open(log_file_path, 'r') as f:
-            # Read all lines and get last N
-            all_lines = f.readlines()
-            recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-            
-            # Filter by level if specified
-            if level:
-                level_upper = level.upper()
-                recent_lines = [line for line in recent_lines if level_upper in line]
-            
-            return {
-                "detail": "Logs retrieved successfully",
-                "logs": [line.strip() for line in recent_lines],
-                "total_lines": len(recent_lines),
-                "requested_lines": lines,
-                "filter_level": level
-            }
+        records = await asyncio.to_thread(tail_records, lines, min_level)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read logs: {str(e)}")
+    
+    return {
+        "detail": "Logs retrieved successfully",
+        "logs": [record["text"] for record in records],
+        "total_lines": len(records),
+        "requested_lines": lines,
+        "filter_level": min_level
+    }
+
+
+@router.get("/logs/stream")
+async def stream_application_logs(
+    level: Annotated[str | None, Query()] = None
+) -> StreamingResponse:
+    """
+    Follow application logs live as Server-Sent Events.
+    
+    Each new record is sent as a ``log`` event whose data is
+    ``{"level": ..., "text": ...}``; a comment is sent while the log is idle
+    to keep the connection open. Log rotation is followed.
+    
+    Args:
+        level: Minimum log level (optional)
+    """
+    min_level = _parse_log_level(level)
+    
+    if not log_path().exists():
+        raise HTTPException(
+            status_code=404,
+            detail="File logging not configured. Application logs to stdout only."
+        )
+    
+    async def events():
+        async for record in follow_records(min_level):
+            if record is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: log\ndata: {json.dumps(record, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/settings", response_model=AdminSettingsOut)
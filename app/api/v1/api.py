@@ -9,6 +9,8 @@ from .subtask import router as subtask_router
 from .comment import router as comment_router
 from .reminder import router as reminder_router
 from .admin import router as admin_router
+from .imports import router as imports_router
+from .sync import router as sync_router
 
 
 router = APIRouter(prefix="/v1")
@@ -22,3 +24,5 @@ router.include_router(subtask_router)
 router.include_router(comment_router)
 router.include_router(reminder_router)
 router.include_router(admin_router)
+router.include_router(imports_router)
+router.include_router(sync_router)
\ No newline at end of file
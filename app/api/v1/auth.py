@@ -9,9 +9,9 @@ import shutil
 from app.schemas import UserIn, UserLogIn, UserOutResponse, UserOut, UserUpdate, UserChangePassword, UserNewPassword, UserForgotPassword
 from app.database import get_db
 from app.models import User
-from app.crud import create_user, get_user_by_email, set_login_date_now, set_verified_true, update_user_data, update_profile_image_path, delete_profile_image_path, update_user_password
+from app.crud import create_user, get_user_by_email, set_login_date_now, set_verified_true, update_user_data, update_profile_image_path, delete_profile_image_path, update_user_password, get_user_password_hash
 from app.services import save_refresh_token, get_user_email_by_refresh_token, delete_refresh_token
-from app.core import verify_password, create_access_token, create_refresh_token, create_email_verify_token, get_email_by_email_verify_token, create_password_reset_token, get_email_by_password_reset_token
+from app.core import verify_password_async, create_access_token, create_refresh_token, create_email_verify_token, get_email_by_email_verify_token, create_password_reset_token, get_email_by_password_reset_token
 from app.tasks import send_verify_email_task, send_reset_password_email_task
 from app.config import settings
 from app.dependencies import get_current_user
@@ -85,7 +85,7 @@ async def login_user(
 ):
     user_db = await get_user_by_email(session, user.email)
 
-    if not user_db or not verify_password(user.password, user_db.hashed_password):
+    if not user_db or not await verify_password_async(user.password, user_db.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     if not user_db.is_active:
@@ -246,7 +246,9 @@ async def change_password(
     change_password: Annotated[UserChangePassword, Body()]
 ) -> dict[str, Any]:
     
-    if not verify_password(change_password.old_password, user.hashed_password):
+    # The current user may come from the cache, which does not hold the hash
+    hashed_password = await get_user_password_hash(session, user.id)
+    if hashed_password is None or not await verify_password_async(change_password.old_password, hashed_password):
         raise HTTPException(status_code=401, detail="Old password is incorrect")
     
     user_updated = await update_user_password(session, user.email, change_password.new_password)
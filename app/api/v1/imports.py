@@ -0,0 +1,77 @@
+"""
+Bulk import of tasks, subtasks and comments from an archive.
+"""
+import asyncio
+import shutil
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+
+from typing import Annotated
+from datetime import datetime
+from pathlib import PurePath
+
+from app.dependencies import get_current_user
+from app.schemas import ImportJobOut
+from app.config import settings
+from app.services import IMPORT_ROOT, new_job_id, create_job, get_job, save_job
+from app.tasks import import_tasks_task
+from app.utils.storage import save_upload_file
+from app.models import User
+
+
+router = APIRouter(
+    prefix="/imports",
+    tags=["Imports"],
+)
+
+
+@router.post("", response_model=ImportJobOut, status_code=202)
+async def create_import(
+    archive: Annotated[UploadFile, File(description="tar (optionally gzip/bz2/xz compressed) or zip archive")],
+    user: Annotated[User, Depends(get_current_user)],
+    strict: Annotated[bool, Query(description="Import nothing if any row is invalid")] = False,
+) -> ImportJobOut:
+    """
+    Start importing tasks with their subtasks and comments.
+
+    The archive holds ``tasks.ndjson``, ``subtasks.ndjson`` and
+    ``comments.ndjson`` (optionally gzipped). Every task has a ``ref`` that
+    subtasks and comments point to with ``task_ref``. The import runs in the
+    worker; poll /imports/{job_id} for progress and rejected rows. Archives
+    larger than IMPORT_MAX_UPLOAD_BYTES are rejected with 413.
+    """
+    job_id = new_job_id("import")
+    suffixes = "".join(PurePath(archive.filename or "").suffixes[-2:])
+    archive_path = IMPORT_ROOT / job_id / f"archive{suffixes}"
+    try:
+        await save_upload_file(archive, archive_path, max_size=settings.IMPORT_MAX_UPLOAD_BYTES)
+    except Exception:
+        await asyncio.to_thread(shutil.rmtree, archive_path.parent, True)
+        raise
+
+    job = await create_job(
+        "import", job_id,
+        user_id=user.id, strict=strict, archive_path=str(archive_path),
+        phase=None, imported={}, error_count=0, errors=[]
+    )
+    try:
+        await asyncio.to_thread(import_tasks_task.delay, job_id)
+    except Exception as exc:
+        # Nothing will pick the archive up
+        await asyncio.to_thread(shutil.rmtree, archive_path.parent, True)
+        job.update(status="failed", finished_at=datetime.utcnow(), error=f"Could not queue the import: {exc}")
+        await save_job(job)
+        raise HTTPException(status_code=503, detail="Could not queue the import, try again later")
+    return ImportJobOut(**job)
+
+
+@router.get("/{job_id}", response_model=ImportJobOut)
+async def get_import(
+    job_id: str,
+    user: Annotated[User, Depends(get_current_user)],
+) -> ImportJobOut:
+    """Get the status, progress and rejected rows of an import."""
+    job = await get_job(job_id)
+    if job is None or job.get("type") != "import" or (job["user_id"] != user.id and not user.is_superuser):
+        raise HTTPException(status_code=404, detail="Import not found")
+    return ImportJobOut(**job)
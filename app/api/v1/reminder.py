@@ -3,7 +3,7 @@ from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_current_user
-from app.schemas import ReminderOut, ReminderCreate, ReminderUpdate, TaskReminderCreate
+from app.schemas import ReminderOut, ReminderCreate, ReminderUpdate, TaskReminderCreate, ReminderOutPage
 from app.crud import (
     list_reminders,
     get_reminder,
@@ -13,7 +13,7 @@ from app.crud import (
     list_upcoming_reminders
 )
 from app.database import get_db
-from app.models import User, Task
+from app.models import User, Reminder
 from app.api.v1.deps import check_task_access
 
 
@@ -23,6 +23,12 @@ router = APIRouter(
 )
 
 
+def _check_reminder_access(reminder: Reminder, user: User) -> None:
+    # Task reminders are owned by the task owner, so this matches check_task_access
+    if not user.is_superuser and reminder.user_id != user.id:
+        raise HTTPException(status_code=403, detail="You do not have access to this reminder")
+
+
 @router.get("/", response_model=list[ReminderOut])
 async def get_all_reminders(
     user: Annotated[User, Depends(get_current_user)],
@@ -41,25 +47,31 @@ async def create_reminder_endpoint(
 ) -> ReminderOut:
     """Create a new reminder."""
     # If task_id is provided, verify user has access to that task
+    owner_id = user.id
     if reminder_data.task_id:
         try:
-            await check_task_access(reminder_data.task_id, user, session)
+            task = await check_task_access(reminder_data.task_id, user, session)
         except HTTPException:
             raise HTTPException(status_code=403, detail="You do not have access to this task")
+        owner_id = task.user_id
     
-    reminder = await create_reminder(session, reminder_data)
+    reminder = await create_reminder(session, reminder_data, owner_id)
     return reminder
 
 
-@router.get("/upcoming", response_model=list[ReminderOut])
+@router.get("/upcoming", response_model=ReminderOutPage)
 async def get_upcoming_reminders(
     user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
     limit: Annotated[int, Query(ge=1, le=100)] = 20
-) -> list[ReminderOut]:
+):
     """Get upcoming unsent reminders (soonest first)."""
-    reminders = await list_upcoming_reminders(session, user.id, limit)
-    return reminders
+    reminders, next_cursor = await list_upcoming_reminders(session, user.id, cursor, limit)
+    return {
+        "reminders": reminders,
+        "next_cursor": next_cursor
+    }
 
 
 @router.get("/{reminder_id}", response_model=ReminderOut)
@@ -72,11 +84,7 @@ async def get_reminder_endpoint(
     reminder = await get_reminder(session, reminder_id)
     
     # Enforce access control
-    if reminder.task_id:
-        try:
-            await check_task_access(reminder.task_id, user, session)
-        except HTTPException:
-            raise HTTPException(status_code=403, detail="You do not have access to this reminder")
+    _check_reminder_access(reminder, user)
     
     return reminder
 
@@ -92,11 +100,7 @@ async def update_reminder_endpoint(
     reminder = await get_reminder(session, reminder_id)
     
     # Enforce access control
-    if reminder.task_id:
-        try:
-            await check_task_access(reminder.task_id, user, session)
-        except HTTPException:
-            raise HTTPException(status_code=403, detail="You do not have access to this reminder")
+    _check_reminder_access(reminder, user)
     
     updated_reminder = await update_reminder(session, reminder, update_data)
     return updated_reminder
@@ -112,11 +116,7 @@ async def delete_reminder_endpoint(
     reminder = await get_reminder(session, reminder_id)
     
     # Enforce access control
-    if reminder.task_id:
-        try:
-            await check_task_access(reminder.task_id, user, session)
-        except HTTPException:
-            raise HTTPException(status_code=403, detail="You do not have access to this reminder")
+    _check_reminder_access(reminder, user)
     
     await delete_reminder(session, reminder_id)
     return {
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+
+from typing import Annotated
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.dependencies import get_current_user
+from app.schemas import SyncOut
+from app.crud import get_sync_changes
+from app.models import User
+
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"],
+)
+
+
+@router.get("", response_model=SyncOut)
+async def sync_changes(
+    user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    since: Annotated[str | None, Query(description="Token returned by the previous sync; omit for a full sync")] = None,
+    limit: Annotated[int, Query(ge=1, le=5000, description="Maximum number of rows and tombstones")] = 1000,
+):
+    """
+    Get the tasks, subtasks, comments, categories and reminders changed since
+    ``since``, and the ids of those deleted.
+
+    If ``full`` is true (no token, a token older than the tombstone
+    retention, or one taken before a restore), everything is returned and the local copy should be replaced.
+    Large feeds are split into pages of ``limit`` rows; keep syncing with the
+    returned token while ``has_more`` is true.
+    """
+    return await get_sync_changes(session, user, since, limit)
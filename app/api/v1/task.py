@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, Body, Query, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Body, Query, HTTPException, Request, UploadFile, File
+from fastapi.responses import FileResponse, StreamingResponse
 
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
 
 from app.dependencies import get_current_user
-from app.schemas import TaskIn, TaskOutResponse, TaskOut, TaskUpdate, StatusEnum, PriorityEnum, TaskOutBulkResponse, TaskBulkUpdateStatus, AttachmentOut, MimeTypeEnum, SubtaskOut, SubtaskCreate, CommentOut, CommentCreate, ReminderOut, TaskReminderCreate
-from app.crud import create_task, get_all_tasks_of_user, update_task, delete_task, update_priority, update_status, create_bulk_task, delete_bulk_task, \
+from app.schemas import TaskIn, TaskOutResponse, TaskOut, TaskOutPage, TaskSearchPage, TaskUpdate, StatusEnum, PriorityEnum, TaskOutBulkResponse, TaskBulkUpdateStatus, AttachmentOut, MimeTypeEnum, SubtaskOut, SubtaskCreate, CommentOut, CommentCreate, ReminderOut, TaskReminderCreate
+from app.crud import create_task, get_all_tasks_of_user, update_task, delete_task, update_priority, update_status, create_bulk_task, create_tasks_from_stream, delete_bulk_task, \
+                     stream_tasks_of_user, TASK_EXPORT_COLUMNS, \
                      update_status_bulk, search_tasks, get_task_statistics, get_todays_tasks, get_tomorrows_tasks, get_this_weeks_tasks, get_this_months_tasks, \
                      get_overdue_tasks, get_tasks_by_status, get_tasks_by_priority, \
                      get_all_attachment_of_task, create_attachment, get_attachment_by_id, delete_attachment, \
@@ -18,6 +19,7 @@ from app.database import get_db
 from app.models import User, Task
 from app.api.v1.deps import check_task_access
 from app.config import settings
+from app.utils import iter_ndjson, encode_ndjson_rows, encode_csv_rows, gzip_chunks
 from app.utils.storage import build_storage_paths, save_upload_file
 
 
@@ -41,40 +43,89 @@ async def add_task(
         "task": task_db
     }
 
-@router.get("/", response_model=list[TaskOut])
+@router.get("/", response_model=TaskOutPage)
 async def read_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
     status: Annotated[StatusEnum | None, Query()] = None,
-    priority: Annotated[PriorityEnum | None, Query()] = None
-):
-    tasks = await get_all_tasks_of_user(session, user, status, priority)
-    return tasks
+    priority: Annotated[PriorityEnum | None, Query()] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
+) -> dict[str, Any]:
+    tasks, next_cursor = await get_all_tasks_of_user(session, user, status, priority, cursor, limit)
+    return {
+        "tasks": tasks,
+        "next_cursor": next_cursor
+    }
 
-@router.get("/search", response_model=list[TaskOut])
+@router.get("/search", response_model=TaskSearchPage)
 async def search_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
     query: Annotated[str, Query()],
     status: Annotated[StatusEnum | None, Query()] = None,
     priority: Annotated[PriorityEnum | None, Query()] = None,
-):
-    tasks = await search_tasks(session, user, query, status, priority)
-    return tasks
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
+) -> dict[str, Any]:
+    results, next_cursor = await search_tasks(session, user, query, status, priority, cursor, limit)
+    return {
+        "results": results,
+        "next_cursor": next_cursor
+    }
 
 @router.get("/statistics")
 async def get_statistics(
     user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
-) -> dict[str, int | dict[str, int]]:
+) -> dict[str, Any]:
     return await get_task_statistics(session, user)
 
+@router.get("/export")
+async def export_tasks(
+    user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    format: Annotated[Literal["ndjson", "csv"], Query()] = "ndjson",
+    gzip: Annotated[bool, Query()] = False
+) -> StreamingResponse:
+    """
+    Download all of the user's tasks as NDJSON or CSV.
+
+    Rows are streamed from a server-side cursor as they are read, so memory
+    stays flat and the download starts immediately however many tasks there
+    are. With ``gzip`` the file is compressed on the fly.
+    """
+    async def rows():
+        if format == "csv":
+            yield encode_csv_rows([TASK_EXPORT_COLUMNS])
+        async for batch in stream_tasks_of_user(session, user):
+            if format == "csv":
+                yield encode_csv_rows(batch)
+            else:
+                yield encode_ndjson_rows(TASK_EXPORT_COLUMNS, batch)
+
+    filename = f"tasks.{format}"
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    body = rows()
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+        body = gzip_chunks(body)
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/overdue", response_model=TaskOutBulkResponse)
 async def get_overdue_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_overdue_tasks(session, user)
+    tasks, next_cursor = await get_overdue_tasks(session, user, cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any overdue tasks.")
@@ -82,15 +133,18 @@ async def get_overdue_all_tasks(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} overdue tasks found.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/pending", response_model=TaskOutBulkResponse)
 async def get_pending_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_tasks_by_status(session, user, "pending")
+    tasks, next_cursor = await get_tasks_by_status(session, user, "pending", cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks with 'pending' status.")
@@ -98,15 +152,18 @@ async def get_pending_all_tasks(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} tasks found with 'pending' status.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/in-progress", response_model=TaskOutBulkResponse)
 async def get_in_progress_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_tasks_by_status(session, user, "in_progress")
+    tasks, next_cursor = await get_tasks_by_status(session, user, "in_progress", cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks with 'in_progress' status.")
@@ -114,15 +171,18 @@ async def get_in_progress_all_tasks(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} tasks found with 'in_progress' status.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/completed", response_model=TaskOutBulkResponse)
 async def get_completed_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_tasks_by_status(session, user, "completed")
+    tasks, next_cursor = await get_tasks_by_status(session, user, "completed", cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks with 'completed' status.")
@@ -130,15 +190,18 @@ async def get_completed_all_tasks(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} tasks found with 'completed' status.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/priority/low", response_model=TaskOutBulkResponse)
 async def get_low_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_tasks_by_priority(session, user, "low")
+    tasks, next_cursor = await get_tasks_by_priority(session, user, "low", cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks with 'low' priority.")
@@ -146,15 +209,18 @@ async def get_low_all_tasks(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} tasks found with 'low' priority.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/priority/medium", response_model=TaskOutBulkResponse)
 async def get_medium_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_tasks_by_priority(session, user, "medium")
+    tasks, next_cursor = await get_tasks_by_priority(session, user, "medium", cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks with 'medium' priority.")
@@ -162,15 +228,18 @@ async def get_medium_all_tasks(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} tasks found with 'medium' priority.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/priority/high", response_model=TaskOutBulkResponse)
 async def get_high_all_tasks(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_tasks_by_priority(session, user, "high")
+    tasks, next_cursor = await get_tasks_by_priority(session, user, "high", cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks with 'high' priority.")
@@ -178,7 +247,8 @@ async def get_high_all_tasks(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} tasks found with 'high' priority.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/{task_id}", response_model=TaskOut)
@@ -239,6 +309,25 @@ async def create_tasks(
         "tasks": created_tasks
     }
 
+@router.post("/bulk/ndjson")
+async def create_tasks_from_ndjson(
+    request: Request,
+    user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)]
+) -> dict[str, Any]:
+    """
+    Create tasks from a newline-delimited JSON body, one TaskIn object per line.
+
+    The body is parsed while it is received and inserted in batches, so large
+    imports never hold the whole payload in memory. The import is atomic.
+    """
+    created_count = await create_tasks_from_stream(session, iter_ndjson(request.stream()), user)
+    return {
+        "status": "ok",
+        "message": f"Total {created_count} tasks created",
+        "created_count": created_count
+    }
+
 @router.delete("/bulk")
 async def delete_tasks(
     task_ids: Annotated[list[int], Body(..., embed=True)],
@@ -270,9 +359,11 @@ async def update_status_bulk_by_ids(
 @router.get("/due/today", response_model=TaskOutBulkResponse)
 async def get_todays_all_task(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_todays_tasks(session, user)
+    tasks, next_cursor = await get_todays_tasks(session, user, cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks for today.")
@@ -280,15 +371,18 @@ async def get_todays_all_task(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} today's tasks found.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/due/tomorrow", response_model=TaskOutBulkResponse)
 async def get_tomorrows_all_task(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_tomorrows_tasks(session, user)
+    tasks, next_cursor = await get_tomorrows_tasks(session, user, cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks for tomorrow.")
@@ -296,15 +390,18 @@ async def get_tomorrows_all_task(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} tomorrow's tasks found.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/due/this-week", response_model=TaskOutBulkResponse)
 async def get_weeks_all_task(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_this_weeks_tasks(session, user)
+    tasks, next_cursor = await get_this_weeks_tasks(session, user, cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks for this week.")
@@ -312,15 +409,18 @@ async def get_weeks_all_task(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} this week's tasks found.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/due/this-month", response_model=TaskOutBulkResponse)
 async def get_months_all_task(
     user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_db)]
+    session: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ) -> dict[str, Any]:
-    tasks = await get_this_months_tasks(session, user)
+    tasks, next_cursor = await get_this_months_tasks(session, user, cursor=cursor, limit=limit)
 
     if not tasks:
         raise HTTPException(status_code=404, detail="You do not have any tasks for month.")
@@ -328,7 +428,8 @@ async def get_months_all_task(
     return {
         "status": "ok",
         "message": f"Total {len(tasks)} this month's tasks found.",
-        "tasks": tasks
+        "tasks": tasks,
+        "next_cursor": next_cursor
     }
 
 @router.get("/{task_id}/attachments", response_model=list[AttachmentOut])
@@ -485,5 +586,5 @@ async def create_reminder_for_task(
         task_id=task.id,
         reminder_time=reminder_data.reminder_time
     )
-    reminder = await create_reminder(session, reminder_create)
+    reminder = await create_reminder(session, reminder_create, task.user_id)
     return reminder
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, Query, Path, HTTPException, Body, UploadFile, File
 from fastapi.responses import FileResponse
 
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
+from datetime import datetime
 import shutil
 
 from app.database import get_db
-from app.schemas import UserOutAdmin, UserOutAdminResponse, UserUpdateAdmin
+from app.schemas import UserOutAdmin, UserOutAdminPage, UserOutAdminResponse, UserUpdateAdmin
 from app.dependencies import get_admin
 from app.crud import get_all_users, get_user_by_id, delete_user_by_id, ban_user_by_id, unban_user_by_id, update_user_data_admin, get_user_statistics, update_profile_image_path_by_id, delete_profile_image_path_by_id
 
@@ -20,17 +21,41 @@ router = APIRouter(
 
 MEDIA_ROOT = Path("media/profile_images")
 
-@router.get("/", response_model=list[UserOutAdmin])
+@router.get("/", response_model=UserOutAdminPage)
 async def read_all_users(
     session: Annotated[AsyncSession, Depends(get_db)],
-    limit: Annotated[int, Query()] = 1000,
-    skip: Annotated[int, Query()] = 0,
-):
-    return await get_all_users(session, limit, skip)
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    is_active: Annotated[bool | None, Query()] = None,
+    is_verified: Annotated[bool | None, Query()] = None,
+    created_from: Annotated[datetime | None, Query()] = None,
+    created_to: Annotated[datetime | None, Query()] = None,
+    email_prefix: Annotated[str | None, Query(max_length=55)] = None,
+    username_prefix: Annotated[str | None, Query(max_length=255)] = None,
+    with_total: Annotated[bool, Query(description="Include the planner's estimate of matching users")] = False
+) -> dict[str, Any]:
+    users, next_cursor, total = await get_all_users(
+        session, cursor, limit,
+        is_active=is_active,
+        is_verified=is_verified,
+        created_from=created_from,
+        created_to=created_to,
+        email_prefix=email_prefix,
+        username_prefix=username_prefix,
+        with_total=with_total
+    )
+    return {
+        "users": users,
+        "next_cursor": next_cursor,
+        "approximate_total": total
+    }
 
 @router.get("/statistics")
-async def get_statistics(session: Annotated[AsyncSession, Depends(get_db)]):
-    return await get_user_statistics(session)
+async def get_statistics(
+    session: Annotated[AsyncSession, Depends(get_db)],
+    series: Annotated[Literal["day", "week"] | None, Query()] = None
+):
+    return await get_user_statistics(session, series)
 
 @router.get("/{user_id}", response_model=UserOutAdmin)
 async def get_user_id(
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,6 +15,24 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: str
     MAILTRAP_API_TOKEN: str
     MEDIA_ROOT: str = "media/attachments"
+    TASK_BULK_MAX_BATCH_SIZE: int = 1000
+    TASK_BULK_STREAM_MAX_ROWS: int = 100000
+    LOG_FILE: str = "logs/app.log"
+    ADMIN_DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    USER_STATISTICS_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_TTL_SECONDS: int = 300
+    USER_CACHE_LOCAL_TTL_SECONDS: int = 5
+    USER_CACHE_MAX_SIZE: int = 10000
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_SLOW_CONSUMER_POLICY: Literal["drop_oldest", "coalesce", "disconnect"] = "drop_oldest"
+    REMINDER_DISPATCH_ENABLED: bool = True
+    REMINDER_DISPATCH_BATCH_SIZE: int = 1000
+    REMINDER_SCHEDULER_HORIZON_MINUTES: int = 10
+    REMINDER_SCHEDULER_MAX_PRELOAD: int = 100000
+    TOMBSTONE_RETENTION_DAYS: int = 30
+    IMPORT_MAX_UPLOAD_BYTES: int = 100 * 1024 * 1024
     
     model_config = SettingsConfigDict(env_file=".env")
 
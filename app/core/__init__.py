@@ -1,7 +1,7 @@
-from .security import get_password_hash, verify_password, create_access_token, create_refresh_token, create_email_verify_token, get_email_by_email_verify_token, create_password_reset_token, get_email_by_password_reset_token
+from .security import get_password_hash, verify_password, get_password_hash_async, verify_password_async, get_password_hash_metrics, create_access_token, create_refresh_token, create_email_verify_token, get_email_by_email_verify_token, create_password_reset_token, get_email_by_password_reset_token
 from .celery_app import celery_app
 
 __all__ = [
-    "get_password_hash", "verify_password", "create_access_token", "create_refresh_token", "create_email_verify_token", "get_email_by_email_verify_token", "create_password_reset_token", "get_email_by_password_reset_token",
+    "get_password_hash", "verify_password", "get_password_hash_async", "verify_password_async", "get_password_hash_metrics", "create_access_token", "create_refresh_token", "create_email_verify_token", "get_email_by_email_verify_token", "create_password_reset_token", "get_email_by_password_reset_token",
     "celery_app",
 ]
\ No newline at end of file
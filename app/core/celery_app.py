@@ -1,4 +1,5 @@
 from celery import Celery # pyright: ignore[reportMissingTypeStubs]
+from celery.schedules import crontab # pyright: ignore[reportMissingTypeStubs]
 
 from app.config import settings
 
@@ -7,7 +8,7 @@ celery_app = Celery(
     "worker",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks.email"]
+    include=["app.tasks.email", "app.tasks.media", "app.tasks.imports", "app.tasks.maintenance"]
 )
 
 celery_app.conf.update( # type: ignore
@@ -18,4 +19,10 @@ celery_app.conf.update( # type: ignore
     enable_utc=True,
     task_track_started=True,
     task_time_limit=30 * 60,
+    beat_schedule={
+        "prune-tombstones": {
+            "task": "app.tasks.maintenance.prune_tombstones_task",
+            "schedule": crontab(hour=3, minute=0),
+        },
+    },
 )
\ No newline at end of file
@@ -1,8 +1,11 @@
 from passlib.context import CryptContext
 from jose import jwt, JWTError, ExpiredSignatureError
 from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
 
-from typing import Any
+from typing import Any, Callable, TypeVar
 from fastapi import HTTPException
 
 from app.config import settings
@@ -38,6 +41,77 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+T = TypeVar("T")
+
+# bcrypt releases the GIL, so a small thread pool is enough to keep it off the event loop.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_hash_pending = 0
+_hash_metrics: dict[str, float] = {
+    "completed": 0,
+    "rejected": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+}
+
+async def _run_in_hash_pool(func: Callable[..., T], *args: Any) -> T:
+    global _hash_pending
+
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        _hash_metrics["rejected"] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+    queued_at = time.perf_counter()
+
+    def _timed() -> tuple[float, T]:
+        return time.perf_counter() - queued_at, func(*args)
+
+    _hash_pending += 1
+    try:
+        wait, result = await asyncio.get_running_loop().run_in_executor(_hash_executor, _timed)
+    finally:
+        _hash_pending -= 1
+
+    _hash_metrics["completed"] += 1
+    _hash_metrics["wait_seconds_total"] += wait
+    _hash_metrics["wait_seconds_max"] = max(_hash_metrics["wait_seconds_max"], wait)
+    return result
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hashes a password on the password hashing thread pool.
+
+    Raises:
+        HTTPException: 503 if too many hashing jobs are already pending.
+    """
+    return await _run_in_hash_pool(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a password on the password hashing thread pool.
+
+    Raises:
+        HTTPException: 503 if too many hashing jobs are already pending.
+    """
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+def get_password_hash_metrics() -> dict[str, float]:
+    """Returns counters and queue wait times of the password hashing pool."""
+    completed = _hash_metrics["completed"]
+    return {
+        **_hash_metrics,
+        "pending": _hash_pending,
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "wait_seconds_avg": _hash_metrics["wait_seconds_total"] / completed if completed else 0.0,
+    }
+
 def create_access_token(data: dict[str, Any], expires_delta: int | None = None) -> str:
     to_encode = data.copy()
     expires = datetime.now(tz=timezone.utc) + timedelta(minutes=expires_delta if expires_delta else settings.ACCESS_TOKEN_EXPIRE_MINUTES)
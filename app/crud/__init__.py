@@ -1,21 +1,25 @@
-from .user import create_user, get_user_by_email, set_login_date_now, set_verified_true, update_user_data, update_profile_image_path, delete_profile_image_path, update_user_password, \
+from .user import create_user, get_user_by_email, get_user_password_hash, set_login_date_now, set_verified_true, update_user_data, update_profile_image_path, delete_profile_image_path, update_user_password, \
                   get_all_users, get_user_by_id, delete_user_by_id, ban_user_by_id, unban_user_by_id, update_user_data_admin, get_user_statistics, update_profile_image_path_by_id, delete_profile_image_path_by_id
-from .task import create_task, get_all_tasks_of_user, get_task_by_task_id, update_task, delete_task, update_status, update_priority, create_bulk_task, delete_bulk_task, update_status_bulk, search_tasks, get_task_statistics, \
-                  get_todays_tasks, get_tomorrows_tasks, get_this_weeks_tasks, get_this_months_tasks, get_overdue_tasks, get_tasks_by_status, get_tasks_by_priority
+from .task import create_task, get_all_tasks_of_user, get_task_by_task_id, update_task, delete_task, update_status, update_priority, create_bulk_task, create_tasks_from_stream, stream_tasks_of_user, TASK_EXPORT_COLUMNS, delete_bulk_task, update_status_bulk, search_tasks, get_task_statistics, \
+                  get_todays_tasks, get_tomorrows_tasks, get_this_weeks_tasks, get_this_months_tasks, get_overdue_tasks, get_tasks_by_status, get_tasks_by_priority, \
+                  compute_task_counters, load_task_counters, reconcile_task_counters
 from .category import get_all_categories, create_category, get_category, update_category, delete_category, get_all_tasks_by_category, get_category_statistics
 from .attachment import get_all_attachment_of_task, get_attachment_by_id, create_attachment, delete_attachment
 from .subtask import list_subtasks_by_task, create_subtask, get_subtask, update_subtask, delete_subtask
 from .comment import list_comments_by_task, create_comment, get_comment, update_comment, delete_comment
-from .reminder import list_reminders, get_reminder, create_reminder, update_reminder, delete_reminder, list_upcoming_reminders
+from .reminder import list_reminders, get_reminder, create_reminder, update_reminder, delete_reminder, list_upcoming_reminders, claim_reminders, get_pending_reminder_times, get_oldest_due_reminder_time
+from .sync import get_sync_changes, prune_tombstones
 
 __all__ = [
-    "create_user", "get_user_by_email", "set_login_date_now", "set_verified_true", "update_user_data", "update_profile_image_path", "delete_profile_image_path", "update_user_password",
+    "create_user", "get_user_by_email", "get_user_password_hash", "set_login_date_now", "set_verified_true", "update_user_data", "update_profile_image_path", "delete_profile_image_path", "update_user_password",
     "get_all_users", "get_user_by_id", "delete_user_by_id", "ban_user_by_id", "unban_user_by_id", "update_user_data_admin", "get_user_statistics", "update_profile_image_path_by_id", "delete_profile_image_path_by_id",
-    "create_task", "get_all_tasks_of_user", "get_task_by_task_id", "update_task", "delete_task", "update_status", "update_priority", "create_bulk_task", "delete_bulk_task", "update_status_bulk", "search_tasks", "get_task_statistics",
+    "create_task", "get_all_tasks_of_user", "get_task_by_task_id", "update_task", "delete_task", "update_status", "update_priority", "create_bulk_task", "create_tasks_from_stream", "stream_tasks_of_user", "TASK_EXPORT_COLUMNS", "delete_bulk_task", "update_status_bulk", "search_tasks", "get_task_statistics",
     "get_todays_tasks", "get_tomorrows_tasks", "get_this_weeks_tasks", "get_this_months_tasks", "get_overdue_tasks", "get_tasks_by_status", "get_tasks_by_priority", 
+    "compute_task_counters", "load_task_counters", "reconcile_task_counters",
     "get_all_categories", "create_category", "get_category", "update_category", "delete_category", "get_all_tasks_by_category", "get_category_statistics",
     "get_all_attachment_of_task", "get_attachment_by_id", "create_attachment", "delete_attachment",
     "list_subtasks_by_task", "create_subtask", "get_subtask", "update_subtask", "delete_subtask",
     "list_comments_by_task", "create_comment", "get_comment", "update_comment", "delete_comment",
-    "list_reminders", "get_reminder", "create_reminder", "update_reminder", "delete_reminder", "list_upcoming_reminders",
+    "list_reminders", "get_reminder", "create_reminder", "update_reminder", "delete_reminder", "list_upcoming_reminders", "claim_reminders", "get_pending_reminder_times", "get_oldest_due_reminder_time",
+    "get_sync_changes", "prune_tombstones",
 ]
\ No newline at end of file
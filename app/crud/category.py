@@ -1,4 +1,4 @@
-from sqlalchemy import and_, update, func, case
+from sqlalchemy import and_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
@@ -8,6 +8,8 @@ from typing import Any
 
 from app.models import User, Category, Task
 from app.schemas import CategoryIn, CategoryUpdate, StatusEnum
+from app.services import drop_category_counters
+from .task import load_task_counters
 
 
 async def get_all_categories(session: AsyncSession, user: User):
@@ -75,6 +77,8 @@ async def delete_category(session: AsyncSession, category_id: int, user: User):
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+    await drop_category_counters(user.id, category_id)
         
 async def get_all_tasks_by_category(session: AsyncSession, category_id: int, user: User):
     stmt = select(Task).where(and_(Task.category_id == category_id, Task.user_id == user.id))
@@ -94,42 +98,16 @@ async def get_category_statistics(
             Category.name.label("name"),
             Category.color,
             Category.icon,
-
-            func.count(Task.id).label("total_tasks"),
-
-            func.sum(
-                case(
-                    (Task.status == StatusEnum.completed, 1),
-                    else_=0
-                )
-            ).label("completed_tasks"),
-
-            func.sum(
-                case(
-                    (Task.status == StatusEnum.pending, 1),
-                    else_=0
-                )
-            ).label("pending_tasks"),
-
-            func.sum(
-                case(
-                    (Task.status == StatusEnum.in_progress, 1),
-                    else_=0
-                )
-            ).label("in_progress_tasks"),
-        )
-        .outerjoin(
-            Task,
-            Task.category_id == Category.id
         )
         .where(Category.user_id == user.id)
-        .group_by(Category.id)
         .order_by(Category.created_at)
     )
 
     result = await session.execute(stmt)
     rows = result.mappings().all()
 
+    counters = await load_task_counters(session, user.id)
+
     return {
         "total_categories": len(rows),
         "categories": [
@@ -138,10 +116,10 @@ async def get_category_statistics(
                 "name": row["name"],
                 "color": row["color"],
                 "icon": row["icon"],
-                "total_tasks": row["total_tasks"],
-                "completed_tasks": row["completed_tasks"] or 0,
-                "pending_tasks": row["pending_tasks"] or 0,
-                "in_progress_tasks": row["in_progress_tasks"] or 0,
+                "total_tasks": counters.get(f"category:{row['id']}:total", 0),
+                "completed_tasks": counters.get(f"category:{row['id']}:status:{StatusEnum.completed.value}", 0),
+                "pending_tasks": counters.get(f"category:{row['id']}:status:{StatusEnum.pending.value}", 0),
+                "in_progress_tasks": counters.get(f"category:{row['id']}:status:{StatusEnum.in_progress.value}", 0),
             }
             for row in rows
         ]
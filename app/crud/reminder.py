@@ -1,22 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete, and_
+from sqlalchemy import delete, update, func, tuple_
 
 from datetime import datetime
+from typing import Any, Sequence
 from fastapi import HTTPException
 
-from app.models import Reminder, Task
+from app.models import Reminder, Task, User
 from app.schemas import ReminderCreate, ReminderUpdate
+from app.utils import encode_cursor, decode_cursor, cursor_int, cursor_datetime
+from app.services import publish_reminder_change
 
 
 async def list_reminders(session: AsyncSession, user_id: int) -> list[Reminder]:
-    """List all reminders for a user (through task access)."""
+    """List all reminders of a user."""
     stmt = (
         select(Reminder)
-        .join(Task, Reminder.task_id == Task.id, isouter=True)
-        .where(
-            (Task.user_id == user_id) | (Reminder.task_id.is_(None))
-        )
+        .where(Reminder.user_id == user_id)
         .order_by(Reminder.reminder_time.desc())
     )
     result = await session.execute(stmt)
@@ -35,11 +35,13 @@ async def get_reminder(session: AsyncSession, reminder_id: int) -> Reminder:
 
 async def create_reminder(
     session: AsyncSession,
-    reminder_data: ReminderCreate
+    reminder_data: ReminderCreate,
+    user_id: int
 ) -> Reminder:
-    """Create a new reminder."""
+    """Create a new reminder owned by ``user_id`` (the task owner for task reminders)."""
     reminder = Reminder(
         task_id=reminder_data.task_id,
+        user_id=user_id,
         reminder_time=reminder_data.reminder_time,
         is_sent=False
     )
@@ -48,11 +50,13 @@ async def create_reminder(
         session.add(reminder)
         await session.commit()
         await session.refresh(reminder)
-        return reminder
     except Exception as exc:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(exc))
 
+    await publish_reminder_change(reminder.id, reminder.reminder_time)
+    return reminder
+
 
 async def update_reminder(
     session: AsyncSession,
@@ -82,11 +86,13 @@ async def update_reminder(
     try:
         await session.commit()
         await session.refresh(reminder)
-        return reminder
     except Exception as exc:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(exc))
 
+    await publish_reminder_change(reminder.id, None if reminder.is_sent else reminder.reminder_time)
+    return reminder
+
 
 async def delete_reminder(session: AsyncSession, reminder_id: int) -> None:
     """Delete a reminder."""
@@ -102,26 +108,119 @@ async def delete_reminder(session: AsyncSession, reminder_id: int) -> None:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(exc))
 
+    await publish_reminder_change(reminder_id, None)
+
 
 async def list_upcoming_reminders(
     session: AsyncSession,
     user_id: int,
+    cursor: str | None = None,
     limit: int = 20
-) -> list[Reminder]:
-    """List upcoming unsent reminders (reminder_time >= now, is_sent = False) for a user."""
+) -> tuple[Sequence[Reminder], str | None]:
+    """
+    List upcoming unsent reminders of a user, soonest first.
+
+    Pages are keyed on (reminder_time, id), so every page is a range scan of
+    the partial ix_reminders_user_id_upcoming index.
+    """
+    stmt = select(Reminder).where(
+        Reminder.user_id == user_id,
+        Reminder.is_sent == False
+    )
+    if cursor is None:
+        stmt = stmt.where(Reminder.reminder_time >= datetime.utcnow())
+    else:
+        reminder_time_raw, last_id = decode_cursor(cursor, 2)
+        after = (cursor_datetime(reminder_time_raw), cursor_int(last_id))
+        stmt = stmt.where(tuple_(Reminder.reminder_time, Reminder.id) > tuple_(*after))
+
+    stmt = stmt.order_by(Reminder.reminder_time.asc(), Reminder.id.asc()).limit(limit + 1)
+    result = await session.execute(stmt)
+    reminders = result.scalars().all()
+
+    if len(reminders) <= limit:
+        return reminders, None
+
+    reminders = reminders[:limit]
+    last = reminders[-1]
+    return reminders, encode_cursor([last.reminder_time, last.id])
+
+
+async def _claim_reminders(session: AsyncSession, *criteria: Any, limit: int) -> list[Any]:
+    """
+    Atomically claim up to ``limit`` due reminders matching ``criteria`` and mark them sent.
+
+    Rows locked by a concurrent dispatcher are skipped, so every reminder is
+    claimed by exactly one caller. Returns the claimed reminders together with
+    the task title and the owner's id and email.
+    """
     now = datetime.utcnow()
+    due = (
+        select(Reminder.id)
+        .where(
+            Reminder.is_sent == False,
+            Reminder.reminder_time <= now,
+            *criteria
+        )
+        .order_by(Reminder.reminder_time)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    sent = (
+        update(Reminder)
+        .where(Reminder.id == due.c.id)
+        .values(is_sent=True, sent_at=now)
+        .returning(Reminder.id, Reminder.task_id, Reminder.user_id, Reminder.reminder_time)
+        .cte("sent")
+    )
     stmt = (
-        select(Reminder)
-        .join(Task, Reminder.task_id == Task.id, isouter=True)
+        select(
+            sent.c.id,
+            sent.c.task_id,
+            sent.c.user_id,
+            sent.c.reminder_time,
+            Task.title.label("task_title"),
+            User.email
+        )
+        .select_from(sent)
+        .join(Task, Task.id == sent.c.task_id, isouter=True)
+        .join(User, User.id == sent.c.user_id, isouter=True)
+    )
+    try:
+        result = await session.execute(stmt)
+        rows = list(result.all())
+        await session.commit()
+        return rows
+    except Exception:
+        await session.rollback()
+        raise
+
+
+async def claim_reminders(session: AsyncSession, reminder_ids: list[int]) -> list[Any]:
+    """Claim the given reminders if they are due and still unsent, see _claim_reminders."""
+    return await _claim_reminders(session, Reminder.id.in_(reminder_ids), limit=len(reminder_ids))
+
+
+async def get_pending_reminder_times(session: AsyncSession, until: datetime, limit: int) -> list[tuple[int, datetime]]:
+    """Return (id, reminder_time) of unsent reminders due before ``until``, oldest first."""
+    stmt = (
+        select(Reminder.id, Reminder.reminder_time)
         .where(
-            and_(
-                Reminder.reminder_time >= now,
-                Reminder.is_sent == False,
-                (Task.user_id == user_id) | (Reminder.task_id.is_(None))
-            )
+            Reminder.is_sent == False,
+            Reminder.reminder_time <= until
         )
-        .order_by(Reminder.reminder_time.asc())
+        .order_by(Reminder.reminder_time)
         .limit(limit)
     )
     result = await session.execute(stmt)
-    return list(result.scalars().all())
+    return [(row.id, row.reminder_time) for row in result]
+
+
+async def get_oldest_due_reminder_time(session: AsyncSession) -> datetime | None:
+    """Return the reminder_time of the oldest due reminder that has not been sent."""
+    stmt = select(func.min(Reminder.reminder_time)).where(
+        Reminder.is_sent == False,
+        Reminder.reminder_time <= datetime.utcnow()
+    )
+    return await session.scalar(stmt)
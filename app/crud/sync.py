@@ -0,0 +1,180 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, func, tuple_
+
+from fastapi import HTTPException
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple
+
+from app.config import settings
+from app.models import Task, Subtask, Comment, Category, Reminder, Tombstone, User
+from app.utils import encode_cursor, decode_cursor
+from app.services import get_sync_epoch
+
+
+SYNC_TABLES = ("tasks", "subtasks", "comments", "categories", "reminders")
+SYNC_PAGE_SIZE = 1000
+
+# A feed reads the tables in this order, then the tombstones
+_STAGES = (*SYNC_TABLES, "deleted")
+
+# updated_at is set at transaction start, so a row may become visible after a
+# sync whose token is already past its timestamp; rows this close to the
+# token are sent again on the next sync.
+SYNC_OVERLAP = timedelta(minutes=5)
+
+
+class _SyncToken(NamedTuple):
+    """
+    ``epoch`` is the restore count when the feed started. ``until`` is None once a feed is drained; ``since`` is then its watermark.
+    Otherwise the token continues a feed of the rows changed after ``since``
+    (None for a full feed) up to ``until``, from ``after`` in ``stage``.
+    """
+    epoch: int
+    since: datetime | None
+    until: datetime | None
+    stage: int
+    after: tuple[datetime, int] | None
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    return None if value is None else datetime.fromisoformat(value)
+
+
+def _decode_token(token: str) -> _SyncToken:
+    try:
+        epoch, since, until, stage, after_at, after_id = decode_cursor(token, 6)
+        if type(epoch) is not int:
+            raise ValueError("invalid epoch")
+        state = _SyncToken(epoch, _parse_timestamp(since), _parse_timestamp(until), 0, None)
+        if state.until is None:
+            if state.since is None:
+                raise ValueError("drained token without a watermark")
+            return state
+        if type(stage) is not int or not 0 <= stage < len(_STAGES):
+            raise ValueError("unknown stage")
+        if after_at is None and after_id is None:
+            return state._replace(stage=stage)
+        if type(after_id) is not int:
+            raise ValueError("invalid position")
+        return state._replace(stage=stage, after=(datetime.fromisoformat(after_at), after_id))
+    except (HTTPException, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+def _stage_query(stage: str, user: User) -> tuple[Any, Any, Any]:
+    """(statement, changed-at column, id column) of a stage, scoped to the user."""
+    if stage == "deleted":
+        stmt = (
+            select(Tombstone.table_name.label("table"), Tombstone.row_id.label("id"), Tombstone.deleted_at, Tombstone.id.label("position"))
+            .where(Tombstone.user_id == user.id, Tombstone.table_name.in_(SYNC_TABLES))
+        )
+        return stmt, Tombstone.deleted_at, Tombstone.id
+
+    queries: dict[str, tuple[Any, Any]] = {
+        "tasks": (Task, select(Task).where(Task.user_id == user.id)),
+        "subtasks": (Subtask, select(Subtask).join(Task, Subtask.task_id == Task.id).where(Task.user_id == user.id)),
+        "comments": (Comment, select(Comment).join(Task, Comment.task_id == Task.id).where(Task.user_id == user.id)),
+        "categories": (Category, select(Category).where(Category.user_id == user.id)),
+        "reminders": (Reminder, select(Reminder).where(Reminder.user_id == user.id)),
+    }
+    model, stmt = queries[stage]
+    return stmt, model.updated_at, model.id
+
+
+async def _read_stage(
+    session: AsyncSession,
+    user: User,
+    stage: str,
+    since: datetime | None,
+    until: datetime,
+    after: tuple[datetime, int] | None,
+    limit: int
+) -> list[tuple[tuple[datetime, int], Any]]:
+    """Up to ``limit`` (position, row) pairs of a stage in (changed at, id) order."""
+    stmt, changed_at, id_column = _stage_query(stage, user)
+    stmt = stmt.where(changed_at <= until)
+    if since is not None:
+        stmt = stmt.where(changed_at > since)
+    if after is not None:
+        stmt = stmt.where(tuple_(changed_at, id_column) > tuple_(*after))
+    stmt = stmt.order_by(changed_at, id_column).limit(limit)
+
+    result = await session.execute(stmt)
+    if stage == "deleted":
+        return [((row.deleted_at, row.position), row._asdict()) for row in result]
+    return [((row.updated_at, row.id), row) for row in result.scalars().all()]
+
+
+async def get_sync_changes(
+    session: AsyncSession,
+    user: User,
+    since: str | None = None,
+    limit: int = SYNC_PAGE_SIZE
+) -> dict[str, Any]:
+    """
+    Rows of the user changed since a sync token, plus the tombstones of rows
+    deleted since, at most ``limit`` of them per call.
+
+    Without a token, with one older than the tombstone retention, or with one
+    taken before a restore, every row is returned and ``full`` is set. A feed covers the changes up to a
+    watermark taken on its first page, so nothing changed meanwhile is missed.
+    While ``has_more`` is set the token continues the same feed; the token
+    only moves past the watermark once the feed is drained.
+    """
+    # Columns are timestamp without time zone, hence localtimestamp
+    now: datetime = await session.scalar(select(func.localtimestamp()))  # type: ignore
+    horizon = now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    epoch = await get_sync_epoch(session)
+
+    state = _decode_token(since) if since else None
+    if state is None or state.epoch != epoch:
+        # A restore rewound updated_at and cleared the tombstones
+        state = _SyncToken(epoch, None, now, 0, None)
+    elif state.until is None:
+        state = _SyncToken(epoch, state.since - SYNC_OVERLAP, now, 0, None)  # type: ignore
+    if state.since is not None and state.since < horizon:
+        # Tombstones since then may be gone; start over with a full feed
+        state = _SyncToken(epoch, None, now, 0, None)
+
+    full = state.since is None
+    changes: dict[str, Any] = {"full": full, **{table: [] for table in _STAGES}}
+    stage, after, remaining = state.stage, state.after, limit
+
+    while stage < len(_STAGES) and remaining > 0:
+        name = _STAGES[stage]
+        if name == "deleted" and full:
+            stage += 1
+            continue
+        rows = await _read_stage(session, user, name, state.since, state.until, after, remaining + 1)  # type: ignore
+        if len(rows) > remaining:
+            rows = rows[:remaining]
+            after = rows[-1][0]
+        else:
+            stage, after = stage + 1, None
+        changes[name] = [row for _, row in rows]
+        remaining -= len(rows)
+
+    if full and stage == len(_STAGES) - 1:
+        stage += 1
+    changes["has_more"] = stage < len(_STAGES)
+    if changes["has_more"]:
+        after_at, after_id = after if after is not None else (None, None)
+        changes["token"] = encode_cursor([epoch, state.since, state.until, stage, after_at, after_id])
+    else:
+        changes["token"] = encode_cursor([epoch, state.until, None, None, None, None])
+    return changes
+
+
+async def prune_tombstones(session: AsyncSession) -> int:
+    """Delete the tombstones older than TOMBSTONE_RETENTION_DAYS and return how many went."""
+    stmt = delete(Tombstone).where(
+        Tombstone.deleted_at < func.localtimestamp() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    )
+    try:
+        result = await session.execute(stmt)
+        await session.commit()
+        return result.rowcount  # type: ignore
+    except Exception as exc:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=str(exc))
@@ -1,14 +1,69 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, delete, and_, or_, func
+from sqlalchemy import insert, update, delete, and_, or_, any_, func, literal, cast, tuple_, Float, Integer, String, Select
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG
 
 from fastapi import HTTPException
+from pydantic import ValidationError
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
+from typing import Any, AsyncIterator, Sequence
+from collections import Counter
+import asyncio
 import calendar
 
-from app.models import Task, User
+from app.config import settings
+from app.models import Attachment, Category, Task, User
+from app.models.task import SEARCH_CONFIG
 from app.schemas import TaskIn, TaskUpdate, StatusEnum, PriorityEnum, TaskBulkUpdateStatus
+from app.utils import encode_cursor, decode_cursor, cursor_int, cursor_number, cursor_datetime
+from app.tasks import remove_media_files_task
+from app.services import task_counter_delta, task_counter_delta_of, incr_task_counters, get_task_counters, begin_task_counter_rebuild, install_task_counters, delete_task_counters, iter_task_counter_user_ids
+
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def _decode_page_cursor(cursor: str) -> tuple[datetime | None, int]:
+    due_date_raw, last_id = decode_cursor(cursor, 2)
+    due_date = cursor_datetime(due_date_raw) if due_date_raw is not None else None
+    return due_date, cursor_int(last_id)
+
+
+async def _fetch_page(session: AsyncSession, stmt: Select[tuple[Task]], cursor: str | None, limit: int) -> tuple[Sequence[Task], str | None]:
+    """
+    Apply keyset pagination on (due_date, id) to a task query.
+
+    Tasks without a due date sort last, matching PostgreSQL's default for ASC.
+    Dated and undated tasks are read by two separate queries, each a range
+    scan starting at the cursor: a row comparison on (due_date, id), then
+    ``due_date IS NULL AND id > x`` to top up a short page. A single OR of
+    both cases cannot bound the index scan, so deep pages would get slower.
+    One extra row is fetched to know whether another page exists.
+    """
+    after = _decode_page_cursor(cursor) if cursor is not None else None
+
+    tasks: list[Task] = []
+    if after is None or after[0] is not None:
+        dated = stmt.where(Task.due_date.is_not(None))
+        if after is not None:
+            dated = dated.where(tuple_(Task.due_date, Task.id) > tuple_(*after))
+        dated = dated.order_by(Task.due_date.asc(), Task.id.asc()).limit(limit + 1)
+        tasks.extend((await session.scalars(dated)).all())
+
+    if len(tasks) <= limit:
+        undated = stmt.where(Task.due_date.is_(None))
+        if after is not None and after[0] is None:
+            undated = undated.where(Task.id > after[1])
+        undated = undated.order_by(Task.id.asc()).limit(limit + 1 - len(tasks))
+        tasks.extend((await session.scalars(undated)).all())
+
+    if len(tasks) <= limit:
+        return tasks, None
+
+    tasks = tasks[:limit]
+    last = tasks[-1]
+    return tasks, encode_cursor([last.due_date, last.id])
 
 
 async def create_task(session: AsyncSession, task: TaskIn, user: User):
@@ -18,29 +73,141 @@ async def create_task(session: AsyncSession, task: TaskIn, user: User):
         session.add(task_db)
         await session.commit()
         await session.refresh(task_db)
-        return task_db
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+    await incr_task_counters(user.id, task_counter_delta_of(task_db))
+    return task_db
     
+async def _check_category_ownership(session: AsyncSession, category_ids: set[int], user: User):
+    """Raise 404 unless every category id belongs to the user, in one query."""
+    if not category_ids:
+        return
+    stmt = select(Category.id).where(Category.id.in_(category_ids), Category.user_id == user.id)
+    missing = category_ids - set((await session.scalars(stmt)).all())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Category not found: {sorted(missing)}")
+
+def _task_values(tasks: Sequence[TaskIn], user: User) -> list[dict[str, Any]]:
+    return [{**task.model_dump(), "user_id": user.id} for task in tasks]
+
+def _new_tasks_delta(tasks: Sequence[TaskIn]) -> Counter[str]:
+    # New tasks start as pending (the column default)
+    delta: Counter[str] = Counter()
+    for task in tasks:
+        delta.update(task_counter_delta(StatusEnum.pending, task.priority, task.category_id, task.estimated_time))
+    return delta
+
 async def create_bulk_task(session: AsyncSession, tasks: list[TaskIn], user: User):
-    task_dbs = [Task(**task.model_dump(), user = user) for task in tasks]
+    """
+    Insert up to TASK_BULK_MAX_BATCH_SIZE tasks with one multi-row INSERT ... RETURNING.
+
+    insertmanyvalues batches the rows into as few statements as possible and
+    the server-generated columns come back with them, so no refresh is needed.
+    """
+    if len(tasks) > settings.TASK_BULK_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.TASK_BULK_MAX_BATCH_SIZE} tasks per request, use /tasks/bulk/ndjson for more"
+        )
+    if not tasks:
+        return []
+
     try:
-        session.add_all(task_dbs)
+        await _check_category_ownership(session, {task.category_id for task in tasks if task.category_id is not None}, user)
+        result = await session.scalars(
+            insert(Task).returning(Task, sort_by_parameter_order=True),
+            _task_values(tasks, user)
+        )
+        task_dbs = result.all()
         await session.commit()
-        return task_dbs
+    except HTTPException:
+        await session.rollback()
+        raise
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    
-async def get_all_tasks_of_user(session: AsyncSession, user: User, status: StatusEnum | None = None, priority: PriorityEnum | None = None):
+
+    await incr_task_counters(user.id, _new_tasks_delta(tasks))
+    return task_dbs
+
+async def create_tasks_from_stream(session: AsyncSession, rows: AsyncIterator[tuple[int, Any]], user: User) -> int:
+    """
+    Insert tasks from parsed NDJSON lines in chunks of TASK_BULK_MAX_BATCH_SIZE.
+
+    Only the current chunk is held in memory and only ids are returned by
+    the inserts. Everything runs in one transaction, so an invalid line
+    rejects the whole import. Returns the number of tasks created.
+    """
+    batch_size = settings.TASK_BULK_MAX_BATCH_SIZE
+    known_categories: set[int] = set()
+    delta: Counter[str] = Counter()
+    created = 0
+    chunk: list[TaskIn] = []
+
+    async def flush():
+        nonlocal created
+        category_ids = {task.category_id for task in chunk if task.category_id is not None} - known_categories
+        await _check_category_ownership(session, category_ids, user)
+        known_categories.update(category_ids)
+        await session.execute(insert(Task).returning(Task.id), _task_values(chunk, user))
+        delta.update(_new_tasks_delta(chunk))
+        created += len(chunk)
+        chunk.clear()
+
+    try:
+        async for line_number, value in rows:
+            if created + len(chunk) >= settings.TASK_BULK_STREAM_MAX_ROWS:
+                raise HTTPException(status_code=413, detail=f"At most {settings.TASK_BULK_STREAM_MAX_ROWS} tasks per import")
+            try:
+                chunk.append(TaskIn.model_validate(value))
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail={"line": line_number, "errors": e.errors(include_url=False)})
+            if len(chunk) >= batch_size:
+                await flush()
+        if chunk:
+            await flush()
+        await session.commit()
+    except HTTPException:
+        await session.rollback()
+        raise
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    await incr_task_counters(user.id, delta)
+    return created
+
+async def get_all_tasks_of_user(session: AsyncSession, user: User, status: StatusEnum | None = None, priority: PriorityEnum | None = None, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
     stmt = select(Task).where(Task.user_id == user.id)
     if status is not None:
         stmt = stmt.where(Task.status == status.value)
     if priority is not None:
         stmt = stmt.where(Task.priority == priority.value)
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    return await _fetch_page(session, stmt, cursor, limit)
+
+TASK_EXPORT_COLUMNS = [
+    "id", "title", "description", "status", "priority", "due_date", "completed_at",
+    "category_id", "estimated_time", "actual_time", "created_at", "updated_at"
+]
+
+async def stream_tasks_of_user(session: AsyncSession, user: User, batch_size: int = 1000) -> AsyncIterator[Sequence[Any]]:
+    """
+    Yield all tasks of a user as batches of TASK_EXPORT_COLUMNS rows.
+
+    Rows come from a server-side cursor in ix_tasks_user_id_due_date order,
+    so nothing is sorted or materialized before the first batch.
+    """
+    stmt = (
+        select(*(getattr(Task, column) for column in TASK_EXPORT_COLUMNS))
+        .where(Task.user_id == user.id)
+        .order_by(Task.due_date, Task.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream(stmt)
+    async for partition in result.partitions():
+        yield partition
 
 async def get_task_by_task_id(session: AsyncSession, task_id: int):
     stmt = select(Task).where(Task.id == task_id)
@@ -54,53 +221,112 @@ async def update_task(session: AsyncSession, task_id: int, task_update: TaskUpda
     values_to_update = task_update.model_dump(exclude_unset=True)
     if not values_to_update:
          return await get_task_by_task_id(session, task_id)
+
+    delta: Counter[str] = Counter()
+    tracks_time = "estimated_time" in values_to_update or "actual_time" in values_to_update
+    # Locked so a concurrent update cannot compute its delta from the same old values
+    old_stmt = select(Task.estimated_time, Task.actual_time).where(Task.id == task_id).with_for_update()
     stmt = update(Task).where(Task.id == task_id).values(**values_to_update).returning(Task)
     try:
+        if tracks_time:
+            old = (await session.execute(old_stmt)).first()
+            if old is not None:
+                delta["estimated_time"] = (values_to_update.get("estimated_time", old.estimated_time) or 0) - (old.estimated_time or 0)
+                delta["actual_time"] = (values_to_update.get("actual_time", old.actual_time) or 0) - (old.actual_time or 0)
         result = await session.execute(stmt)
         updated_task = result.scalars().first()
         if not updated_task:
             raise HTTPException(status_code=404, detail="Task not found")
         await session.commit()
-        return updated_task
     except HTTPException:
         raise
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+    await incr_task_counters(updated_task.user_id, delta)
+    return updated_task
     
 async def delete_task(session: AsyncSession, task_id: int):
-    stmt = delete(Task).where(Task.id == task_id)
+    stmt = delete(Task).where(Task.id == task_id).returning(Task.user_id, Task.status, Task.priority, Task.category_id, Task.estimated_time, Task.actual_time)
     try:
-        await session.execute(stmt)
+        result = await session.execute(stmt)
+        deleted = result.first()
         await session.commit()
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+    if deleted is not None:
+        await incr_task_counters(deleted.user_id, task_counter_delta_of(deleted, -1))
+
 async def delete_bulk_task(session: AsyncSession, task_ids: list[int], user: User):
-    stmt = select(Task).where(and_(Task.id.in_(task_ids), Task.user_id == user.id))
+    """
+    Delete the user's tasks among ``task_ids`` in a single statement.
+
+    Attachments, subtasks, comments and reminders go with them through the
+    ON DELETE CASCADE foreign keys. The attachment paths are read in the same
+    statement (the CTE still sees the rows being deleted) and their files
+    are removed by a Celery task once the delete is committed.
+    """
+    deleted = (
+        delete(Task)
+        .where(Task.id == any_(literal(task_ids, ARRAY(Integer))), Task.user_id == user.id)
+        .returning(Task.id, Task.status, Task.priority, Task.category_id, Task.estimated_time, Task.actual_time)
+        .cte("deleted")
+    )
+    file_paths = (
+        select(func.array_agg(Attachment.file_path))
+        .where(Attachment.task_id == deleted.c.id)
+        .scalar_subquery()
+    )
+    stmt = select(deleted, file_paths.label("file_paths"))
+
     try:
-        result = await session.execute(stmt)
-        tasks = result.scalars().all()
-        
-        if not tasks:
+        rows = (await session.execute(stmt)).all()
+
+        if not rows:
             raise HTTPException(status_code=404, detail="Tasks not found")
 
-        for task in tasks:
-            await session.delete(task)
-            
         await session.commit()
-        return {
-            "deleted_task_count": len(tasks)
-        }
+    except HTTPException:
+        await session.rollback()
+        raise
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+    delta: Counter[str] = Counter()
+    files: list[str] = []
+    for row in rows:
+        delta.update(task_counter_delta_of(row, -1))
+        files.extend(row.file_paths or ())
+
+    await incr_task_counters(user.id, delta)
+    if files:
+        # Publishing to the broker is blocking I/O
+        await asyncio.to_thread(remove_media_files_task.delay, files)  # type: ignore
+    return {
+        "deleted_task_count": len(rows)
+    }
+
+def _status_change_delta(old_status: Any, new_status: Any, category_id: int | None) -> Counter[str]:
+    old_value, new_value = StatusEnum(old_status).value, StatusEnum(new_status).value
+    if old_value == new_value:
+        return Counter()
+
+    delta = Counter({f"status:{new_value}": 1, f"status:{old_value}": -1})
+    if category_id is not None:
+        delta[f"category:{category_id}:status:{new_value}"] += 1
+        delta[f"category:{category_id}:status:{old_value}"] -= 1
+    return delta
+
 async def update_status_bulk(session: AsyncSession, update_status: TaskBulkUpdateStatus, user: User):
+    old_stmt = select(Task.id, Task.status, Task.category_id).where(and_(Task.id.in_(update_status.ids), Task.user_id == user.id)).with_for_update()
     stmt = update(Task).where(and_(Task.id.in_(update_status.ids), Task.user_id == user.id)).values(status=update_status.status).returning(Task)
 
     try:
+        old_rows = (await session.execute(old_stmt)).all()
         result = await session.execute(stmt)
 
         tasks = result.scalars().all()
@@ -109,93 +335,282 @@ async def update_status_bulk(session: AsyncSession, update_status: TaskBulkUpdat
             raise HTTPException(status_code=404, detail="Task not found.")
         
         await session.commit()
-        return tasks
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+    delta: Counter[str] = Counter()
+    for row in old_rows:
+        delta.update(_status_change_delta(row.status, update_status.status, row.category_id))
+    await incr_task_counters(user.id, delta)
+    return tasks
     
 async def update_status(session: AsyncSession, task_id: int, status: str):
+    # Locked like update_status_bulk, so concurrent updates see each other's status
+    old_stmt = select(Task.status).where(Task.id == task_id).with_for_update()
     stmt = update(Task).where(Task.id == task_id).values(status = status).returning(Task)
     try:
+        old_status = await session.scalar(old_stmt)
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().one()
+        task = result.scalars().one()
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+    if old_status is not None:
+        await incr_task_counters(task.user_id, _status_change_delta(old_status, status, task.category_id))
+    return task
+
 async def update_priority(session: AsyncSession, task_id: int, priority: str):
+    old_stmt = select(Task.priority).where(Task.id == task_id).with_for_update()
     stmt = update(Task).where(Task.id == task_id).values(priority = priority).returning(Task)
     try:
+        old_priority = await session.scalar(old_stmt)
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().one()
+        task = result.scalars().one()
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-async def search_tasks(session: AsyncSession, user: User, query: str, status: StatusEnum | None = None, priority: PriorityEnum | None = None):
-    stmt = select(Task).where(and_(or_(Task.title.ilike(f"%{query}%"), Task.description.ilike(f"%{query}%")), Task.user_id == user.id))
+    if old_priority is not None and old_priority != priority:
+        delta = Counter({f"priority:{PriorityEnum(priority).value}": 1})
+        delta[f"priority:{PriorityEnum(old_priority).value}"] -= 1
+        await incr_task_counters(task.user_id, delta)
+    return task
+
+async def search_tasks(session: AsyncSession, user: User, query: str, status: StatusEnum | None = None, priority: PriorityEnum | None = None, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Ranked search over a user's tasks.
+
+    Full-text matches on the generated search_vector column are ordered by
+    ts_rank and come with a highlighted snippet. When the query has no
+    full-text match at all, a pg_trgm pass catches substrings and typos.
+    The cursor records which of the two modes is being paged.
+    """
+    mode = "fts"
+    after: tuple[float, int] | None = None
+    if cursor is not None:
+        mode, score, last_id = decode_cursor(cursor, 3)
+        if mode not in ("fts", "trgm"):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (cursor_number(score), cursor_int(last_id))
+
+    filters = [Task.user_id == user.id]
     if status is not None:
-        stmt = stmt.where(Task.status == status.value)
+        filters.append(Task.status == status.value)
     if priority is not None:
-        stmt = stmt.where(Task.priority == priority.value)
+        filters.append(Task.priority == priority.value)
+
+    rows = []
+    if mode == "fts":
+        rows = await _search_page(session, _fts_search_stmt(query, filters), after, limit)
+        if not rows and after is None:
+            mode = "trgm"
+    if mode == "trgm":
+        rows = await _search_page(session, _trgm_search_stmt(query, filters), after, limit)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([mode, rows[-1].score, rows[-1].Task.id])
+
+    return [
+        {"task": row.Task, "rank": row.score, "snippet": row.snippet}
+        for row in rows
+    ], next_cursor
+
+def _fts_search_stmt(query: str, filters: list[Any]):
+    config = cast(literal(SEARCH_CONFIG), REGCONFIG)
+    tsquery = func.websearch_to_tsquery(config, query)
+    score = func.ts_rank(Task.search_vector, tsquery).cast(Float)
+    snippet = func.ts_headline(
+        config,
+        func.concat_ws(" ", Task.title, Task.description),
+        tsquery,
+        "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+    )
+    return (
+        select(Task, score.label("score"), snippet.label("snippet"))
+        .where(and_(*filters, Task.search_vector.op("@@")(tsquery))),
+        score
+    )
+
+def _trgm_search_stmt(query: str, filters: list[Any]):
+    pattern = f"%{query}%"
+    score = func.greatest(
+        func.word_similarity(query, Task.title),
+        func.word_similarity(query, func.coalesce(Task.description, ""))
+    ).cast(Float)
+    return (
+        select(Task, score.label("score"), literal(None, String).label("snippet"))
+        .where(and_(*filters, or_(
+            Task.title.ilike(pattern),
+            Task.description.ilike(pattern),
+            literal(query).op("<%")(Task.title),
+            literal(query).op("<%")(Task.description)
+        ))),
+        score
+    )
+
+async def _search_page(session: AsyncSession, stmt_and_score: tuple[Any, Any], after: tuple[float, int] | None, limit: int):
+    stmt, score = stmt_and_score
+    if after is not None:
+        last_score, last_id = after
+        stmt = stmt.where(or_(score < last_score, and_(score == last_score, Task.id < last_id)))
+    stmt = stmt.order_by(score.desc(), Task.id.desc()).limit(limit + 1)
     result = await session.execute(stmt)
-    return result.scalars().all()
-        
-async def get_task_statistics(session: AsyncSession, user: User) -> dict[str, int | dict[str, int]]:
-    total_tasks = await session.scalar(select(func.count()).where(Task.user_id == user.id)) or 0
-    pending_tasks = await session.scalar(select(func.count()).where(and_(Task.status == "pending", Task.user_id == user.id))) or 0
-    in_progress_tasks = await session.scalar(select(func.count()).where(and_(Task.status == "in_progress", Task.user_id == user.id))) or 0
-    completed_tasks = await session.scalar(select(func.count()).where(and_(Task.status == "completed", Task.user_id == user.id))) or 0
-    low_tasks = await session.scalar(select(func.count()).where(and_(Task.priority == "low", Task.user_id == user.id))) or 0
-    medium_tasks = await session.scalar(select(func.count()).where(and_(Task.priority == "medium", Task.user_id == user.id))) or 0
-    high_tasks = await session.scalar(select(func.count()).where(and_(Task.priority == "high", Task.user_id == user.id))) or 0
+    return result.all()
+
+def _counter_group_stmt():
+    return select(
+        Task.user_id,
+        Task.category_id,
+        Task.status,
+        Task.priority,
+        func.count(Task.id).label("count"),
+        func.sum(Task.estimated_time).label("estimated_time"),
+        func.sum(Task.actual_time).label("actual_time"),
+    ).group_by(Task.user_id, Task.category_id, Task.status, Task.priority)
+
+def _counters_from_group_rows(rows: Any) -> dict[str, int]:
+    counters: Counter[str] = Counter({"total": 0})
+    for row in rows:
+        counters.update(task_counter_delta(row.status, row.priority, row.category_id, row.estimated_time, row.actual_time, row.count))
+    return {field: value for field, value in counters.items() if value or field == "total"}
+
+async def compute_task_counters(session: AsyncSession, user_id: int) -> dict[str, int]:
+    """Recompute a user's task counters from the tasks table in one grouped scan."""
+    result = await session.execute(_counter_group_stmt().where(Task.user_id == user_id))
+    return _counters_from_group_rows(result.all())
+
+async def load_task_counters(session: AsyncSession, user_id: int) -> dict[str, int]:
+    """
+    Return the materialized counters of a user, rebuilding them if they are missing.
+
+    The rebuild marker is set before the recount, so a write racing with it
+    makes the install fail rather than be lost or counted twice; the recount
+    is still returned, it is just not cached.
+    """
+    counters = await get_task_counters(user_id)
+    if counters is None:
+        token = await begin_task_counter_rebuild(user_id)
+        counters = await compute_task_counters(session, user_id)
+        if token is not None:
+            await install_task_counters(user_id, token, counters)
+    return counters
+
+async def reconcile_task_counters(session: AsyncSession, max_reported: int = 100) -> dict[str, Any]:
+    """
+    Recompute every materialized counter hash from scratch and report drift.
+
+    Users without a materialized hash are skipped; their counters are built
+    lazily on the next statistics read. Drifted hashes are dropped rather
+    than overwritten, so the next read rebuilds them safely against writes
+    in flight; drift reported for a user being written to may be transient.
+    """
+    checked = 0
+    drifted: dict[int, dict[str, dict[str, int]]] = {}
+    drifted_count = 0
+
+    async def _check(user_id: int, expected: dict[str, int]):
+        nonlocal checked, drifted_count
+        actual = await get_task_counters(user_id)
+        if actual is None:
+            return
+        checked += 1
+        diff = {
+            field: {"expected": expected.get(field, 0), "actual": actual.get(field, 0)}
+            for field in expected.keys() | actual.keys()
+            if expected.get(field, 0) != actual.get(field, 0)
+        }
+        if diff:
+            drifted_count += 1
+            if len(drifted) < max_reported:
+                drifted[user_id] = diff
+            await delete_task_counters(user_id)
+
+    seen: set[int] = set()
+    current_user_id: int | None = None
+    current_rows: list[Any] = []
+
+    result = await session.stream(_counter_group_stmt().order_by(Task.user_id).execution_options(yield_per=1000))
+    async for row in result:
+        if row.user_id != current_user_id:
+            if current_user_id is not None:
+                await _check(current_user_id, _counters_from_group_rows(current_rows))
+            current_user_id, current_rows = row.user_id, []
+            seen.add(row.user_id)
+        current_rows.append(row)
+    if current_user_id is not None:
+        await _check(current_user_id, _counters_from_group_rows(current_rows))
+
+    async for user_id in iter_task_counter_user_ids():
+        if user_id not in seen:
+            await _check(user_id, {"total": 0})
+
+    return {
+        "users_checked": checked,
+        "users_drifted": drifted_count,
+        "drift": drifted
+    }
+
+async def get_task_statistics(session: AsyncSession, user: User) -> dict[str, Any]:
+    counters = await load_task_counters(session, user.id)
+
+    # Overdue depends on the clock, so it cannot be kept as a counter. The
+    # partial index on open tasks keeps this proportional to the overdue rows.
+    today = datetime.now(ZoneInfo(user.timezone)).date()
+    overdue_tasks = await session.scalar(
+        select(func.count()).where(and_(Task.user_id == user.id, Task.due_date < today, Task.status != StatusEnum.completed))
+    ) or 0
+
+    total_tasks = counters.get("total", 0)
+    completed_tasks = counters.get("status:completed", 0)
 
     return {
         "total_tasks": total_tasks,
         "status": {
-            "pending": pending_tasks,
-            "in_progress": in_progress_tasks,
-            "completed": completed_tasks
+            status.value: counters.get(f"status:{status.value}", 0)
+            for status in StatusEnum
         },
         "priority": {
-            "low": low_tasks,
-            "medium": medium_tasks,
-            "high": high_tasks
+            priority.value: counters.get(f"priority:{priority.value}", 0)
+            for priority in PriorityEnum
+        },
+        "overdue_tasks": overdue_tasks,
+        "completion_rate": round(completed_tasks / total_tasks, 4) if total_tasks else 0.0,
+        "time": {
+            "estimated": counters.get("estimated_time", 0),
+            "actual": counters.get("actual_time", 0)
         }
     }
 
-async def get_todays_tasks(session: AsyncSession, user: User):
+async def get_todays_tasks(session: AsyncSession, user: User, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
     now = datetime.now(ZoneInfo(user.timezone))
     today = now.date()
 
     stmt = select(Task).where(and_(Task.due_date == today, Task.user_id == user.id))
-    result = await session.execute(stmt)
-
-    return result.scalars().all()
+    return await _fetch_page(session, stmt, cursor, limit)
 
-async def get_tomorrows_tasks(session: AsyncSession, user: User):
+async def get_tomorrows_tasks(session: AsyncSession, user: User, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
     tomorrow = datetime.now(ZoneInfo(user.timezone)) + timedelta(days=1)
     today = tomorrow.date()
 
     stmt = select(Task).where(and_(Task.due_date == today, Task.user_id == user.id))
-    result = await session.execute(stmt)
-
-    return result.scalars().all()
+    return await _fetch_page(session, stmt, cursor, limit)
 
-async def get_this_weeks_tasks(session: AsyncSession, user: User):
+async def get_this_weeks_tasks(session: AsyncSession, user: User, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
     now = datetime.now(ZoneInfo(user.timezone))
     start_of_week = now - timedelta(days=now.weekday())
     end_of_week = now + timedelta(days=6)
 
 
     stmt = select(Task).where(and_(Task.due_date >= start_of_week.date(), Task.due_date <= end_of_week.date(), Task.user_id == user.id))
-    result = await session.execute(stmt)
-
-    return result.scalars().all()
+    return await _fetch_page(session, stmt, cursor, limit)
 
-async def get_this_months_tasks(session: AsyncSession, user: User):
+async def get_this_months_tasks(session: AsyncSession, user: User, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
     now = datetime.now(ZoneInfo(user.timezone))
     start_of_month= now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).date()
     _, num_days = calendar.monthrange(now.year, now.month)
@@ -203,26 +618,18 @@ async def get_this_months_tasks(session: AsyncSession, user: User):
 
 
     stmt = select(Task).where(and_(Task.due_date >= start_of_month, Task.due_date <= end_of_month, Task.user_id == user.id))
-    result = await session.execute(stmt)
+    return await _fetch_page(session, stmt, cursor, limit)
 
-    return result.scalars().all()
-
-async def get_overdue_tasks(session: AsyncSession, user: User):
+async def get_overdue_tasks(session: AsyncSession, user: User, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
     now = datetime.now(ZoneInfo(user.timezone)).date()
 
-    stmt = select(Task).where(and_(Task.due_date < now, Task.user_id == user.id))
-    result = await session.execute(stmt)
-
-    return result.scalars().all()
+    stmt = select(Task).where(and_(Task.due_date < now, Task.status != StatusEnum.completed, Task.user_id == user.id))
+    return await _fetch_page(session, stmt, cursor, limit)
 
-async def get_tasks_by_status(session: AsyncSession, user: User, status: str):
+async def get_tasks_by_status(session: AsyncSession, user: User, status: str, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
     stmt = select(Task).where(and_(Task.status == status, Task.user_id == user.id))
-    result = await session.execute(stmt)
-
-    return result.scalars().all()
+    return await _fetch_page(session, stmt, cursor, limit)
 
-async def get_tasks_by_priority(session: AsyncSession, user: User, priority: str):
+async def get_tasks_by_priority(session: AsyncSession, user: User, priority: str, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
     stmt = select(Task).where(and_(Task.priority == priority, Task.user_id == user.id))
-    result = await session.execute(stmt)
-
-    return result.scalars().all()
+    return await _fetch_page(session, stmt, cursor, limit)
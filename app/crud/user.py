@@ -1,24 +1,28 @@
-from sqlalchemy import update, func, delete
+from sqlalchemy import update, func, delete, literal, literal_column, union_all, String
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 
 from fastapi import HTTPException
-from typing import Any
+from typing import Any, Literal, Sequence
 from datetime import datetime, timezone, timedelta
 
+from app.config import settings
 from app.models import User
 from app.schemas import UserIn, UserUpdate, UserUpdateAdmin
-from app.core import get_password_hash
+from app.core import get_password_hash_async
+from app.utils import encode_cursor, decode_cursor, cursor_int, estimate_count, naive_utc
+from app.services import delete_task_counters, invalidate_cached_user, get_or_compute, invalidate_cached_stats
 
 
 async def create_user(session: AsyncSession, user: UserIn):
-    user_db = User(username=user.username, email=user.email.lower(), hashed_password=get_password_hash(user.password))
+    user_db = User(username=user.username, email=user.email.lower(), hashed_password=await get_password_hash_async(user.password))
 
     try:
         session.add(user_db)
         await session.commit()
         await session.refresh(user_db)
+        await invalidate_user_statistics()
         return user_db
 
     except IntegrityError as e:
@@ -41,6 +45,10 @@ async def get_user_by_email(session: AsyncSession, email: str):
     result = await session.execute(stmt)
     return result.scalars().first()
 
+async def get_user_password_hash(session: AsyncSession, user_id: int) -> str | None:
+    """Read a user's password hash, which is left out of the user cache."""
+    return await session.scalar(select(User.hashed_password).where(User.id == user_id))
+
 async def set_login_date_now(session: AsyncSession, email: str):
     try:
         stmt = (
@@ -52,7 +60,9 @@ async def set_login_date_now(session: AsyncSession, email: str):
 
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        updated_user = result.scalars().first()
+        await invalidate_cached_user(updated_user.email if updated_user else None)
+        return updated_user
 
     except Exception:
         await session.rollback()
@@ -69,7 +79,9 @@ async def set_verified_true(session: AsyncSession, email: str):
 
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        updated_user = result.scalars().first()
+        await invalidate_cached_user(updated_user.email if updated_user else None)
+        return updated_user
     except Exception:
         await session.rollback()
         return None
@@ -85,7 +97,6 @@ async def update_user_data(session: AsyncSession, email: str, user_update: UserU
         if not updated_user:
             raise HTTPException(status_code=404, detail="User not found")
         await session.commit()
-        return updated_user
     except IntegrityError as e:
         await session.rollback()
 
@@ -100,6 +111,9 @@ async def update_user_data(session: AsyncSession, email: str, user_update: UserU
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+    await invalidate_cached_user(email)
+    return updated_user
+
 async def update_profile_image_path(session: AsyncSession, email: str, image_path: str):
     try:
         stmt = (
@@ -111,7 +125,9 @@ async def update_profile_image_path(session: AsyncSession, email: str, image_pat
 
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        updated_user = result.scalars().first()
+        await invalidate_cached_user(updated_user.email if updated_user else None)
+        return updated_user
 
     except Exception:
         await session.rollback()
@@ -128,33 +144,89 @@ async def delete_profile_image_path(session: AsyncSession, email: str):
 
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        updated_user = result.scalars().first()
+        await invalidate_cached_user(updated_user.email if updated_user else None)
+        return updated_user
 
     except Exception:
         await session.rollback()
         return None
     
 async def update_user_password(session: AsyncSession, email:str, password: str):
+    hashed_password = await get_password_hash_async(password)
     try:
         stmt = (
             update(User)
             .where(User.email == email)
-            .values(hashed_password=get_password_hash(password))
+            .values(hashed_password=hashed_password)
             .returning(User)
         )
 
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        updated_user = result.scalars().first()
+        await invalidate_cached_user(updated_user.email if updated_user else None)
+        return updated_user
 
     except Exception:
         await session.rollback()
         return None
     
-async def get_all_users(session: AsyncSession, limit: int = 1000, skip: int = 0):
-    stmt = select(User).limit(limit).offset(skip)
+def _prefix_pattern(prefix: str) -> str:
+    # A constant pattern (not "param || '%'") lets the planner use the index
+    escaped = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return escaped + "%"
+
+async def get_all_users(
+    session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = 50,
+    is_active: bool | None = None,
+    is_verified: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    email_prefix: str | None = None,
+    username_prefix: str | None = None,
+    with_total: bool = False
+) -> tuple[Sequence[User], str | None, int | None]:
+    """
+    List users by id with optional filters.
+
+    Pages are keyed on id, so deep pages cost the same as the first one.
+    Prefix filters use the varchar_pattern_ops indexes. With ``with_total``
+    the planner's estimate of the number of matching users is returned too.
+    """
+    stmt = select(User)
+    if is_active is not None:
+        stmt = stmt.where(User.is_active == is_active)
+    if is_verified is not None:
+        stmt = stmt.where(User.is_verified == is_verified)
+    # created_at is naive UTC; asyncpg rejects aware datetimes for it
+    if created_from is not None:
+        stmt = stmt.where(User.created_at >= naive_utc(created_from))
+    if created_to is not None:
+        stmt = stmt.where(User.created_at < naive_utc(created_to))
+    if email_prefix:
+        # Emails are stored lowercase
+        stmt = stmt.where(User.email.like(_prefix_pattern(email_prefix.lower()), escape="/"))
+    if username_prefix:
+        stmt = stmt.where(User.username.like(_prefix_pattern(username_prefix), escape="/"))
+
+    total = await estimate_count(session, stmt) if with_total else None
+
+    if cursor is not None:
+        last_id, = decode_cursor(cursor, 1)
+        stmt = stmt.where(User.id > cursor_int(last_id))
+
+    stmt = stmt.order_by(User.id.asc()).limit(limit + 1)
     result = await session.execute(stmt)
-    return result.scalars().all()
+    users = result.scalars().all()
+
+    if len(users) <= limit:
+        return users, None, total
+
+    users = users[:limit]
+    return users, encode_cursor([users[-1].id]), total
 
 async def get_user_by_id(session: AsyncSession, id: int):
     stmt = select(User).where(User.id == id)
@@ -162,13 +234,18 @@ async def get_user_by_id(session: AsyncSession, id: int):
     return result.scalars().first()
 
 async def delete_user_by_id(session: AsyncSession, id: int):
-    stmt = delete(User).where(User.id == id)
+    stmt = delete(User).where(User.id == id).returning(User.email)
     try:
-        await session.execute(stmt)
+        result = await session.execute(stmt)
+        email = result.scalar()
         await session.commit()
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+    await delete_task_counters(id)
+    await invalidate_cached_user(email)
+    await invalidate_user_statistics()
     
 async def ban_user_by_id(session: AsyncSession, id: int):
     stmt = update(User).where(User.id == id).values(is_active = False).returning(User)
@@ -176,10 +253,13 @@ async def ban_user_by_id(session: AsyncSession, id: int):
     try:
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        user = result.scalars().first()
     except Exception:
         await session.rollback()
         raise HTTPException(status_code=500, detail="Iternal server error")
+
+    await invalidate_cached_user(user.email if user else None)
+    return user
     
 async def unban_user_by_id(session: AsyncSession, id: int):
     stmt = update(User).where(User.id == id).values(is_active = True).returning(User)
@@ -187,10 +267,13 @@ async def unban_user_by_id(session: AsyncSession, id: int):
     try:
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        user = result.scalars().first()
     except Exception:
         await session.rollback()
         raise HTTPException(status_code=500, detail="Iternal server error")
+
+    await invalidate_cached_user(user.email if user else None)
+    return user
     
 async def update_user_data_admin(session: AsyncSession, id: int, update_user: UserUpdateAdmin):
     values_to_update = update_user.model_dump(exclude_unset=True)
@@ -204,7 +287,6 @@ async def update_user_data_admin(session: AsyncSession, id: int, update_user: Us
         if not updated_user:
             raise HTTPException(status_code=404, detail="User not found")
         await session.commit()
-        return updated_user
     except IntegrityError as e:
         await session.rollback()
 
@@ -219,82 +301,137 @@ async def update_user_data_admin(session: AsyncSession, id: int, update_user: Us
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-async def get_user_statistics(session: AsyncSession) -> dict[str, Any]:
-
+    await invalidate_cached_user(updated_user.email)
+    return updated_user
+
+# Bucket width -> number of buckets in the optional time series
+USER_STATISTICS_SERIES = {"day": 30, "week": 12}
+
+_USER_STATISTICS_CACHE_KEYS = ["user_statistics", *(f"user_statistics:{unit}" for unit in USER_STATISTICS_SERIES)]
+
+
+async def invalidate_user_statistics():
+    await invalidate_cached_stats(*_USER_STATISTICS_CACHE_KEYS)
+
+async def _get_user_time_series(session: AsyncSession, unit: Literal["day", "week"], now: datetime) -> list[dict[str, Any]]:
+    # Python mirrors date_trunc so buckets without rows are reported as zero
+    first = datetime(now.year, now.month, now.day)
+    if unit == "week":
+        first -= timedelta(days=first.weekday())
+    step = timedelta(days=1 if unit == "day" else 7)
+    first -= step * (USER_STATISTICS_SERIES[unit] - 1)
+
+    signups = select(
+        literal("signups", String).label("kind"),
+        func.date_trunc(unit, User.created_at).label("bucket"),
+        func.count().label("count")
+    ).where(User.created_at >= first).group_by(literal_column("2"))
+    logins = select(
+        literal("logins", String).label("kind"),
+        func.date_trunc(unit, User.last_login).label("bucket"),
+        func.count().label("count")
+    ).where(User.last_login >= first).group_by(literal_column("2"))
+
+    counts = {(row.kind, row.bucket): row.count for row in await session.execute(union_all(signups, logins))}
+
+    series = []
+    for index in range(USER_STATISTICS_SERIES[unit]):
+        bucket = first + step * index
+        series.append({
+            "bucket": bucket.isoformat(),
+            "signups": counts.get(("signups", bucket), 0),
+            # Only the latest login of each user is stored
+            "logins": counts.get(("logins", bucket), 0)
+        })
+    return series
+
+async def _compute_user_statistics(session: AsyncSession, series: Literal["day", "week"] | None) -> dict[str, Any]:
     now = datetime.now(timezone.utc).replace(tzinfo=None)
     today_start = datetime(now.year, now.month, now.day)
 
     last_7_days = now - timedelta(days=7)
     last_30_days = now - timedelta(days=30)
 
-    total_users = await session.scalar(select(func.count()).select_from(User)) or 0
-    active_users = await session.scalar(select(func.count()).where(User.is_active == True)) or 0
-    verified_users = await session.scalar(select(func.count()).where(User.is_verified == True)) or 0
-    superusers = await session.scalar(select(func.count()).where(User.is_superuser == True)) or 0
-
-    reg_today = await session.scalar(
-        select(func.count()).where(User.created_at >= today_start)
-    )
-    reg_last_7 = await session.scalar(
-        select(func.count()).where(User.created_at >= last_7_days)
-    )
-    reg_last_30 = await session.scalar(
-        select(func.count()).where(User.created_at >= last_30_days)
-    )
-
-    logged_today = await session.scalar(
-        select(func.count()).where(User.last_login >= today_start)
-    )
-    logged_last_7 = await session.scalar(
-        select(func.count()).where(User.last_login >= last_7_days)
-    )
-    logged_last_30 = await session.scalar(
-        select(func.count()).where(User.last_login >= last_30_days)
-    )
-    never_logged_in = await session.scalar(
-        select(func.count()).where(User.last_login == None)
-    )
+    def count_where(condition):
+        return func.count().filter(condition)
+
+    stats = (await session.execute(select(
+        func.count().label("total_users"),
+        count_where(User.is_active == True).label("active_users"),
+        count_where(User.is_verified == True).label("verified_users"),
+        count_where(User.is_superuser == True).label("superusers"),
+        count_where(User.created_at >= today_start).label("reg_today"),
+        count_where(User.created_at >= last_7_days).label("reg_last_7"),
+        count_where(User.created_at >= last_30_days).label("reg_last_30"),
+        count_where(User.last_login >= today_start).label("logged_today"),
+        count_where(User.last_login >= last_7_days).label("logged_last_7"),
+        count_where(User.last_login >= last_30_days).label("logged_last_30"),
+        count_where(User.last_login == None).label("never_logged_in"),
+        count_where(User.profile_image.isnot(None)).label("with_profile")
+    ).select_from(User))).one()
 
     timezone_rows = await session.execute(
         select(User.timezone, func.count()).group_by(User.timezone)
     )
     timezones = {tz or "Unknown": count for tz, count in timezone_rows.all()}
 
-    with_profile = await session.scalar(
-        select(func.count()).where(User.profile_image.isnot(None))
-    ) or 0
-
-    return {
+    statistics = {
         "summary": {
-            "total_users": total_users,
-            "active_users": active_users,
-            "inactive_users": total_users - active_users,
-            "verified_users": verified_users,
-            "unverified_users": total_users - verified_users,
-            "superusers": superusers
+            "total_users": stats.total_users,
+            "active_users": stats.active_users,
+            "inactive_users": stats.total_users - stats.active_users,
+            "verified_users": stats.verified_users,
+            "unverified_users": stats.total_users - stats.verified_users,
+            "superusers": stats.superusers
         },
 
         "registrations": {
-            "today": reg_today,
-            "last_7_days": reg_last_7,
-            "last_30_days": reg_last_30
+            "today": stats.reg_today,
+            "last_7_days": stats.reg_last_7,
+            "last_30_days": stats.reg_last_30
         },
 
         "activity": {
-            "logged_today": logged_today,
-            "logged_last_7_days": logged_last_7,
-            "logged_last_30_days": logged_last_30,
-            "never_logged_in": never_logged_in
+            "logged_today": stats.logged_today,
+            "logged_last_7_days": stats.logged_last_7,
+            "logged_last_30_days": stats.logged_last_30,
+            "never_logged_in": stats.never_logged_in
         },
 
         "timezones": timezones,
 
         "profile": {
-            "with_profile_image": with_profile,
-            "without_profile_image": total_users - with_profile
-        }
+            "with_profile_image": stats.with_profile,
+            "without_profile_image": stats.total_users - stats.with_profile
+        },
+
+        "generated_at": now.isoformat()
     }
 
+    if series is not None:
+        statistics["series"] = {
+            "unit": series,
+            "buckets": await _get_user_time_series(session, series, now)
+        }
+
+    return statistics
+
+async def get_user_statistics(session: AsyncSession, series: Literal["day", "week"] | None = None) -> dict[str, Any]:
+    """
+    User counts computed in one aggregate scan plus a timezone group-by.
+
+    With ``series`` the signups and last logins of the past 30 days or 12
+    weeks are added per bucket. Results are cached for
+    USER_STATISTICS_CACHE_TTL_SECONDS and dropped when users are created or
+    deleted.
+    """
+    key = f"user_statistics:{series}" if series else "user_statistics"
+    return await get_or_compute(
+        key,
+        settings.USER_STATISTICS_CACHE_TTL_SECONDS,
+        lambda: _compute_user_statistics(session, series)
+    )
+
 async def update_profile_image_path_by_id(session: AsyncSession, id: int, image_path: str):
     try:
         stmt = (
@@ -306,7 +443,9 @@ async def update_profile_image_path_by_id(session: AsyncSession, id: int, image_
 
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        updated_user = result.scalars().first()
+        await invalidate_cached_user(updated_user.email if updated_user else None)
+        return updated_user
 
     except Exception:
         await session.rollback()
@@ -323,7 +462,9 @@ async def delete_profile_image_path_by_id(session: AsyncSession, id: int):
 
         result = await session.execute(stmt)
         await session.commit()
-        return result.scalars().first()
+        updated_user = result.scalars().first()
+        await invalidate_cached_user(updated_user.email if updated_user else None)
+        return updated_user
 
     except Exception:
         await session.rollback()
@@ -2,10 +2,13 @@ from fastapi import Depends, status, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from jose import jwt, JWTError
 
 from app.database import get_db
 from app.crud import get_user_by_email
+from app.models import User
+from app.services import get_cached_user, cache_user
 from app.config import settings
 
 
@@ -35,7 +38,7 @@ async def get_current_user(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    user = await get_user_by_email(db, email)
+    user = await _load_user(db, email)
 
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
@@ -45,6 +48,20 @@ async def get_current_user(
 
     return user
 
+async def _load_user(db: AsyncSession, email: str) -> User | None:
+    cached = await get_cached_user(email)
+    if cached is None:
+        user = await get_user_by_email(db, email)
+        if user is not None:
+            await cache_user(user)
+        return user
+
+    # Attach the cached row to this request's session without querying it,
+    # so handlers can still relate new objects to the user.
+    user = User(**cached)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
 async def get_admin(
     db: AsyncSession = Depends(get_db),
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme), 
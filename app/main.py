@@ -1,11 +1,27 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from .config import settings
 from .api import router
 from .api.system import router as system_router
-from .ws import ws_router
+from .ws import ws_router, manager
+from .services.reminder_dispatcher import reminder_dispatcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Receive WebSocket events published by the other workers
+    await manager.backplane.start()
+    if settings.REMINDER_DISPATCH_ENABLED:
+        await reminder_dispatcher.start()
+    yield
+    await reminder_dispatcher.stop()
+    await manager.backplane.stop()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     debug=settings.DEBUG,
     title=settings.API_TITLE,
     version=settings.API_VERSION,
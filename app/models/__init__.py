@@ -5,6 +5,7 @@ from .attachment import Attachment
 from .subtask import Subtask
 from .comment import Comment
 from .reminder import Reminder
+from .tombstone import Tombstone, sync_epoch_seq
 
 __all__ = [
     "User",
@@ -13,5 +14,7 @@ __all__ = [
     "Attachment",
     "Subtask",
     "Comment",
-    "Reminder"
+    "Reminder",
+    "Tombstone",
+    "sync_epoch_seq"
 ]
\ No newline at end of file
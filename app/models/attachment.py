@@ -19,6 +19,7 @@ class Attachment(Base):
     task_id:    Mapped[int]             = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id:    Mapped[int]             = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     uploaded_at:    Mapped[datetime]        = mapped_column(DateTime, server_default=func.now(), default=func.now())
+    updated_at:     Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
 
     task: Mapped["Task"] = relationship(back_populates="attachments")  # type: ignore
     user: Mapped["User"] = relationship(back_populates="attachments")  # type: ignore
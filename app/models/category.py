@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, ForeignKey, DateTime, UniqueConstraint, text
+from sqlalchemy import Integer, String, ForeignKey, DateTime, UniqueConstraint, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,12 +17,14 @@ class Category(Base):
     icon:           Mapped[str]         = mapped_column(String(255), nullable=True)
     user_id:        Mapped[int]         = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at:     Mapped[datetime]    = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    updated_at:     Mapped[datetime]    = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
 
     tasks: Mapped[list['Task']] = relationship(back_populates="category", passive_deletes=True) # type: ignore
     user: Mapped['User'] = relationship(back_populates="categories") # type: ignore
 
     __table_args__ = (
         UniqueConstraint("user_id", "name", name="uq_categories_user_name"),
+        Index("ix_categories_user_id_updated_at", "user_id", "updated_at"),
     )
 
     def __repr__(self):
@@ -15,7 +15,7 @@ class Comment(Base):
     task_id:        Mapped[int]             = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id:        Mapped[int]             = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at:     Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now())
-    updated_at:     Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+    updated_at:     Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
 
     task: Mapped["Task"] = relationship(back_populates="comments")  # type: ignore
     user: Mapped["User"] = relationship(back_populates="comments")  # type: ignore
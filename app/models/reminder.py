@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, DateTime, Boolean, ForeignKey, func
+from sqlalchemy import Integer, DateTime, Boolean, ForeignKey, Index, text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from datetime import datetime
@@ -12,13 +12,21 @@ class Reminder(Base):
 
     id:              Mapped[int]              = mapped_column(Integer, primary_key=True)
     task_id:         Mapped[int | None]      = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True, index=True)
+    user_id:         Mapped[int | None]      = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
     reminder_time:   Mapped[datetime]        = mapped_column(DateTime, nullable=False, index=True)
     is_sent:         Mapped[bool]            = mapped_column(Boolean, default=False, server_default='false', index=True)
     sent_at:         Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     created_at:      Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    updated_at:      Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
 
     task:            Mapped["Task"]          = relationship(back_populates="reminders") # type: ignore
 
+    __table_args__ = (
+        Index("ix_reminders_is_sent_reminder_time", "is_sent", "reminder_time"),
+        Index("ix_reminders_user_id_upcoming", "user_id", "reminder_time", "id", postgresql_where=text("is_sent = false")),
+        Index("ix_reminders_user_id_updated_at", "user_id", "updated_at"),
+    )
+
     def __repr__(self):
         return f"<Reminder {self.id} (task_id={self.task_id})>"
 
@@ -29,6 +37,7 @@ class Reminder(Base):
         return {
             "id": self.id,
             "task_id": self.task_id,
+            "user_id": self.user_id,
             "reminder_time": self.reminder_time,
             "is_sent": self.is_sent,
             "sent_at": self.sent_at,
@@ -16,6 +16,7 @@ class Subtask(Base):
     task_id:        Mapped[int]             = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at:     Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now())
     completed_at:   Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at:     Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
 
     task: Mapped["Task"] = relationship(back_populates="subtasks")  # type: ignore
 
@@ -1,4 +1,5 @@
-from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, func, Enum
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, func, Enum, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from datetime import datetime
@@ -8,6 +9,13 @@ from app.database import Base
 from app.schemas import StatusEnum, PriorityEnum
 
 
+SEARCH_CONFIG = "simple"
+
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'B')"
+)
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -21,9 +29,10 @@ class Task(Base):
     user_id:            Mapped[int]         = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     category_id:        Mapped[int]         = mapped_column(ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
     created_at:         Mapped[datetime]    = mapped_column(DateTime, default=func.now(), server_default=func.now())
-    updated_at:         Mapped[datetime]    = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+    updated_at:         Mapped[datetime]    = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
     estimated_time:     Mapped[int | None]         = mapped_column(Integer, nullable=True)
     actual_time:        Mapped[int | None]         = mapped_column(Integer, nullable=True)
+    search_vector:      Mapped[str | None]         = mapped_column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True, deferred=True)
 
     user:               Mapped["User"]      = relationship(back_populates="tasks") # type: ignore
     category:           Mapped["Category"]  = relationship(back_populates="tasks", passive_deletes=True) # type: ignore
@@ -32,6 +41,18 @@ class Task(Base):
     comments:           Mapped[list["Comment"]] = relationship(back_populates="task", cascade="all, delete-orphan") # type: ignore
     reminders:          Mapped[list["Reminder"]] = relationship(back_populates="task", cascade="all, delete-orphan") # type: ignore
 
+    __table_args__ = (
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date", "id"),
+        Index("ix_tasks_user_id_status", "user_id", "status", "due_date", "id"),
+        Index("ix_tasks_user_id_priority", "user_id", "priority", "due_date", "id"),
+        Index("ix_tasks_user_id_due_date_open", "user_id", "due_date", "id", postgresql_where=text("status <> 'completed'")),
+        Index("ix_tasks_category_id", "category_id"),
+        Index("ix_tasks_user_id_updated_at", "user_id", "updated_at"),
+        Index("ix_tasks_user_id_search_vector", "user_id", "search_vector", postgresql_using="gin"),
+        Index("ix_tasks_user_id_title_trgm", "user_id", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_tasks_user_id_description_trgm", "user_id", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+    )
+
     def __repr__(self):
         return f"<User {self.title} (id={self.id})>"
 
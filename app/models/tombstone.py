@@ -0,0 +1,45 @@
+from sqlalchemy import BigInteger, Integer, String, DateTime, Index, Sequence, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from datetime import datetime
+from typing import Any
+
+from app.database import Base
+
+
+# Advanced by every restore, which rewinds the data and clears the tombstones;
+# sync tokens and incremental backups from an older epoch cannot be resumed.
+sync_epoch_seq = Sequence("sync_epoch_seq", metadata=Base.metadata)
+
+
+class Tombstone(Base):
+    """
+    A deleted row, recorded by the record_tombstone() trigger.
+
+    user_id is the owner of the deleted row when it can be determined, so
+    deletions can be replayed by incremental backups and client sync.
+    """
+    __tablename__ = "tombstones"
+
+    id:             Mapped[int]             = mapped_column(BigInteger, primary_key=True)
+    table_name:     Mapped[str]             = mapped_column(String(63), nullable=False)
+    row_id:         Mapped[int]             = mapped_column(Integer, nullable=False)
+    user_id:        Mapped[int | None]      = mapped_column(Integer, nullable=True)
+    deleted_at:     Mapped[datetime]        = mapped_column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_tombstones_deleted_at", "deleted_at"),
+        Index("ix_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+
+    def __repr__(self):
+        return f"<Tombstone {self.table_name}:{self.row_id}>"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "table_name": self.table_name,
+            "row_id": self.row_id,
+            "user_id": self.user_id,
+            "deleted_at": self.deleted_at
+        }
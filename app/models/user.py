@@ -1,4 +1,4 @@
-from sqlalchemy import String, Boolean, DateTime, Integer, text, func, UniqueConstraint
+from sqlalchemy import String, Boolean, DateTime, Integer, Index, text, func, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from datetime import datetime
@@ -21,6 +21,7 @@ class User(Base):
     last_login:         Mapped[datetime]    = mapped_column(DateTime, nullable=True)
     profile_image:      Mapped[str]         = mapped_column(String(255), nullable=True)
     timezone:           Mapped[str]         = mapped_column(String(255), default="Asia/Tashkent", server_default=text("'Asia/Tashkent'"), nullable=False)
+    updated_at:         Mapped[datetime]    = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
 
     tasks: Mapped[list["Task"]] = relationship(back_populates="user") # type: ignore
     categories: Mapped[list["Category"]] = relationship(back_populates="user", cascade="all, delete-orphan") # type: ignore
@@ -30,6 +31,9 @@ class User(Base):
     __table_args__ = (
         UniqueConstraint("username", name="uq_user_username"),
         UniqueConstraint("email", name="uq_user_email"),
+        # The plain indexes follow the database collation and cannot serve LIKE 'prefix%'
+        Index("ix_users_email_pattern", "email", postgresql_ops={"email": "varchar_pattern_ops"}),
+        Index("ix_users_username_pattern", "username", postgresql_ops={"username": "varchar_pattern_ops"}),
     )
 
     def __repr__(self):
@@ -1,22 +1,26 @@
 from .user import UserIn, UserLogIn, UserOut, UserOutResponse, UserUpdate, UserChangePassword, UserNewPassword, UserForgotPassword, \
-                  UserOutAdmin, UserOutAdminResponse, UserUpdateAdmin
-from .task import TaskIn, TaskOut, TaskOutResponse, TaskUpdate, StatusEnum, PriorityEnum, TaskOutBulkResponse, TaskBulkUpdateStatus
+                  UserOutAdmin, UserOutAdminPage, UserOutAdminResponse, UserUpdateAdmin
+from .task import TaskIn, TaskOut, TaskOutResponse, TaskUpdate, StatusEnum, PriorityEnum, TaskOutBulkResponse, TaskBulkUpdateStatus, TaskOutPage, TaskSearchHit, TaskSearchPage
 from .category import CategoryOut, CategoryIn, CategoryUpdate
 from .attachment import MimeTypeEnum, AttachmentOut
 from .subtask import SubtaskCreate, SubtaskUpdate, SubtaskOut
 from .comment import CommentCreate, CommentUpdate, CommentOut
-from .reminder import ReminderOut, ReminderCreate, ReminderUpdate, TaskReminderCreate
-from .admin import AdminDashboardOut, BackupOut, AdminSettingsOut, AdminSettingsUpdate
+from .reminder import ReminderOut, ReminderCreate, ReminderUpdate, TaskReminderCreate, ReminderOutPage
+from .admin import AdminDashboardOut, BackupOut, AdminJobOut, AdminSettingsOut, AdminSettingsUpdate
+from .imports import TaskImportRow, SubtaskImportRow, CommentImportRow, ImportRowError, ImportJobOut
+from .sync import SyncTombstone, SyncOut
 
 
 __all__ = [
     "UserIn", "UserLogIn", "UserOut", "UserOutResponse", "UserUpdate", "UserChangePassword", "UserNewPassword", "UserForgotPassword",
-    "UserOutAdmin", "UserOutAdminResponse", "UserUpdateAdmin",
-    "TaskIn", "TaskOut", "TaskOutResponse", "TaskUpdate", "StatusEnum", "PriorityEnum", "TaskOutBulkResponse", "TaskBulkUpdateStatus",
+    "UserOutAdmin", "UserOutAdminPage", "UserOutAdminResponse", "UserUpdateAdmin",
+    "TaskIn", "TaskOut", "TaskOutResponse", "TaskUpdate", "StatusEnum", "PriorityEnum", "TaskOutBulkResponse", "TaskBulkUpdateStatus", "TaskOutPage", "TaskSearchHit", "TaskSearchPage",
     "CategoryOut", "CategoryIn", "CategoryUpdate",
     "MimeTypeEnum", "AttachmentOut",
     "SubtaskCreate", "SubtaskUpdate", "SubtaskOut",
     "CommentCreate", "CommentUpdate", "CommentOut",
-    "ReminderOut", "ReminderCreate", "ReminderUpdate", "TaskReminderCreate",
-    "AdminDashboardOut", "BackupOut", "AdminSettingsOut", "AdminSettingsUpdate",
+    "ReminderOut", "ReminderCreate", "ReminderUpdate", "TaskReminderCreate", "ReminderOutPage",
+    "AdminDashboardOut", "BackupOut", "AdminJobOut", "AdminSettingsOut", "AdminSettingsUpdate",
+    "TaskImportRow", "SubtaskImportRow", "CommentImportRow", "ImportRowError", "ImportJobOut",
+    "SyncTombstone", "SyncOut",
 ]
\ No newline at end of file
@@ -18,16 +18,34 @@ class AdminDashboardOut(BaseModel):
     reminders_count: int = Field(..., description="Total number of reminders")
     active_users_count: int = Field(..., description="Users active in last 30 days")
     db_dialect: str = Field(..., description="Database dialect (postgresql, mysql, etc.)")
+    estimated: bool = Field(False, description="Entity counts are planner estimates rather than exact counts")
     timestamp: datetime = Field(..., description="Timestamp of dashboard data")
 
 
 class BackupOut(BaseModel):
     """Backup creation response."""
     detail: str = Field(..., description="Status message")
-    backup_path: str = Field(..., description="Path to backup file")
-    backup_filename: str = Field(..., description="Backup filename")
+    job_id: str = Field(..., description="Backup job id, also the backup id")
+    status: str = Field(..., description="Job status")
+    backup_path: str = Field(..., description="Directory the backup is written to")
     created_at: datetime = Field(..., description="Backup creation timestamp")
-    file_size: int = Field(..., description="Backup file size in bytes")
+
+
+class AdminJobOut(BaseModel):
+    """State of a background admin job (backup or restore)."""
+    job_id: str = Field(..., description="Job id")
+    type: str = Field(..., description="Job type")
+    mode: Optional[str] = Field(None, description="Backup mode (full or incremental)")
+    backup_id: Optional[str] = Field(None, description="Backup being restored")
+    status: str = Field(..., description="pending, running, completed or failed")
+    created_at: datetime = Field(..., description="Job creation timestamp")
+    started_at: Optional[datetime] = Field(None, description="Job start timestamp")
+    finished_at: Optional[datetime] = Field(None, description="Job end timestamp")
+    progress: dict[str, int] = Field(default_factory=dict, description="Rows processed per table")
+    total_rows: int = Field(0, description="Rows processed in total")
+    backup_path: Optional[str] = Field(None, description="Backup directory")
+    file_size: Optional[int] = Field(None, description="Backup size in bytes")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
 
 
 class AdminSettingsOut(BaseModel):
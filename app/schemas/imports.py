@@ -0,0 +1,67 @@
+from pydantic import BaseModel, Field, field_validator
+
+from datetime import datetime
+from typing import Optional
+
+from app.utils import naive_utc
+
+from .task import StatusEnum, PriorityEnum
+from .subtask import SubtaskCreate
+from .comment import CommentCreate
+
+
+class TaskImportRow(BaseModel):
+    """A line of tasks.ndjson; ``ref`` is the key subtasks and comments point to."""
+    ref: str = Field(..., min_length=1, max_length=255)
+    title: str = Field(..., min_length=1, max_length=255)
+    description: str | None = None
+    status: StatusEnum = StatusEnum.pending
+    priority: PriorityEnum = PriorityEnum.low
+    due_date: datetime | None = None
+    completed_at: datetime | None = None
+    estimated_time: int | None = Field(None, ge=0)
+    actual_time: int | None = Field(None, ge=0)
+    category_id: int | None = None
+    created_at: datetime | None = None
+
+    normalize_datetimes = field_validator("due_date", "completed_at", "created_at")(naive_utc)
+
+
+class SubtaskImportRow(SubtaskCreate):
+    """A line of subtasks.ndjson."""
+    task_ref: str = Field(..., min_length=1, max_length=255)
+    completed_at: datetime | None = None
+    created_at: datetime | None = None
+
+    normalize_datetimes = field_validator("completed_at", "created_at")(naive_utc)
+
+
+class CommentImportRow(CommentCreate):
+    """A line of comments.ndjson."""
+    task_ref: str = Field(..., min_length=1, max_length=255)
+    created_at: datetime | None = None
+
+    normalize_datetimes = field_validator("created_at")(naive_utc)
+
+
+class ImportRowError(BaseModel):
+    file: str = Field(..., description="Archive member the row comes from")
+    line: int = Field(..., description="Line number within the member")
+    error: str = Field(..., description="Why the row was rejected")
+
+
+class ImportJobOut(BaseModel):
+    """State of a bulk import job."""
+    job_id: str = Field(..., description="Job id")
+    status: str = Field(..., description="pending, running, completed or failed")
+    phase: Optional[str] = Field(None, description="validating or merging while running")
+    strict: bool = Field(False, description="Reject the whole import if any row is invalid")
+    created_at: datetime = Field(..., description="Job creation timestamp")
+    started_at: Optional[datetime] = Field(None, description="Job start timestamp")
+    finished_at: Optional[datetime] = Field(None, description="Job end timestamp")
+    progress: dict[str, int] = Field(default_factory=dict, description="Rows read per file kind")
+    total_rows: int = Field(0, description="Rows read in total")
+    imported: dict[str, int] = Field(default_factory=dict, description="Rows imported per kind")
+    error_count: int = Field(0, description="Rows rejected in total")
+    errors: list[ImportRowError] = Field(default_factory=list, description="Rejected rows (the first ones only)")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
@@ -55,9 +55,15 @@ class TaskReminderCreate(BaseModel):
 class ReminderOut(BaseModel):
     id: int
     task_id: int | None
+    user_id: int | None
     reminder_time: datetime
     is_sent: bool
     sent_at: datetime | None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ReminderOutPage(BaseModel):
+    reminders: list[ReminderOut]
+    next_cursor: str | None = None
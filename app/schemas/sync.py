@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+
+from datetime import datetime
+from typing import Literal
+
+from .task import TaskOut
+from .subtask import SubtaskOut
+from .comment import CommentOut
+from .category import CategoryOut
+from .reminder import ReminderOut
+
+
+SyncTable = Literal["tasks", "subtasks", "comments", "categories", "reminders"]
+
+
+class SyncTombstone(BaseModel):
+    """A row deleted since the previous sync."""
+    table: SyncTable = Field(..., description="Table the row was deleted from")
+    id: int = Field(..., description="Id of the deleted row")
+    deleted_at: datetime = Field(..., description="Deletion timestamp")
+
+
+class SyncOut(BaseModel):
+    """
+    A page of the rows changed since a sync token.
+
+    While ``has_more`` is set, pass ``token`` back to get the next page of the
+    same feed; the token only moves past the feed once it is drained. Rows
+    near the token may be sent again on the next sync, so clients should
+    upsert by id. Deleting a task also deletes its subtasks, comments and
+    reminders, which are not always listed separately.
+    """
+    token: str = Field(..., description="Pass as ``since`` on the next sync")
+    has_more: bool = Field(..., description="The feed continues; sync again with ``token`` right away")
+    full: bool = Field(..., description="The feed includes every row; replace the local copy once it is drained")
+    tasks: list[TaskOut] = Field(default_factory=list)
+    subtasks: list[SubtaskOut] = Field(default_factory=list)
+    comments: list[CommentOut] = Field(default_factory=list)
+    categories: list[CategoryOut] = Field(default_factory=list)
+    reminders: list[ReminderOut] = Field(default_factory=list)
+    deleted: list[SyncTombstone] = Field(default_factory=list)
@@ -61,3 +61,17 @@ class TaskOutBulkResponse(BaseModel):
     status: str
     message: str
     tasks: list[TaskOut]
+    next_cursor: str | None = None
+
+class TaskOutPage(BaseModel):
+    tasks: list[TaskOut]
+    next_cursor: str | None = None
+
+class TaskSearchHit(BaseModel):
+    task: TaskOut
+    rank: float
+    snippet: str | None = None
+
+class TaskSearchPage(BaseModel):
+    results: list[TaskSearchHit]
+    next_cursor: str | None = None
@@ -72,6 +72,11 @@ class UserOutAdmin(UserOut):
     is_superuser: bool
     last_login: datetime
 
+class UserOutAdminPage(BaseModel):
+    users: list[UserOutAdmin]
+    next_cursor: str | None = None
+    approximate_total: int | None = None
+
 class UserOutResponse(BaseModel):
     status: str
     message: str
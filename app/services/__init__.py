@@ -1 +1,10 @@
-from .redis_service import redis, save_refresh_token, delete_refresh_token, get_user_email_by_refresh_token
\ No newline at end of file
+from .redis_service import redis, save_refresh_token, delete_refresh_token, get_user_email_by_refresh_token
+from .task_counters import task_counter_delta, task_counter_delta_of, incr_task_counters, get_task_counters, begin_task_counter_rebuild, install_task_counters, delete_task_counters, \
+                           drop_category_counters, iter_task_counter_user_ids
+from .user_cache import get_cached_user, cache_user, invalidate_cached_user
+from .reminder_changes import REMINDER_CHANGES_CHANNEL, publish_reminder_change, parse_reminder_change
+from .backup import BACKUP_ROOT, new_job_id, create_job, get_job, save_job, run_backup, read_manifest, latest_manifest, backup_chain, run_restore, \
+                     get_sync_epoch
+from .log_reader import LOG_LEVELS, log_path, normalize_level, tail_records, follow_records
+from .stats_cache import get_or_compute, invalidate_cached_stats
+from .task_import import IMPORT_ROOT, run_import
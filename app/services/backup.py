@@ -0,0 +1,471 @@
+"""
+Streaming database backups.
+
+A backup is a directory ``backups/<backup_id>/`` holding one gzip-compressed
+NDJSON file per table plus a ``manifest.json``. Tables are read from a single
+REPEATABLE READ snapshot through server-side cursors and written partition by
+partition, so memory use does not grow with the size of the database.
+
+An incremental backup only holds the rows whose ``updated_at`` moved past the
+previous backup's watermark, plus the tombstones of rows deleted since. Its
+manifest points to that previous backup, so a full backup and the chain of
+incrementals after it can be restored together.
+
+Backups run as background jobs whose state is kept in Redis, so any worker
+can report the progress of a job started by another one.
+"""
+
+import asyncio
+import gzip
+import json
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, IO
+
+from redis.exceptions import RedisError
+from sqlalchemy import Column, Enum as SQLEnum, Table, delete, func, select, text
+
+from app.config import settings
+from app.database import Base, engine
+from app.models import Tombstone, sync_epoch_seq
+from app.services.redis_service import redis
+
+
+BACKUP_ROOT = Path("backups")
+BACKUP_FORMAT_VERSION = 2
+BACKUP_PARTITION_SIZE = 1000
+
+# Rows committed by transactions that started before the previous snapshot
+# carry an older updated_at; re-exporting a short window catches them.
+INCREMENTAL_OVERLAP = timedelta(minutes=5)
+TOMBSTONES_FILE = "_tombstones.ndjson.gz"
+
+_JOB_TTL_SECONDS = 7 * 86400
+_PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+def backup_tables() -> list[Table]:
+    """Tables included in a backup, parents before children."""
+    return [table for table in Base.metadata.sorted_tables if table.name != Tombstone.__tablename__]
+
+
+async def get_sync_epoch(conn: Any) -> int:
+    """The number of restores so far; sync tokens and backups record it."""
+    return await conn.scalar(text(
+        f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM {sync_epoch_seq.name}"
+    ))
+
+
+def backup_columns(table: Table) -> list[Column[Any]]:
+    # Generated columns are recomputed by the database on restore
+    return [column for column in table.columns if column.computed is None]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _enum_indexes(columns: list[Column[Any]]) -> list[int]:
+    return [index for index, column in enumerate(columns) if isinstance(column.type, SQLEnum)]
+
+
+def _write_rows(file: IO[bytes], keys: list[str], enum_indexes: list[int], rows: list[Any]) -> None:
+    # Runs in a worker thread: both encoding and compression are CPU bound
+    lines = []
+    for row in rows:
+        if enum_indexes:
+            # SQLAlchemy stores enum members by name, so that is the database label
+            row = list(row)
+            for index in enum_indexes:
+                if isinstance(row[index], Enum):
+                    row[index] = row[index].name
+        lines.append(json.dumps(dict(zip(keys, row)), default=_json_default, separators=(",", ":")).encode() + b"\n")
+    file.write(b"".join(lines))
+
+
+def _key(job_id: str) -> str:
+    return f"admin_job:{job_id}"
+
+
+def new_job_id(prefix: str) -> str:
+    return f"{prefix}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+async def save_job(job: dict[str, Any]) -> None:
+    try:
+        await redis.set(_key(job["job_id"]), json.dumps(job, default=_json_default), ex=_JOB_TTL_SECONDS)
+    except RedisError:
+        pass
+
+
+async def get_job(job_id: str) -> dict[str, Any] | None:
+    try:
+        raw = await redis.get(_key(job_id))
+    except RedisError:
+        return None
+    return json.loads(raw) if raw else None
+
+
+async def create_job(job_type: str, job_id: str | None = None, **extra: Any) -> dict[str, Any]:
+    job: dict[str, Any] = {
+        "job_id": job_id or new_job_id(job_type),
+        "type": job_type,
+        "status": "pending",
+        "created_at": datetime.utcnow(),
+        "started_at": None,
+        "finished_at": None,
+        "progress": {},
+        "total_rows": 0,
+        "error": None,
+        **extra,
+    }
+    await save_job(job)
+    return job
+
+
+class _ProgressReporter:
+    """Saves a job's progress at most once per interval."""
+
+    def __init__(self, job: dict[str, Any]):
+        self.job = job
+        self._last_saved = 0.0
+
+    async def add(self, table: str, rows: int) -> None:
+        self.job["progress"][table] = self.job["progress"].get(table, 0) + rows
+        self.job["total_rows"] += rows
+        if time.monotonic() - self._last_saved >= _PROGRESS_INTERVAL_SECONDS:
+            self._last_saved = time.monotonic()
+            await save_job(self.job)
+
+
+async def _dump_table(conn: Any, table: Table, path: Path, progress: _ProgressReporter, since: datetime | None = None) -> int:
+    columns = backup_columns(table)
+    keys = [column.key for column in columns]
+    enum_indexes = _enum_indexes(columns)
+    stmt = select(*columns)
+    if since is not None:
+        stmt = stmt.where(table.c.updated_at > since)
+    result = await conn.stream(stmt.execution_options(yield_per=BACKUP_PARTITION_SIZE))
+
+    rows_written = 0
+    file = await asyncio.to_thread(gzip.open, path, "wb")
+    try:
+        async for partition in result.partitions():
+            await asyncio.to_thread(_write_rows, file, keys, enum_indexes, list(partition))
+            rows_written += len(partition)
+            await progress.add(table.name, len(partition))
+    finally:
+        await asyncio.to_thread(file.close)
+    return rows_written
+
+
+async def _dump_tombstones(conn: Any, path: Path, since: datetime) -> int:
+    stmt = (
+        select(Tombstone.table_name, Tombstone.row_id)
+        .where(Tombstone.deleted_at > since)
+        .execution_options(yield_per=BACKUP_PARTITION_SIZE)
+    )
+    result = await conn.stream(stmt)
+
+    rows_written = 0
+    file = await asyncio.to_thread(gzip.open, path, "wb")
+    try:
+        async for partition in result.partitions():
+            await asyncio.to_thread(_write_rows, file, ["table", "id"], [], list(partition))
+            rows_written += len(partition)
+    finally:
+        await asyncio.to_thread(file.close)
+    return rows_written
+
+
+def latest_manifest() -> dict[str, Any] | None:
+    """Return the manifest of the most recent completed backup that has a watermark."""
+    latest = None
+    if not BACKUP_ROOT.is_dir():
+        return None
+    for path in BACKUP_ROOT.iterdir():
+        manifest = read_manifest(path.name)
+        if manifest is None or not manifest.get("watermark"):
+            continue
+        if latest is None or manifest["watermark"] > latest["watermark"]:
+            latest = manifest
+    return latest
+
+
+async def run_backup(job: dict[str, Any], kind: str = "full") -> None:
+    """
+    Write a full or incremental backup for ``job``; meant to run as a
+    background task.
+    """
+    backup_dir = BACKUP_ROOT / job["job_id"]
+    job.update(status="running", started_at=datetime.utcnow(), backup_path=str(backup_dir))
+    await save_job(job)
+
+    progress = _ProgressReporter(job)
+    manifest: dict[str, Any] = {
+        "backup_id": job["job_id"],
+        "format_version": BACKUP_FORMAT_VERSION,
+        "kind": kind,
+        "database_type": engine.dialect.name,
+        "created_at": datetime.utcnow(),
+        "tables": {},
+    }
+
+    try:
+        since = None
+        if kind == "incremental":
+            parent = await asyncio.to_thread(latest_manifest)
+            if parent is None:
+                raise ValueError("No previous backup to base an incremental backup on")
+            since = datetime.fromisoformat(parent["watermark"]) - INCREMENTAL_OVERLAP
+            # Older tombstones are pruned, the deletions since could not be listed
+            if since < datetime.utcnow() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS):
+                raise ValueError("The previous backup is older than the tombstone retention, take a full backup")
+            manifest.update(
+                parent_id=parent["backup_id"],
+                base_id=parent.get("base_id") or parent["backup_id"],
+                since=since
+            )
+
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        async with engine.connect() as conn:
+            # One snapshot for every table keeps foreign keys consistent
+            conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+            async with conn.begin():
+                # Taken first, so it is not later than the snapshot. Columns
+                # are timestamp without time zone, hence localtimestamp.
+                manifest["watermark"] = await conn.scalar(select(func.localtimestamp()))
+                manifest["sync_epoch"] = await get_sync_epoch(conn)
+                # A restore rewinds updated_at and clears the tombstones
+                if since is not None and parent.get("sync_epoch", 0) != manifest["sync_epoch"]:  # type: ignore
+                    raise ValueError("The database was restored after the previous backup, take a full backup")
+                for table in backup_tables():
+                    filename = f"{table.name}.ndjson.gz"
+                    rows = await _dump_table(conn, table, backup_dir / filename, progress, since)
+                    manifest["tables"][table.name] = {
+                        "file": filename,
+                        "rows": rows,
+                        "columns": [column.key for column in backup_columns(table)],
+                    }
+                if since is not None:
+                    manifest["tombstones"] = {
+                        "file": TOMBSTONES_FILE,
+                        "rows": await _dump_tombstones(conn, backup_dir / TOMBSTONES_FILE, since),
+                    }
+
+        manifest["completed_at"] = datetime.utcnow()
+        manifest_data = json.dumps(manifest, default=_json_default, indent=2)
+        await asyncio.to_thread((backup_dir / "manifest.json").write_text, manifest_data)
+
+        job.update(
+            status="completed",
+            finished_at=datetime.utcnow(),
+            file_size=sum(path.stat().st_size for path in backup_dir.iterdir())
+        )
+    except Exception as exc:
+        job.update(status="failed", finished_at=datetime.utcnow(), error=str(exc))
+    await save_job(job)
+
+
+def read_manifest(backup_id: str) -> dict[str, Any] | None:
+    """Return the manifest of a completed backup, or None if there is none."""
+    path = BACKUP_ROOT / backup_id / "manifest.json"
+    if not backup_id or "/" in backup_id or backup_id.startswith(".") or not path.is_file():
+        return None
+    manifest = json.loads(path.read_text())
+    return manifest if manifest.get("completed_at") else None
+
+
+def _column_parsers(table: Table, keys: list[str]) -> list[Any]:
+    parsers: list[Any] = []
+    for key in keys:
+        column = table.columns[key]
+        python_type = None
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            pass
+        if python_type is datetime:
+            parsers.append(datetime.fromisoformat)
+        elif python_type is date:
+            parsers.append(date.fromisoformat)
+        else:
+            parsers.append(None)
+    return parsers
+
+
+def _read_records(file: IO[bytes], keys: list[str], parsers: list[Any], size: int) -> list[tuple[Any, ...]]:
+    # Runs in a worker thread: decompression and parsing are CPU bound
+    records: list[tuple[Any, ...]] = []
+    for line in file:
+        data = json.loads(line)
+        records.append(tuple(
+            parse(value) if parse is not None and value is not None else value
+            for value, parse in ((data.get(key), parser) for key, parser in zip(keys, parsers))
+        ))
+        if len(records) >= size:
+            break
+    return records
+
+
+async def _copy_table(driver_conn: Any, table: Table, path: Path, keys: list[str], progress: _ProgressReporter) -> int:
+    parsers = _column_parsers(table, keys)
+    rows_copied = 0
+    file = await asyncio.to_thread(gzip.open, path, "rb")
+    try:
+        while records := await asyncio.to_thread(_read_records, file, keys, parsers, BACKUP_PARTITION_SIZE):
+            await driver_conn.copy_records_to_table(table.name, records=records, columns=keys)
+            rows_copied += len(records)
+            await progress.add(table.name, len(records))
+    finally:
+        await asyncio.to_thread(file.close)
+    return rows_copied
+
+
+async def _upsert_table(conn: Any, driver_conn: Any, table: Table, path: Path, keys: list[str], progress: _ProgressReporter) -> None:
+    # COPY into a scratch table first, then merge it with a single upsert
+    staging = f"_restore_{table.name}"
+    column_list = ", ".join(keys)
+    updates = ", ".join(f"{key} = EXCLUDED.{key}" for key in keys if key not in table.primary_key.columns)
+    conflict = ", ".join(column.name for column in table.primary_key.columns)
+
+    await conn.execute(text(f"CREATE TEMP TABLE {staging} (LIKE {table.name}) ON COMMIT DROP"))
+    parsers = _column_parsers(table, keys)
+    file = await asyncio.to_thread(gzip.open, path, "rb")
+    try:
+        while records := await asyncio.to_thread(_read_records, file, keys, parsers, BACKUP_PARTITION_SIZE):
+            await driver_conn.copy_records_to_table(staging, records=records, columns=keys)
+            await progress.add(table.name, len(records))
+    finally:
+        await asyncio.to_thread(file.close)
+
+    await conn.execute(text(
+        f"INSERT INTO {table.name} ({column_list}) SELECT {column_list} FROM {staging} "
+        f"ON CONFLICT ({conflict}) DO UPDATE SET {updates}"
+    ))
+    await conn.execute(text(f"DROP TABLE {staging}"))
+
+
+async def _apply_tombstones(conn: Any, path: Path, tables: dict[str, Table], progress: _ProgressReporter) -> None:
+    file = await asyncio.to_thread(gzip.open, path, "rb")
+    try:
+        while records := await asyncio.to_thread(_read_records, file, ["table", "id"], [None, None], BACKUP_PARTITION_SIZE):
+            ids_by_table: dict[str, list[int]] = {}
+            for table_name, row_id in records:
+                if table_name in tables:
+                    ids_by_table.setdefault(table_name, []).append(row_id)
+            for table_name, ids in ids_by_table.items():
+                table = tables[table_name]
+                await conn.execute(delete(table).where(table.c.id.in_(ids)))
+            await progress.add("tombstones", len(records))
+    finally:
+        await asyncio.to_thread(file.close)
+
+
+def backup_chain(backup_id: str) -> list[dict[str, Any]] | None:
+    """Return the manifests needed to restore a backup, full backup first."""
+    chain: list[dict[str, Any]] = []
+    manifest = read_manifest(backup_id)
+    while manifest is not None:
+        chain.append(manifest)
+        if manifest.get("kind", "full") == "full":
+            return chain[::-1]
+        manifest = read_manifest(manifest.get("parent_id") or "")
+    return None
+
+
+async def _reset_sequences(conn: Any, tables: list[Table]) -> None:
+    for table in tables:
+        for column in table.primary_key.columns:
+            if not column.autoincrement or column.type.python_type is not int:
+                continue
+            await conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{column.name}'), "
+                f"COALESCE(MAX({column.name}), 1), MAX({column.name}) IS NOT NULL) FROM {table.name}"
+            ))
+
+
+async def _clear_caches() -> None:
+    # Counters, cached users and statistics describe the data that was just replaced
+    try:
+        for pattern in ("task_counters:*", "user_cache:*", "stats_cache:*"):
+            keys = [key async for key in redis.scan_iter(match=pattern, count=1000)]
+            for start in range(0, len(keys), 1000):
+                await redis.delete(*keys[start:start + 1000])
+    except RedisError:
+        pass
+
+
+async def run_restore(job: dict[str, Any], backup_id: str) -> None:
+    """
+    Replace the contents of every backed up table with a backup; meant to run
+    as a background task.
+
+    For an incremental backup the full backup it is based on is loaded first
+    and every incremental up to the requested one is merged on top of it.
+    Everything happens in one transaction, so a failed restore leaves the
+    database untouched. The tombstones are cleared and the sync epoch is
+    advanced, so clients start over with a full sync.
+    """
+    job.update(status="running", started_at=datetime.utcnow())
+    await save_job(job)
+    progress = _ProgressReporter(job)
+
+    try:
+        chain = await asyncio.to_thread(backup_chain, backup_id)
+        if chain is None:
+            raise ValueError(f"Backup {backup_id} or one of the backups it depends on is missing")
+
+        full, incrementals = chain[0], chain[1:]
+        backup_dir = BACKUP_ROOT / full["backup_id"]
+        tables = [table for table in backup_tables() if table.name in full["tables"]]
+
+        async with engine.connect() as conn:
+            async with conn.begin():
+                is_superuser = await conn.scalar(text("SELECT current_setting('is_superuser') = 'on'"))
+                if is_superuser:
+                    # Skip foreign key triggers while loading
+                    await conn.execute(text("SET LOCAL session_replication_role = replica"))
+                else:
+                    # Tables load parents first, so only deferrable checks need help
+                    await conn.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+
+                await conn.execute(text(
+                    "TRUNCATE " + ", ".join(table.name for table in tables) + " RESTART IDENTITY CASCADE"
+                ))
+
+                raw_conn = await conn.get_raw_connection()
+                driver_conn = raw_conn.driver_connection
+                for table in tables:
+                    info = full["tables"][table.name]
+                    await _copy_table(driver_conn, table, backup_dir / info["file"], info["columns"], progress)
+
+                tables_by_name = {table.name: table for table in tables}
+                for manifest in incrementals:
+                    backup_dir = BACKUP_ROOT / manifest["backup_id"]
+                    for table in tables:
+                        info = manifest["tables"].get(table.name)
+                        if info and info["rows"]:
+                            await _upsert_table(conn, driver_conn, table, backup_dir / info["file"], info["columns"], progress)
+                    if manifest.get("tombstones", {}).get("rows"):
+                        await _apply_tombstones(conn, backup_dir / manifest["tombstones"]["file"], tables_by_name, progress)
+
+                await _reset_sequences(conn, tables)
+                # Older tombstones describe the replaced data, and the DELETEs
+                # above recorded new ones through the triggers
+                await conn.execute(text(f"TRUNCATE {Tombstone.__tablename__}"))
+                await conn.scalar(select(sync_epoch_seq.next_value()))
+
+        await _clear_caches()
+        job.update(status="completed", finished_at=datetime.utcnow())
+    except Exception as exc:
+        job.update(status="failed", finished_at=datetime.utcnow(), error=str(exc))
+    await save_job(job)
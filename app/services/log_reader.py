@@ -0,0 +1,207 @@
+"""
+Reading the application log for the admin API.
+
+The current log file is read backwards block by block, so returning the last
+N records costs O(N) regardless of the file size. Rotated segments
+(``app.log.1``, ``app.log.2026-10-16``, ``app.log.3.gz`` ...) are consulted
+newest first when the current file does not hold enough records.
+
+Lines are grouped into records: a line that carries a log level starts a
+record and lines without one (tracebacks, wrapped messages) belong to it.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
+
+from app.config import settings
+
+
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+_LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+_LEVEL_RE = re.compile(r"\b(DEBUG|INFO|WARNING|WARN|ERROR|CRITICAL|FATAL)\b")
+
+# Only the start of a line is searched for the level, so a message that
+# merely mentions "ERROR" does not change the level of its record.
+_LEVEL_PREFIX_LENGTH = 80
+_BLOCK_SIZE = 64 * 1024
+
+
+def log_path() -> Path:
+    return Path(settings.LOG_FILE)
+
+
+def normalize_level(level: str) -> str | None:
+    """Map a user supplied level name to a known level, or None if unknown."""
+    level = level.strip().upper()
+    level = _LEVEL_ALIASES.get(level, level)
+    return level if level in LOG_LEVELS else None
+
+
+def parse_level(line: str) -> str | None:
+    """Return the level of a record's first line, or None for a continuation line."""
+    if line.startswith("{"):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return normalize_level(str(data.get("level") or data.get("levelname") or ""))
+
+    match = _LEVEL_RE.search(line, 0, _LEVEL_PREFIX_LENGTH)
+    if match is None:
+        return None
+    level = match.group(1)
+    return _LEVEL_ALIASES.get(level, level)
+
+
+def _segments(path: Path) -> list[Path]:
+    """The current log file followed by its rotated segments, newest first."""
+    rotated = [
+        candidate for candidate in path.parent.glob(f"{path.name}.*")
+        if candidate.is_file()
+    ]
+    rotated.sort(key=lambda candidate: candidate.stat().st_mtime, reverse=True)
+    return ([path] if path.is_file() else []) + rotated
+
+
+def _reverse_lines(path: Path) -> Iterator[str]:
+    """Yield the lines of a plain file from last to first."""
+    with open(path, "rb") as file:
+        position = file.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            size = min(_BLOCK_SIZE, position)
+            position -= size
+            file.seek(position)
+            block = file.read(size) + remainder
+            lines = block.split(b"\n")
+            # The first piece may be the tail of a line from the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line.decode("utf-8", errors="replace")
+        if remainder:
+            yield remainder.decode("utf-8", errors="replace")
+
+
+def _gzip_reverse_lines(path: Path, keep: int) -> Iterator[str]:
+    # gzip cannot be read backwards; stream it forward keeping only the tail
+    with gzip.open(path, "rt", encoding="utf-8", errors="replace") as file:
+        tail = deque((line.rstrip("\n") for line in file if line.strip()), maxlen=keep)
+    yield from reversed(tail)
+
+
+def _reverse_records(segments: list[Path], keep: int) -> Iterator[tuple[str | None, str]]:
+    """Yield (level, text) records from newest to oldest across segments."""
+    for segment in segments:
+        lines = _gzip_reverse_lines(segment, keep) if segment.suffix == ".gz" else _reverse_lines(segment)
+        continuation: list[str] = []
+        for line in lines:
+            level = parse_level(line)
+            if level is None:
+                continuation.append(line)
+                continue
+            yield level, "\n".join([line, *reversed(continuation)])
+            continuation = []
+        if continuation:
+            yield None, "\n".join(reversed(continuation))
+
+
+def _passes(level: str | None, threshold: int) -> bool:
+    return not threshold or (level is not None and LOG_LEVELS[level] >= threshold)
+
+
+def tail_records(count: int, min_level: str | None = None, path: Path | None = None) -> list[dict[str, Any]]:
+    """
+    Return the last ``count`` records at or above ``min_level``, oldest first.
+
+    Blocking; call it from a worker thread.
+    """
+    threshold = LOG_LEVELS[min_level] if min_level else 0
+    # A gzip segment is read as a whole, keep enough lines for the records
+    keep = count * 20 if threshold else count * 5
+
+    records: list[dict[str, Any]] = []
+    for level, text in _reverse_records(_segments(path or log_path()), keep):
+        if not _passes(level, threshold):
+            continue
+        records.append({"level": level, "text": text})
+        if len(records) >= count:
+            break
+    records.reverse()
+    return records
+
+
+def _read_from(path: Path, offset: int) -> tuple[bytes, int, int]:
+    """Read everything after ``offset``, starting over if the file was rotated or truncated."""
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        if stat.st_size < offset:
+            offset = 0
+        file.seek(offset)
+        data = file.read()
+        return data, offset + len(data), stat.st_ino
+
+
+async def follow_records(
+    min_level: str | None = None,
+    poll_interval: float = 0.5,
+    heartbeat_interval: float = 15.0
+) -> AsyncIterator[dict[str, Any] | None]:
+    """
+    Yield records appended to the current log file from now on, across rotations.
+
+    None is yielded after ``heartbeat_interval`` seconds without records so
+    the caller can keep an idle stream open.
+    """
+    path = log_path()
+    threshold = LOG_LEVELS[min_level] if min_level else 0
+    stat = path.stat() if path.is_file() else None
+    offset = stat.st_size if stat else 0
+    inode = stat.st_ino if stat else None
+    pending = b""
+    current: dict[str, Any] | None = None
+    idle = 0.0
+
+    while True:
+        lines: list[bytes] = []
+        if path.is_file():
+            if path.stat().st_ino != inode:
+                # Rotated: the new file is read from its start
+                offset, pending = 0, b""
+            data, offset, inode = await asyncio.to_thread(_read_from, path, offset)
+            *lines, pending = (pending + data).split(b"\n")
+
+        for raw in lines:
+            line = raw.decode("utf-8", errors="replace")
+            if not line:
+                continue
+            level = parse_level(line)
+            if level is None and current is not None:
+                current["text"] += "\n" + line
+                continue
+            if current is not None and _passes(current["level"], threshold):
+                idle = 0.0
+                yield current
+            current = {"level": level, "text": line}
+
+        # Continuation lines are written together with their record, so once
+        # writes pause the last record is complete
+        if not lines and current is not None:
+            if _passes(current["level"], threshold):
+                idle = 0.0
+                yield current
+            current = None
+
+        if idle >= heartbeat_interval:
+            idle = 0.0
+            yield None
+
+        await asyncio.sleep(poll_interval)
+        idle += poll_interval
@@ -0,0 +1,31 @@
+"""
+Change notifications for reminders.
+
+Reminder crud functions publish ``<id>:<reminder_time>`` to a Redis channel
+after every commit (an empty time means the reminder no longer needs to
+fire), so the in-process schedulers of all workers stay up to date without
+querying the database.
+"""
+
+from datetime import datetime
+
+from redis.exceptions import RedisError
+
+from app.services.redis_service import redis
+
+
+REMINDER_CHANGES_CHANNEL = "reminders:changes"
+
+
+async def publish_reminder_change(reminder_id: int, reminder_time: datetime | None) -> None:
+    """Announce the new fire time of a reminder, or None if it was sent or deleted."""
+    try:
+        await redis.publish(REMINDER_CHANGES_CHANNEL, f"{reminder_id}:{reminder_time.isoformat() if reminder_time else ''}")
+    except RedisError:
+        # Schedulers pick the change up on their next reload
+        pass
+
+
+def parse_reminder_change(data: str) -> tuple[int, datetime | None]:
+    reminder_id, _, reminder_time = data.partition(":")
+    return int(reminder_id), datetime.fromisoformat(reminder_time) if reminder_time else None
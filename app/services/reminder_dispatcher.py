@@ -0,0 +1,253 @@
+"""
+Background dispatcher that delivers due reminders.
+
+Every API worker keeps the unsent reminders due within the next
+``REMINDER_SCHEDULER_HORIZON_MINUTES`` in an in-memory heap and sleeps until
+the earliest one, so reminders fire on time without polling the database.
+The heap is loaded from the ``(is_sent, reminder_time)`` index on startup and
+every half horizon, and kept current in between by the change notifications
+published by the reminder crud functions.
+
+When reminders fire they are claimed with ``FOR UPDATE SKIP LOCKED`` and
+marked sent in the same statement, so a reminder is delivered once even
+though every worker schedules it. Claimed reminders are pushed to their owner
+over WebSocket and emailed through Celery.
+"""
+
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.crud import claim_reminders, get_pending_reminder_times, get_oldest_due_reminder_time
+from app.database import SessionLocal
+from app.services.redis_service import redis
+from app.services.reminder_changes import REMINDER_CHANGES_CHANNEL, parse_reminder_change
+from app.tasks import send_reminder_emails_task
+from app.ws.events import notify_user_reminder
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderDispatcher:
+    def __init__(self, batch_size: int, horizon: timedelta, max_preload: int):
+        self.batch_size = batch_size
+        self.horizon = horizon
+        self.max_preload = max_preload
+
+        # Min-heap of (reminder_time, id); entries that no longer match
+        # _scheduled were rescheduled or cancelled and are skipped lazily.
+        self._heap: list[tuple[datetime, int]] = []
+        self._scheduled: dict[int, datetime] = {}
+        self._loaded_until = datetime.min
+        self._truncated = False
+        self._wakeup = asyncio.Event()
+        self._reload_requested = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+        self.dispatched_total = 0
+        self.batches_total = 0
+        self.errors_total = 0
+        self.last_batch_size = 0
+        self.last_batch_lag_seconds = 0.0
+        self.last_run_at: datetime | None = None
+        self.last_reload_at: datetime | None = None
+
+    async def start(self):
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run()),
+                asyncio.create_task(self._listen()),
+            ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def schedule(self, reminder_id: int, reminder_time: datetime | None):
+        """Add, move or (with None) cancel a reminder in the in-memory schedule."""
+        if reminder_time is None or reminder_time > self._loaded_until:
+            # Reminders beyond the horizon are picked up by the next reload
+            self._scheduled.pop(reminder_id, None)
+            return
+
+        self._scheduled[reminder_id] = reminder_time
+        heapq.heappush(self._heap, (reminder_time, reminder_id))
+        if self._heap[0] == (reminder_time, reminder_id):
+            self._wakeup.set()
+
+    async def reload(self):
+        """Rebuild the schedule from the database."""
+        until = datetime.utcnow() + self.horizon
+        async with SessionLocal() as session:
+            rows = await get_pending_reminder_times(session, until, self.max_preload)
+
+        self._truncated = len(rows) >= self.max_preload
+        if self._truncated:
+            # Only part of the horizon fits; the rest is loaded once it drains
+            until = rows[-1][1]
+
+        self._scheduled = dict(rows)
+        self._heap = [(reminder_time, reminder_id) for reminder_id, reminder_time in rows]
+        heapq.heapify(self._heap)
+        self._loaded_until = until
+        self.last_reload_at = datetime.utcnow()
+        self._wakeup.set()
+
+    def _pop_due(self, now: datetime) -> list[int]:
+        ids: list[int] = []
+        while self._heap and self._heap[0][0] <= now and len(ids) < self.batch_size:
+            reminder_time, reminder_id = heapq.heappop(self._heap)
+            if self._scheduled.get(reminder_id) == reminder_time:
+                del self._scheduled[reminder_id]
+                ids.append(reminder_id)
+        return ids
+
+    async def _deliver(self, rows: list[Any]):
+        now = datetime.utcnow()
+        self.last_run_at = now
+        self.last_batch_size = len(rows)
+        if not rows:
+            return
+
+        emails: list[dict[str, Any]] = []
+        for row in rows:
+            # Task-less reminders created before user_id existed have no owner
+            if row.user_id is None:
+                continue
+            await notify_user_reminder(row.user_id, {
+                "action": "due",
+                "reminder": {
+                    "id": row.id,
+                    "task_id": row.task_id,
+                    "task_title": row.task_title,
+                    "reminder_time": row.reminder_time.isoformat(),
+                }
+            })
+            if row.email:
+                emails.append({
+                    "email": row.email,
+                    "task_title": row.task_title,
+                    "reminder_time": row.reminder_time.isoformat(),
+                })
+
+        if emails:
+            # Publishing to the broker is blocking I/O
+            await asyncio.to_thread(send_reminder_emails_task.delay, emails)  # type: ignore
+
+        self.dispatched_total += len(rows)
+        self.batches_total += 1
+        self.last_batch_lag_seconds = (now - min(row.reminder_time for row in rows)).total_seconds()
+
+    async def _fire(self, reminder_ids: list[int]):
+        # Other workers race for the same ids; SKIP LOCKED lets only one win
+        async with SessionLocal() as session:
+            rows = await claim_reminders(session, reminder_ids)
+        await self._deliver(rows)
+
+    async def _run(self):
+        reload_interval = self.horizon.total_seconds() / 2
+        next_reload = 0.0
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                if (
+                    loop.time() >= next_reload
+                    or self._reload_requested.is_set()
+                    or (self._truncated and not self._scheduled)
+                ):
+                    self._reload_requested.clear()
+                    await self.reload()
+                    next_reload = loop.time() + reload_interval
+
+                while ids := self._pop_due(datetime.utcnow()):
+                    await self._fire(ids)
+
+                if self._truncated and not self._scheduled:
+                    continue
+
+                timeout = next_reload - loop.time()
+                if self._heap:
+                    timeout = min(timeout, (self._heap[0][0] - datetime.utcnow()).total_seconds())
+
+                self._wakeup.clear()
+                if timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors_total += 1
+                logger.exception("Reminder dispatch failed")
+                # Reload so reminders from a failed claim are retried
+                next_reload = loop.time() + 1
+
+    async def _listen(self):
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(REMINDER_CHANGES_CHANNEL)
+                # Changes may have been missed while not subscribed
+                self._reload_requested.set()
+                self._wakeup.set()
+                while True:
+                    message = await pubsub.get_message(timeout=None)
+                    if message is None or message["type"] != "message":
+                        continue
+                    self.schedule(*parse_reminder_change(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError):
+                logger.warning("Reminder change listener disconnected, retrying")
+            except Exception:
+                logger.exception("Reminder change listener failed")
+            finally:
+                try:
+                    await pubsub.aclose()
+                except RedisError:
+                    pass
+            await asyncio.sleep(1)
+
+    async def get_metrics(self) -> dict[str, Any]:
+        lag_seconds: float | None = None
+        try:
+            async with SessionLocal() as session:
+                oldest = await get_oldest_due_reminder_time(session)
+            lag_seconds = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+        except Exception:
+            pass
+
+        return {
+            "running": bool(self._tasks),
+            "lag_seconds": lag_seconds,
+            "scheduled": len(self._scheduled),
+            "loaded_until": self._loaded_until.isoformat() if self._tasks else None,
+            "dispatched_total": self.dispatched_total,
+            "batches_total": self.batches_total,
+            "errors_total": self.errors_total,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_lag_seconds": self.last_batch_lag_seconds,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_reload_at": self.last_reload_at.isoformat() if self.last_reload_at else None,
+        }
+
+
+reminder_dispatcher = ReminderDispatcher(
+    settings.REMINDER_DISPATCH_BATCH_SIZE,
+    timedelta(minutes=settings.REMINDER_SCHEDULER_HORIZON_MINUTES),
+    settings.REMINDER_SCHEDULER_MAX_PRELOAD
+)
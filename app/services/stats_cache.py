@@ -0,0 +1,117 @@
+"""
+Short-lived shared cache for expensive aggregate queries (dashboards, statistics).
+
+Values are JSON documents stored in Redis under ``stats_cache:<key>`` so every
+worker serves the same snapshot. Refreshes are single-flight: within a worker
+concurrent callers wait on one asyncio lock, and across workers the one that
+wins a Redis ``SET NX`` lock recomputes while the others wait for its result.
+When Redis is unavailable the value is computed directly.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from app.services.redis_service import redis
+
+
+_LOCK_TIMEOUT_SECONDS = 30
+_WAIT_POLL_SECONDS = 0.05
+
+_local_locks: dict[str, asyncio.Lock] = {}
+
+# Delete the lock only if it is still ours, it may have expired and been taken
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def _key(key: str) -> str:
+    return f"stats_cache:{key}"
+
+
+def _lock_key(key: str) -> str:
+    return f"stats_cache_lock:{key}"
+
+
+async def _read(key: str) -> Any | None:
+    raw = await redis.get(_key(key))
+    return json.loads(raw) if raw is not None else None
+
+
+async def _wait_for_value(key: str, timeout: float) -> Any | None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        await asyncio.sleep(_WAIT_POLL_SECONDS)
+        value = await _read(key)
+        if value is not None:
+            return value
+        if not await redis.exists(_lock_key(key)):
+            # The refresh failed or the lock expired, try to take over
+            return None
+    return None
+
+
+async def get_or_compute(key: str, ttl: int, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached JSON value of ``key``, computing and storing it on a miss.
+
+    ``compute`` must return a JSON serializable value. With ``ttl`` 0 the
+    cache is bypassed.
+    """
+    if ttl <= 0:
+        return await compute()
+
+    try:
+        value = await _read(key)
+    except RedisError:
+        return await compute()
+    if value is not None:
+        return value
+
+    lock = _local_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        try:
+            while True:
+                value = await _read(key)
+                if value is not None:
+                    return value
+
+                token = uuid.uuid4().hex
+                if await redis.set(_lock_key(key), token, nx=True, ex=_LOCK_TIMEOUT_SECONDS):
+                    break
+                value = await _wait_for_value(key, _LOCK_TIMEOUT_SECONDS)
+                if value is not None:
+                    return value
+        except RedisError:
+            return await compute()
+
+        try:
+            value = await compute()
+            try:
+                await redis.set(_key(key), json.dumps(value), ex=ttl)
+            except RedisError:
+                pass
+            return value
+        finally:
+            try:
+                await redis.eval(_RELEASE_SCRIPT, 1, _lock_key(key), token)  # type: ignore
+            except RedisError:
+                pass
+
+
+async def invalidate_cached_stats(*keys: str) -> None:
+    """Drop cached values so the next read recomputes them."""
+    if not keys:
+        return
+    try:
+        await redis.delete(*(_key(key) for key in keys))
+    except RedisError:
+        pass
@@ -0,0 +1,199 @@
+"""
+Per-user task counters kept in a Redis hash.
+
+The hash ``task_counters:{user_id}`` holds the number of tasks by status,
+priority and category together with the estimated/actual time totals, so
+statistics endpoints can be answered without scanning the tasks table.
+Counters are adjusted incrementally by the task crud functions and rebuilt
+from the database whenever the hash is missing.
+
+A rebuild first sets a marker ``task_counters_rebuild:{user_id}`` holding a
+random token, then recounts, then installs the result only if the marker
+still holds its token. While the marker lives, any increment drops the hash
+and spoils the marker instead of applying, since the recount may or may not
+include that write. The marker outlives the install by a short window so
+that an increment from a write committed before the recount, but applied
+after the install, invalidates the hash rather than counting twice.
+"""
+
+import uuid
+from collections import Counter
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.services.redis_service import redis
+from app.schemas import StatusEnum, PriorityEnum
+
+
+# Rebuilds must finish their recount within this window, and increments
+# arriving this long after an install still invalidate it.
+_REBUILD_WINDOW_SECONDS = 10
+
+# Only touch the hash if it has already been materialized; a missing hash is
+# rebuilt from the database on the next read instead of starting from zero.
+# During a rebuild the hash is dropped and the rebuild's install made to fail.
+_INCR_IF_EXISTS = redis.register_script("""
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('SET', KEYS[2], 'stale', 'KEEPTTL')
+    redis.call('DEL', KEYS[1])
+    return 0
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+""")
+
+# Replace the hash with a recount unless a write raced with it (ARGV[1] is
+# the rebuild token, then field/value pairs).
+_INSTALL_IF_CURRENT = redis.register_script("""
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 2, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+""")
+
+# drop_category_counters under the same rules as _INCR_IF_EXISTS
+_HDEL_UNLESS_REBUILDING = redis.register_script("""
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('SET', KEYS[2], 'stale', 'KEEPTTL')
+    redis.call('DEL', KEYS[1])
+    return 0
+end
+return redis.call('HDEL', KEYS[1], unpack(ARGV))
+""")
+
+
+def _key(user_id: int) -> str:
+    return f"task_counters:{user_id}"
+
+
+def _rebuild_key(user_id: int) -> str:
+    return f"task_counters_rebuild:{user_id}"
+
+
+def _value(enum_value: Any) -> str:
+    return enum_value.value if hasattr(enum_value, "value") else str(enum_value)
+
+
+def task_counter_delta(
+    status: StatusEnum | str | None,
+    priority: PriorityEnum | str | None,
+    category_id: int | None,
+    estimated_time: int | None = None,
+    actual_time: int | None = None,
+    count: int = 1,
+) -> Counter[str]:
+    """Build the counter fields contributed by ``count`` tasks with the given attributes."""
+    status_value = _value(status or StatusEnum.pending)
+    priority_value = _value(priority or PriorityEnum.low)
+
+    delta: Counter[str] = Counter({
+        "total": count,
+        f"status:{status_value}": count,
+        f"priority:{priority_value}": count,
+    })
+    if category_id is not None:
+        delta[f"category:{category_id}:total"] += count
+        delta[f"category:{category_id}:status:{status_value}"] += count
+    if estimated_time:
+        delta["estimated_time"] += estimated_time * (1 if count > 0 else -1)
+    if actual_time:
+        delta["actual_time"] += actual_time * (1 if count > 0 else -1)
+    return delta
+
+
+def task_counter_delta_of(task: Any, count: int = 1) -> Counter[str]:
+    """task_counter_delta for a Task instance or a RETURNING row with the same columns."""
+    return task_counter_delta(
+        task.status,
+        task.priority,
+        task.category_id,
+        getattr(task, "estimated_time", None),
+        getattr(task, "actual_time", None),
+        count,
+    )
+
+
+async def incr_task_counters(user_id: int, delta: Counter[str]) -> None:
+    """Apply a delta to a user's counters. Drops the hash on failure so the next read rebuilds it."""
+    args: list[Any] = []
+    for field, value in delta.items():
+        if value:
+            args.extend((field, value))
+    if not args:
+        return
+
+    try:
+        await _INCR_IF_EXISTS(keys=[_key(user_id), _rebuild_key(user_id)], args=args)
+    except RedisError:
+        await delete_task_counters(user_id)
+
+
+async def get_task_counters(user_id: int) -> dict[str, int] | None:
+    """Return the materialized counters of a user, or None if they must be rebuilt."""
+    try:
+        raw = await redis.hgetall(_key(user_id))  # type: ignore
+    except RedisError:
+        return None
+    if not raw:
+        return None
+    return {field: int(value) for field, value in raw.items()}
+
+
+async def begin_task_counter_rebuild(user_id: int) -> str | None:
+    """
+    Mark a user's counters as being rebuilt; call before recounting.
+
+    Returns the token to pass to install_task_counters, or None if Redis is
+    unavailable (the recount is then simply not cached).
+    """
+    token = uuid.uuid4().hex
+    try:
+        await redis.set(_rebuild_key(user_id), token, ex=_REBUILD_WINDOW_SECONDS)
+    except RedisError:
+        return None
+    return token
+
+
+async def install_task_counters(user_id: int, token: str, counters: dict[str, int]) -> bool:
+    """Store a recount started by begin_task_counter_rebuild, unless a write raced with it."""
+    mapping = {field: value for field, value in counters.items() if value}
+    mapping.setdefault("total", 0)
+    args: list[Any] = [token]
+    for field, value in mapping.items():
+        args.extend((field, value))
+    try:
+        return bool(await _INSTALL_IF_CURRENT(keys=[_key(user_id), _rebuild_key(user_id)], args=args))
+    except RedisError:
+        return False
+
+
+async def delete_task_counters(user_id: int) -> None:
+    try:
+        await redis.delete(_key(user_id))
+    except RedisError:
+        pass
+
+
+async def drop_category_counters(user_id: int, category_id: int) -> None:
+    """Forget a deleted category; its tasks keep counting towards the user totals."""
+    fields = [f"category:{category_id}:total"] + [f"category:{category_id}:status:{status.value}" for status in StatusEnum]
+    try:
+        await _HDEL_UNLESS_REBUILDING(keys=[_key(user_id), _rebuild_key(user_id)], args=fields)
+    except RedisError:
+        await delete_task_counters(user_id)
+
+
+async def iter_task_counter_user_ids():
+    """Yield the ids of users whose counters are currently materialized."""
+    async for key in redis.scan_iter(match=_key("*"), count=1000):
+        yield int(key.rsplit(":", 1)[1])
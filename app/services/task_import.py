@@ -0,0 +1,307 @@
+"""
+Bulk import of tasks with their subtasks and comments.
+
+An import is an archive (tar, optionally compressed, or zip) holding
+``tasks.ndjson``, ``subtasks.ndjson`` and ``comments.ndjson`` (each may also
+be gzipped). Tasks carry a client-side ``ref`` that subtasks and comments
+point to with ``task_ref``.
+
+The archive is read member by member and validated in chunks in a worker
+thread; valid rows are COPYed into temporary staging tables. Once everything
+is staged, references are checked and the rows are merged into the real
+tables with a few set-based statements, all in one transaction. Rejected
+rows are reported with their file and line number.
+
+Imports run in the Celery worker (see ``app.tasks.imports``); the job state
+lives in Redis next to the backup and restore jobs.
+"""
+
+import asyncio
+import gzip
+import json
+import shutil
+import tarfile
+import time
+import zipfile
+from collections import Counter
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Iterator
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import text
+
+from app.database import engine
+from app.schemas.imports import TaskImportRow, SubtaskImportRow, CommentImportRow
+from app.services.backup import save_job
+from app.services.task_counters import task_counter_delta, incr_task_counters
+
+
+IMPORT_ROOT = Path("imports")
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+_PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+class _Kind:
+    def __init__(self, name: str, model: type[BaseModel], columns: list[tuple[str, str]]):
+        self.name = name
+        self.model = model
+        self.columns = columns
+        self.staging = f"_import_{name}"
+
+    @property
+    def keys(self) -> list[str]:
+        return [column for column, _ in self.columns]
+
+
+# Staging columns; enums are staged as text and cast while merging
+KINDS = {
+    kind.name: kind for kind in (
+        _Kind("tasks", TaskImportRow, [
+            ("ref", "text"), ("title", "text"), ("description", "text"), ("status", "text"),
+            ("priority", "text"), ("due_date", "timestamp"), ("completed_at", "timestamp"),
+            ("estimated_time", "integer"), ("actual_time", "integer"), ("category_id", "integer"),
+            ("created_at", "timestamp"),
+        ]),
+        _Kind("subtasks", SubtaskImportRow, [
+            ("task_ref", "text"), ("title", "text"), ("is_completed", "boolean"),
+            ("completed_at", "timestamp"), ("created_at", "timestamp"),
+        ]),
+        _Kind("comments", CommentImportRow, [
+            ("task_ref", "text"), ("content", "text"), ("created_at", "timestamp"),
+        ]),
+    )
+}
+
+
+def _member_kind(name: str) -> str | None:
+    """tasks.ndjson, data/tasks.jsonl.gz ... -> "tasks"; None for unrelated members."""
+    stem = PurePosixPath(name).name
+    if stem.endswith(".gz"):
+        stem = stem[:-3]
+    for suffix in (".ndjson", ".jsonl"):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+            return stem if stem in KINDS else None
+    return None
+
+
+def _iter_members(path: Path) -> Iterator[tuple[str, str, IO[bytes]]]:
+    """Yield (member name, kind, file) in archive order without extracting to disk."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                kind = _member_kind(info.filename)
+                if kind is not None and not info.is_dir():
+                    with archive.open(info) as file:
+                        yield info.filename, kind, file
+        return
+
+    # Stream mode reads the tar sequentially, compressed or not
+    with tarfile.open(path, "r|*") as archive:
+        for member in archive:
+            kind = _member_kind(member.name)
+            if kind is None or not member.isfile():
+                continue
+            file = archive.extractfile(member)
+            if file is not None:
+                yield member.name, kind, file
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors(include_url=False)
+    )
+
+
+def _iter_chunks(path: Path, chunk_size: int) -> Iterator[tuple[str, list[tuple[Any, ...]], list[dict[str, Any]]]]:
+    """
+    Yield (kind, staging records, errors) for every chunk of lines in the archive.
+
+    Blocking; it is advanced from a worker thread.
+    """
+    for member_name, kind_name, raw in _iter_members(path):
+        kind = KINDS[kind_name]
+        file: IO[bytes] = gzip.GzipFile(fileobj=raw) if member_name.endswith(".gz") else raw  # type: ignore
+        records: list[tuple[Any, ...]] = []
+        errors: list[dict[str, Any]] = []
+
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = kind.model.model_validate(json.loads(line))
+            except ValueError as e:
+                message = _format_validation_error(e) if isinstance(e, ValidationError) else "invalid JSON"
+                errors.append({"file": member_name, "line": line_number, "error": message})
+            else:
+                values = row.model_dump(mode="python")
+                records.append((member_name, line_number, *(
+                    value.value if hasattr(value, "value") else value
+                    for value in (values[key] for key in kind.keys)
+                )))
+
+            if len(records) + len(errors) >= chunk_size:
+                yield kind_name, records, errors
+                records, errors = [], []
+
+        if records or errors:
+            yield kind_name, records, errors
+
+
+class _ImportState:
+    """Progress and rejected rows of a running import, saved to the job record."""
+
+    def __init__(self, job: dict[str, Any]):
+        self.job = job
+        self._last_saved = 0.0
+
+    def reject(self, errors: list[dict[str, Any]]) -> None:
+        self.job["error_count"] += len(errors)
+        room = IMPORT_MAX_REPORTED_ERRORS - len(self.job["errors"])
+        if room > 0:
+            self.job["errors"].extend(errors[:room])
+
+    async def read(self, kind: str, rows: int) -> None:
+        self.job["progress"][kind] = self.job["progress"].get(kind, 0) + rows
+        self.job["total_rows"] += rows
+        await self.save()
+
+    async def save(self, force: bool = False) -> None:
+        if force or time.monotonic() - self._last_saved >= _PROGRESS_INTERVAL_SECONDS:
+            self._last_saved = time.monotonic()
+            await save_job(self.job)
+
+
+async def _stage(conn: Any, driver_conn: Any, path: Path, state: _ImportState) -> None:
+    for kind in KINDS.values():
+        columns = ", ".join(f"{name} {type_}" for name, type_ in kind.columns)
+        await conn.execute(text(
+            f"CREATE TEMP TABLE {kind.staging} (file text, line integer, {columns}) ON COMMIT DROP"
+        ))
+    await conn.execute(text(f"ALTER TABLE {KINDS['tasks'].staging} ADD COLUMN task_id integer"))
+
+    chunks = _iter_chunks(path, IMPORT_CHUNK_SIZE)
+    while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+        kind_name, records, errors = chunk
+        kind = KINDS[kind_name]
+        if records:
+            await driver_conn.copy_records_to_table(kind.staging, records=records, columns=["file", "line", *kind.keys])
+        state.reject(errors)
+        await state.read(kind_name, len(records) + len(errors))
+
+
+async def _reject_rows(conn: Any, state: _ImportState, sql: str, message: str, **params: Any) -> None:
+    # ``sql`` deletes the offending staging rows and returns file, line and detail
+    result = await conn.execute(text(sql), params)
+    state.reject([
+        {"file": row.file, "line": row.line, "error": message.format(detail=row.detail)}
+        for row in result
+    ])
+
+
+async def _validate_references(conn: Any, user_id: int, state: _ImportState) -> None:
+    await _reject_rows(conn, state, """
+        DELETE FROM _import_tasks t
+        USING (
+            SELECT ctid, first_value(file || ':' || line) OVER (PARTITION BY ref ORDER BY file, line) AS first,
+                   row_number() OVER (PARTITION BY ref ORDER BY file, line) AS position
+            FROM _import_tasks
+        ) d
+        WHERE t.ctid = d.ctid AND d.position > 1
+        RETURNING t.file, t.line, d.first AS detail
+    """, "Duplicate ref, first defined at {detail}")
+
+    await _reject_rows(conn, state, """
+        DELETE FROM _import_tasks t
+        WHERE t.category_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM categories c WHERE c.id = t.category_id AND c.user_id = :user_id
+        )
+        RETURNING t.file, t.line, t.category_id AS detail
+    """, "Category {detail} not found", user_id=user_id)
+
+    for kind in ("subtasks", "comments"):
+        await _reject_rows(conn, state, f"""
+            DELETE FROM _import_{kind} s
+            WHERE NOT EXISTS (SELECT 1 FROM _import_tasks t WHERE t.ref = s.task_ref)
+            RETURNING s.file, s.line, s.task_ref AS detail
+        """, "Unknown task_ref {detail}")
+
+
+async def _merge(conn: Any, user_id: int) -> tuple[dict[str, int], Counter[str]]:
+    # Ids are drawn up front so children can be linked without RETURNING order guarantees
+    await conn.execute(text("ANALYZE _import_tasks"))
+    await conn.execute(text("UPDATE _import_tasks SET task_id = nextval(pg_get_serial_sequence('tasks', 'id'))"))
+
+    tasks = await conn.execute(text("""
+        INSERT INTO tasks (id, user_id, title, description, status, priority, due_date, completed_at,
+                           estimated_time, actual_time, category_id, created_at)
+        SELECT task_id, :user_id, title, description, CAST(status AS task_status), CAST(priority AS tasks_priority),
+               due_date, completed_at, estimated_time, actual_time, category_id, COALESCE(created_at, now())
+        FROM _import_tasks
+        ORDER BY file, line
+    """), {"user_id": user_id})
+    subtasks = await conn.execute(text("""
+        INSERT INTO subtasks (task_id, title, is_completed, completed_at, created_at)
+        SELECT t.task_id, s.title, s.is_completed, s.completed_at, COALESCE(s.created_at, now())
+        FROM _import_subtasks s JOIN _import_tasks t ON t.ref = s.task_ref
+        ORDER BY s.file, s.line
+    """))
+    comments = await conn.execute(text("""
+        INSERT INTO comments (task_id, user_id, content, created_at)
+        SELECT t.task_id, :user_id, c.content, COALESCE(c.created_at, now())
+        FROM _import_comments c JOIN _import_tasks t ON t.ref = c.task_ref
+        ORDER BY c.file, c.line
+    """), {"user_id": user_id})
+
+    delta: Counter[str] = Counter()
+    groups = await conn.execute(text("""
+        SELECT status, priority, category_id, count(*) AS count,
+               sum(estimated_time) AS estimated_time, sum(actual_time) AS actual_time
+        FROM _import_tasks
+        GROUP BY status, priority, category_id
+    """))
+    for row in groups:
+        delta.update(task_counter_delta(row.status, row.priority, row.category_id, row.estimated_time, row.actual_time, row.count))
+
+    imported = {"tasks": tasks.rowcount, "subtasks": subtasks.rowcount, "comments": comments.rowcount}
+    return imported, delta
+
+
+async def run_import(job: dict[str, Any]) -> None:
+    """
+    Import the archive of a job for its user.
+
+    Invalid rows are skipped and reported, unless the job is strict, in which
+    case any invalid row fails the whole import. Nothing is written unless the
+    import completes.
+    """
+    job.update(status="running", phase="validating", started_at=datetime.utcnow())
+    state = _ImportState(job)
+    await state.save(force=True)
+
+    archive_path = Path(job["archive_path"])
+    try:
+        async with engine.connect() as conn:
+            async with conn.begin():
+                raw_conn = await conn.get_raw_connection()
+                await _stage(conn, raw_conn.driver_connection, archive_path, state)
+
+                job["phase"] = "merging"
+                await state.save(force=True)
+                await _validate_references(conn, job["user_id"], state)
+                if job.get("strict") and job["error_count"]:
+                    raise ValueError(f"{job['error_count']} invalid rows, nothing was imported")
+
+                imported, delta = await _merge(conn, job["user_id"])
+
+        await incr_task_counters(job["user_id"], delta)
+        job.update(status="completed", phase=None, imported=imported, finished_at=datetime.utcnow())
+    except Exception as exc:
+        job.update(status="failed", phase=None, finished_at=datetime.utcnow(), error=str(exc))
+    finally:
+        await asyncio.to_thread(shutil.rmtree, archive_path.parent, True)
+    await state.save(force=True)
@@ -0,0 +1,121 @@
+"""
+Two-tier cache of authenticated users keyed by the token subject (email).
+
+The first tier is a small in-process TTL LRU, the second one is Redis and is
+shared by every worker. The local TTL is kept short because invalidations
+only clear the local tier of the worker that made the change.
+
+Credentials are never cached: a user restored from the cache has them
+unloaded, and the code that needs them (login, password change) reads them
+from the database.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlalchemy import DateTime
+
+from app.config import settings
+from app.models import User
+from app.services.redis_service import redis
+
+
+class TTLCache:
+    """Least-recently-used mapping whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+_local_cache = TTLCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_LOCAL_TTL_SECONDS)
+
+_UNCACHED_COLUMNS = {"hashed_password"}
+_CACHED_COLUMNS = [column.key for column in User.__table__.columns if column.key not in _UNCACHED_COLUMNS]
+_DATETIME_COLUMNS = {column.key for column in User.__table__.columns if isinstance(column.type, DateTime)}
+
+
+def _key(email: str) -> str:
+    return f"user_cache:{email}"
+
+
+def _serialize(user: User) -> dict[str, Any]:
+    return {key: getattr(user, key) for key in _CACHED_COLUMNS}
+
+
+def _dump(data: dict[str, Any]) -> str:
+    return json.dumps({
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in data.items()
+    })
+
+
+def _load(raw: str) -> dict[str, Any]:
+    # Entries written before credentials were excluded may still hold them
+    data = {key: value for key, value in json.loads(raw).items() if key not in _UNCACHED_COLUMNS}
+    for key in _DATETIME_COLUMNS:
+        if data.get(key) is not None:
+            data[key] = datetime.fromisoformat(data[key])
+    return data
+
+
+async def get_cached_user(email: str) -> dict[str, Any] | None:
+    """Return the cached column values of a user, checking the local tier first."""
+    data = _local_cache.get(email)
+    if data is not None:
+        return data
+
+    try:
+        raw = await redis.get(_key(email))
+    except RedisError:
+        return None
+    if raw is None:
+        return None
+
+    data = _load(raw)
+    _local_cache.set(email, data)
+    return data
+
+
+async def cache_user(user: User) -> None:
+    data = _serialize(user)
+    _local_cache.set(user.email, data)
+    try:
+        await redis.set(_key(user.email), _dump(data), ex=settings.USER_CACHE_TTL_SECONDS)
+    except RedisError:
+        pass
+
+
+async def invalidate_cached_user(email: str | None) -> None:
+    if email is None:
+        return
+    _local_cache.pop(email)
+    try:
+        await redis.delete(_key(email))
+    except RedisError:
+        pass
@@ -1,6 +1,10 @@
-from .email import send_verify_email_task, send_reset_password_email_task
+from .email import send_verify_email_task, send_reset_password_email_task, send_reminder_emails_task
+from .media import remove_media_files_task
+from .imports import import_tasks_task
+from .maintenance import prune_tombstones_task
 
 
 __all__ = [
-    "send_verify_email_task", "send_reset_password_email_task"
+    "send_verify_email_task", "send_reset_password_email_task", "send_reminder_emails_task",
+    "remove_media_files_task", "import_tasks_task", "prune_tombstones_task"
 ]
\ No newline at end of file
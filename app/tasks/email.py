@@ -3,7 +3,7 @@ from celery import Task # pyright: ignore[reportMissingTypeStubs]
 from typing import Any
 
 from app.core import celery_app
-from app.utils import send_verification_email, send_reset_password_email
+from app.utils import send_verification_email, send_reset_password_email, send_reminder_email
 
 
 class BaseTaskWithRetry(Task):
@@ -21,4 +21,10 @@ def send_verify_email_task(self: Any, email: str, verification_url: str):
 @celery_app.task(bind=True) # pyright: ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
 def send_reset_password_email_task(self: Any, email: str, verification_url: str):
     send_reset_password_email(email, verification_url)
-    return f"Parolni qayta tiklash emaili jo'natildi: {email}"
\ No newline at end of file
+    return f"Parolni qayta tiklash emaili jo'natildi: {email}"
+
+@celery_app.task(bind=True) # pyright: ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+def send_reminder_emails_task(self: Any, reminders: list[dict[str, Any]]):
+    for reminder in reminders:
+        send_reminder_email(reminder["email"], reminder["task_title"], reminder["reminder_time"])
+    return f"Eslatma emaillari jo'natildi: {len(reminders)}"
@@ -0,0 +1,25 @@
+import asyncio
+
+from typing import Any
+
+from app.core import celery_app
+from app.database import engine
+from app.services import redis, get_job, run_import
+
+
+async def _run(job_id: str) -> str:
+    try:
+        job = await get_job(job_id)
+        if job is None:
+            return f"Import topilmadi: {job_id}"
+        await run_import(job)
+        return f"Import yakunlandi: {job_id} ({job['status']})"
+    finally:
+        # Pooled asyncpg and Redis connections belong to this event loop
+        await engine.dispose()
+        await redis.connection_pool.disconnect()
+
+
+@celery_app.task(bind=True, time_limit=2 * 60 * 60) # pyright: ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+def import_tasks_task(self: Any, job_id: str):
+    return asyncio.run(_run(job_id))
@@ -0,0 +1,22 @@
+import asyncio
+
+from typing import Any
+
+from app.core import celery_app
+from app.database import engine, SessionLocal
+from app.crud.sync import prune_tombstones
+
+
+async def _prune_tombstones() -> int:
+    try:
+        async with SessionLocal() as session:
+            return await prune_tombstones(session)
+    finally:
+        # Pooled asyncpg connections belong to this event loop
+        await engine.dispose()
+
+
+@celery_app.task(bind=True) # pyright: ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+def prune_tombstones_task(self: Any):
+    removed = asyncio.run(_prune_tombstones())
+    return f"Eski tombstonelar o'chirildi: {removed}"
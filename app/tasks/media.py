@@ -0,0 +1,34 @@
+from pathlib import Path
+from typing import Any
+
+from app.core import celery_app
+from app.config import settings
+
+
+@celery_app.task(bind=True) # pyright: ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+def remove_media_files_task(self: Any, file_paths: list[str]):
+    """Remove attachment files (paths relative to MEDIA_ROOT) whose rows were deleted."""
+    media_root = Path(settings.MEDIA_ROOT).resolve()
+    removed = 0
+    directories: set[Path] = set()
+
+    for file_path in file_paths:
+        path = (media_root / file_path).resolve()
+        try:
+            path.relative_to(media_root)
+        except ValueError:
+            continue
+        if path.is_file():
+            path.unlink(missing_ok=True)
+            removed += 1
+        directories.add(path.parent)
+
+    # Attachments are stored per task, drop the folders left empty
+    for directory in directories:
+        if directory != media_root:
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+
+    return f"Fayllar o'chirildi: {removed}"
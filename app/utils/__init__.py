@@ -1,5 +1,12 @@
-from .email import check_domain, send_verification_email, send_reset_password_email
+from .email import check_domain, send_verification_email, send_reset_password_email, send_reminder_email
+from .pagination import encode_cursor, decode_cursor, cursor_int, cursor_number, cursor_datetime, estimate_count
+from .ndjson import iter_ndjson
+from .export import encode_ndjson_rows, encode_csv_rows, gzip_chunks
+from .timestamps import naive_utc
 
 __all__ = [
-    'check_domain', 'send_verification_email', "send_reset_password_email"
-]
\ No newline at end of file
+    'check_domain', 'send_verification_email', "send_reset_password_email", "send_reminder_email",
+    'encode_cursor', 'decode_cursor', 'cursor_int', 'cursor_number', 'cursor_datetime', 'estimate_count',
+    'iter_ndjson', 'encode_ndjson_rows', 'encode_csv_rows', 'gzip_chunks',
+    'naive_utc',
+]
@@ -1,4 +1,5 @@
 from dns import resolver
+import html as html_lib
 import requests
 from typing import Any
 
@@ -85,4 +86,20 @@ def send_reset_password_email(email: str, password_reset_url: str):
     </body>
     </html>
     """
-    _send_email("Parolni qayta tiklash", "Parolni qayta tiklash uchun quyidagi tugmadan foydalanishingiz mumkin.", html, email, "ToDo Application")  
\ No newline at end of file
+    _send_email("Parolni qayta tiklash", "Parolni qayta tiklash uchun quyidagi tugmadan foydalanishingiz mumkin.", html, email, "ToDo Application")  
+
+def send_reminder_email(email: str, task_title: str | None, reminder_time: str):
+    subject = task_title or "Eslatma"
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+    <body style="font-family: Arial; background:#f5f5f5; padding:30px;">
+    <div style="max-width:600px; margin:auto; background:white; padding:20px; border-radius:8px;">
+        <h2>Reminder</h2>
+        <p><b>{html_lib.escape(subject)}</b></p>
+        <p>Eslatma vaqti: {html_lib.escape(reminder_time)}</p>
+    </div>
+    </body>
+    </html>
+    """
+    _send_email(f"Eslatma: {subject}", f"Eslatma: {subject} ({reminder_time})", html, email, "ToDo Application")
@@ -0,0 +1,38 @@
+import json
+from typing import Any, AsyncIterator
+
+from fastapi import HTTPException
+
+
+MAX_LINE_BYTES = 1_048_576
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Parse a newline-delimited JSON byte stream, yielding (line number, value).
+
+    Only the current line is buffered, so memory does not grow with the body.
+    Blank lines are skipped; malformed or oversized lines raise 400.
+    """
+    buffer = b""
+    line_number = 0
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > max_line_bytes:
+            raise HTTPException(status_code=400, detail=f"Line {line_number + len(lines) + 1}: line too long")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, _loads(line, line_number)
+
+    if buffer.strip():
+        yield line_number + 1, _loads(buffer, line_number + 1)
+
+
+def _loads(line: bytes, line_number: int) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Line {line_number}: invalid JSON")
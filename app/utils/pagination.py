@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import datetime, date
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in cursor")
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    raw = json.dumps(values, default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise _invalid_cursor()
+
+    if not isinstance(values, list) or len(values) != size:
+        raise _invalid_cursor()
+
+    return values
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def cursor_int(value: Any) -> int:
+    """An integer field of a decoded cursor, raising 400 for anything else."""
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise _invalid_cursor()
+    return value
+
+
+def cursor_number(value: Any) -> float:
+    """A numeric field of a decoded cursor, raising 400 for anything else."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise _invalid_cursor()
+    return float(value)
+
+
+def cursor_datetime(value: Any) -> datetime:
+    """An ISO timestamp field of a decoded cursor, raising 400 for anything else."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise _invalid_cursor()
+
+
+async def estimate_count(session: AsyncSession, stmt: Select[Any]) -> int | None:
+    """
+    Planner estimate of the number of rows ``stmt`` returns, without running it.
+
+    Only available on PostgreSQL; returns None elsewhere or if planning fails.
+    """
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    sql = stmt.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    try:
+        # Passed to the driver as is, text() would treat ":" in literals as parameters
+        connection = await session.connection()
+        # A savepoint keeps a failed EXPLAIN from aborting the transaction
+        async with connection.begin_nested():
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = result.scalar()
+    except Exception:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -3,7 +3,7 @@ from uuid import uuid4
 from typing import Tuple
 
 import aiofiles
-from fastapi import UploadFile
+from fastapi import HTTPException, UploadFile
 
 
 def build_storage_paths(task_id: int, original_filename: str, media_root: Path) -> Tuple[Path, str]:
@@ -17,8 +17,13 @@ def build_storage_paths(task_id: int, original_filename: str, media_root: Path)
     return absolute_path, relative_path.as_posix()
 
 
-async def save_upload_file(upload: UploadFile, destination: Path, chunk_size: int = 1_048_576) -> int:
-    """Stream an UploadFile to disk and return the number of bytes written."""
+async def save_upload_file(upload: UploadFile, destination: Path, chunk_size: int = 1_048_576, max_size: int | None = None) -> int:
+    """
+    Stream an UploadFile to disk and return the number of bytes written.
+
+    If ``max_size`` is given and the upload is larger, the partial file is
+    removed and 413 is raised.
+    """
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
 
@@ -29,7 +34,13 @@ async def save_upload_file(upload: UploadFile, destination: Path, chunk_size: in
             if not chunk:
                 break
             total_written += len(chunk)
+            if max_size is not None and total_written > max_size:
+                break
             await output_file.write(chunk)
 
+    if max_size is not None and total_written > max_size:
+        destination.unlink(missing_ok=True)
+        raise HTTPException(status_code=413, detail=f"File is larger than {max_size} bytes")
+
     await upload.seek(0)
     return total_written
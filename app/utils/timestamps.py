@@ -0,0 +1,8 @@
+from datetime import datetime, timezone
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    """Convert an aware datetime to naive UTC, the way timestamps are stored; naive ones are kept as is."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
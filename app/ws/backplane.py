@@ -0,0 +1,156 @@
+"""
+Redis pub/sub backplane that lets every API worker reach its own sockets.
+
+Events are published once to ``ws:<channel>`` (``ws:global``, ``ws:reminders``,
+``ws:task:<id>``, ``ws:user:<id>``). Each worker subscribes only to the
+channels it has local sockets for and delivers what it receives to them, so
+every socket sees an event exactly once no matter which worker emitted it.
+"""
+
+import asyncio
+import logging
+from typing import Callable
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "ws:"
+
+DeliverCallback = Callable[[str, str, str | None], None]
+
+
+def _encode(text: str, coalesce_key: str | None) -> str:
+    # Serialized JSON never contains a raw newline, so it separates the key
+    return f"{coalesce_key or ''}\n{text}"
+
+
+def _decode(data: str) -> tuple[str, str | None]:
+    coalesce_key, _, text = data.partition("\n")
+    return text, coalesce_key or None
+
+
+class Backplane:
+    """
+    Fans events out to every worker through Redis.
+
+    ``deliver`` is called with the local channel name, the serialized message
+    and its coalesce key for every event received. When Redis is unavailable
+    events are delivered to the local sockets only.
+    """
+
+    def __init__(self, redis: Redis, deliver: DeliverCallback, reconnect_delay: float = 1.0):
+        self.redis = redis
+        self.deliver = deliver
+        self.reconnect_delay = reconnect_delay
+
+        self._wanted: set[str] = set()
+        self._subscribed: set[str] = set()
+        self._pubsub: PubSub | None = None
+        self._lock = asyncio.Lock()
+        self._has_channels = asyncio.Event()
+        self._listener: asyncio.Task[None] | None = None
+        self._connected = False
+
+    @property
+    def active(self) -> bool:
+        return self._listener is not None and self._connected
+
+    async def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._close_pubsub()
+
+    async def subscribe(self, channel: str):
+        """Start receiving a channel; awaited so no event after connect is missed."""
+        self._wanted.add(channel)
+        self._has_channels.set()
+        await self._sync(channel)
+
+    def unsubscribe(self, channel: str):
+        """Stop receiving a channel once its last local socket is gone."""
+        self._wanted.discard(channel)
+        if not self._wanted:
+            self._has_channels.clear()
+        asyncio.create_task(self._sync(channel))
+
+    async def publish(self, channel: str, text: str, coalesce_key: str | None = None):
+        """Publish a serialized event once for all workers."""
+        if self.active:
+            try:
+                await self.redis.publish(CHANNEL_PREFIX + channel, _encode(text, coalesce_key))
+                return
+            except RedisError:
+                logger.warning("Failed to publish to %s, delivering locally", channel)
+        self.deliver(channel, text, coalesce_key)
+
+    async def _sync(self, channel: str):
+        # Subscribe and unsubscribe calls can interleave; applying the wanted
+        # state under a lock keeps the final subscription set correct.
+        async with self._lock:
+            if self._pubsub is None or not self._connected:
+                return
+            try:
+                if channel in self._wanted and channel not in self._subscribed:
+                    await self._pubsub.subscribe(CHANNEL_PREFIX + channel)
+                    self._subscribed.add(channel)
+                elif channel not in self._wanted and channel in self._subscribed:
+                    await self._pubsub.unsubscribe(CHANNEL_PREFIX + channel)
+                    self._subscribed.discard(channel)
+            except RedisError:
+                logger.warning("Failed to update subscription to %s", channel)
+
+    async def _close_pubsub(self):
+        self._connected = False
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except RedisError:
+                pass
+            self._pubsub = None
+
+    async def _connect(self):
+        async with self._lock:
+            self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            self._subscribed.clear()
+            if self._wanted:
+                await self._pubsub.subscribe(*(CHANNEL_PREFIX + channel for channel in self._wanted))
+                self._subscribed.update(self._wanted)
+            await self.redis.ping()
+            self._connected = True
+
+    async def _listen(self):
+        while True:
+            try:
+                await self._connect()
+                while True:
+                    if not self._pubsub.subscribed:  # type: ignore
+                        await self._has_channels.wait()
+                        # A subscribe for the new channel is in flight
+                        await asyncio.sleep(0.05)
+                        continue
+                    message = await self._pubsub.get_message(timeout=1.0)  # type: ignore
+                    if message is None or message["type"] != "message":
+                        continue
+                    text, coalesce_key = _decode(message["data"])
+                    self.deliver(message["channel"][len(CHANNEL_PREFIX):], text, coalesce_key)
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError):
+                logger.warning("WebSocket backplane disconnected, retrying in %ss", self.reconnect_delay)
+            except Exception:
+                logger.exception("WebSocket backplane listener failed")
+            await self._close_pubsub()
+            await asyncio.sleep(self.reconnect_delay)
@@ -19,7 +19,8 @@ async def notify_task_updated(task_id: int, payload: dict):
         "type": "task_updated",
         "data": payload
     }
-    asyncio.create_task(manager.broadcast_task(task_id, message))
+    # Only the latest state of a task matters to a client that fell behind
+    asyncio.create_task(manager.broadcast_task(task_id, message, coalesce_key=f"task_updated:{task_id}"))
 
 
 async def notify_task_comment_created(task_id: int, payload: dict):
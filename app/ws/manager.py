@@ -3,133 +3,231 @@ WebSocket connection manager for handling real-time notifications.
 Manages connections for global notifications, per-task channels, and reminders.
 """
 
-from fastapi import WebSocket
-from typing import Dict, Set, Callable, Any
-import json
+from fastapi import WebSocket, status
+from typing import Dict, Set, Any
+from collections import deque
 from datetime import datetime
+from enum import Enum
+import asyncio
+import json
+
+from app.config import settings
+from app.services.redis_service import redis
+from app.ws.backplane import Backplane
+
+
+GLOBAL_CHANNEL = "global"
+REMINDERS_CHANNEL = "reminders"
+
+
+def task_channel(task_id: int) -> str:
+    return f"task:{task_id}"
+
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class SlowConsumerPolicy(str, Enum):
+    drop_oldest = "drop_oldest"
+    coalesce = "coalesce"
+    disconnect = "disconnect"
+
+
+class Connection:
+    """
+    A WebSocket together with its bounded outbound queue.
+
+    Messages are queued as already-serialized text and written by a
+    dedicated task, so a slow client only ever delays itself.
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: int, channel: str, max_queue: int, policy: SlowConsumerPolicy):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.channel = channel
+        self.max_queue = max_queue
+        self.policy = policy
+        self.queue: deque[tuple[str | None, str]] = deque()
+        self.dropped = 0
+        self._wakeup = asyncio.Event()
+        self.writer: asyncio.Task[None] | None = None
+
+    def enqueue(self, text: str, coalesce_key: str | None = None) -> bool:
+        """Queue a message. Returns False if the connection must be disconnected."""
+        if len(self.queue) >= self.max_queue:
+            if self.policy == SlowConsumerPolicy.disconnect:
+                return False
+
+            self.dropped += 1
+            replaced = False
+            if self.policy == SlowConsumerPolicy.coalesce and coalesce_key is not None:
+                # Newer state supersedes a queued message about the same thing.
+                for index, (key, _) in enumerate(self.queue):
+                    if key == coalesce_key:
+                        del self.queue[index]
+                        replaced = True
+                        break
+            if not replaced:
+                self.queue.popleft()
+
+        self.queue.append((coalesce_key, text))
+        self._wakeup.set()
+        return True
+
+    async def run_writer(self, on_error: Any):
+        try:
+            while True:
+                if not self.queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                _, text = self.queue.popleft()
+                await self.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            on_error(self.websocket)
 
 
 class ConnectionManager:
-    """Manages WebSocket connections and broadcasts messages."""
-
-    def __init__(self):
-        # Global notifications: set of WebSockets
-        self.global_connections: Set[tuple[WebSocket, int]] = set()  # (ws, user_id)
-        
-        # Per-task notifications: task_id -> set of (ws, user_id)
-        self.task_connections: Dict[int, Set[tuple[WebSocket, int]]] = {}
-        
-        # Reminders: set of (ws, user_id)
-        self.reminder_connections: Set[tuple[WebSocket, int]] = set()
+    """
+    Manages WebSocket connections and broadcasts messages.
+
+    Connections are indexed both by channel and by user, so a broadcast or a
+    targeted send only touches the sockets that should receive it. Each
+    message is serialized once, published through the Redis backplane so
+    every worker sees it, and handed to the per-connection queues.
+    """
+
+    def __init__(self, max_queue: int | None = None, policy: SlowConsumerPolicy | str | None = None):
+        self.max_queue = max_queue or settings.WS_SEND_QUEUE_SIZE
+        self.policy = SlowConsumerPolicy(policy or settings.WS_SLOW_CONSUMER_POLICY)
+
+        # Channel name -> sockets subscribed to it
+        self.channel_connections: Dict[str, Set[WebSocket]] = {}
+
+        # User id -> that user's sockets on any channel
+        self.user_connections: Dict[int, Set[WebSocket]] = {}
+
+        # Socket -> its connection state
+        self.connections: Dict[WebSocket, Connection] = {}
+
+        self.backplane = Backplane(redis, self._deliver_local)
+
+    async def _add(self, websocket: WebSocket, user_id: int, channel: str):
+        connection = Connection(websocket, user_id, channel, self.max_queue, self.policy)
+        connection.writer = asyncio.create_task(connection.run_writer(self._remove))
+        self.connections[websocket] = connection
+
+        if channel not in self.channel_connections:
+            self.channel_connections[channel] = set()
+            await self.backplane.subscribe(channel)
+        self.channel_connections[channel].add(websocket)
+
+        if user_id not in self.user_connections:
+            self.user_connections[user_id] = set()
+            await self.backplane.subscribe(user_channel(user_id))
+        self.user_connections[user_id].add(websocket)
+
+    def _remove(self, websocket: WebSocket):
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return
+
+        if connection.writer is not None and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+        sockets = self.channel_connections.get(connection.channel)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.channel_connections[connection.channel]
+                self.backplane.unsubscribe(connection.channel)
+
+        sockets = self.user_connections.get(connection.user_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.user_connections[connection.user_id]
+                self.backplane.unsubscribe(user_channel(connection.user_id))
+
+    async def _close_slow_consumer(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too slow"),
+                timeout=5
+            )
+        except Exception:
+            pass
 
     async def connect_global(self, websocket: WebSocket, user_id: int):
         """Add a connection to global notifications channel."""
         await websocket.accept()
-        self.global_connections.add((websocket, user_id))
+        await self._add(websocket, user_id, GLOBAL_CHANNEL)
 
     async def connect_task(self, websocket: WebSocket, user_id: int, task_id: int):
         """Add a connection to a per-task notifications channel."""
         await websocket.accept()
-        if task_id not in self.task_connections:
-            self.task_connections[task_id] = set()
-        self.task_connections[task_id].add((websocket, user_id))
+        await self._add(websocket, user_id, task_channel(task_id))
 
     async def connect_reminders(self, websocket: WebSocket, user_id: int):
         """Add a connection to reminders channel."""
         await websocket.accept()
-        self.reminder_connections.add((websocket, user_id))
+        await self._add(websocket, user_id, REMINDERS_CHANNEL)
 
     def disconnect_global(self, websocket: WebSocket, user_id: int):
         """Remove a connection from global notifications."""
-        self.global_connections.discard((websocket, user_id))
+        self._remove(websocket)
 
     def disconnect_task(self, websocket: WebSocket, user_id: int, task_id: int):
         """Remove a connection from a per-task channel."""
-        if task_id in self.task_connections:
-            self.task_connections[task_id].discard((websocket, user_id))
-            if not self.task_connections[task_id]:
-                del self.task_connections[task_id]
+        self._remove(websocket)
 
     def disconnect_reminders(self, websocket: WebSocket, user_id: int):
         """Remove a connection from reminders channel."""
-        self.reminder_connections.discard((websocket, user_id))
+        self._remove(websocket)
+
+    def _deliver_local(self, channel: str, text: str, coalesce_key: str | None = None):
+        """Queue serialized text on every local socket of a channel without awaiting any of them."""
+        if channel.startswith("user:"):
+            sockets = self.user_connections.get(int(channel[len("user:"):]))
+        else:
+            sockets = self.channel_connections.get(channel)
+        if not sockets:
+            return
+
+        slow = []
+        for websocket in sockets:
+            connection = self.connections.get(websocket)
+            if connection is not None and not connection.enqueue(text, coalesce_key):
+                slow.append(websocket)
+
+        for websocket in slow:
+            self._remove(websocket)
+            asyncio.create_task(self._close_slow_consumer(websocket))
 
-    async def broadcast_global(self, message: dict[str, Any]):
+    async def send_personal(self, websocket: WebSocket, message: dict[str, Any]):
+        """Queue a message for a single connection (e.g. handshake or pong)."""
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            connection.enqueue(self.serialize(message, timestamp=False))
+
+    async def broadcast_global(self, message: dict[str, Any], coalesce_key: str | None = None):
         """Broadcast a message to all global connections."""
-        disconnected = set()
-        for websocket, user_id in self.global_connections:
-            try:
-                await websocket.send_json(self._format_message(message))
-            except Exception:
-                disconnected.add((websocket, user_id))
-        
-        for conn in disconnected:
-            self.global_connections.discard(conn)
-
-    async def broadcast_task(self, task_id: int, message: dict[str, Any]):
+        await self.backplane.publish(GLOBAL_CHANNEL, self.serialize(message), coalesce_key)
+
+    async def broadcast_task(self, task_id: int, message: dict[str, Any], coalesce_key: str | None = None):
         """Broadcast a message to all connections in a task channel."""
-        if task_id not in self.task_connections:
-            return
+        await self.backplane.publish(task_channel(task_id), self.serialize(message), coalesce_key)
 
-        disconnected = set()
-        for websocket, user_id in self.task_connections[task_id]:
-            try:
-                await websocket.send_json(self._format_message(message))
-            except Exception:
-                disconnected.add((websocket, user_id))
-        
-        for conn in disconnected:
-            self.task_connections[task_id].discard(conn)
-
-    async def broadcast_reminders(self, message: dict[str, Any]):
+    async def broadcast_reminders(self, message: dict[str, Any], coalesce_key: str | None = None):
         """Broadcast a message to all reminder channel connections."""
-        disconnected = set()
-        for websocket, user_id in self.reminder_connections:
-            try:
-                await websocket.send_json(self._format_message(message))
-            except Exception:
-                disconnected.add((websocket, user_id))
-        
-        for conn in disconnected:
-            self.reminder_connections.discard(conn)
-
-    async def send_to_user(self, user_id: int, message: dict[str, Any]):
+        await self.backplane.publish(REMINDERS_CHANNEL, self.serialize(message), coalesce_key)
+
+    async def send_to_user(self, user_id: int, message: dict[str, Any], coalesce_key: str | None = None):
         """Send a message to a specific user across all their connections."""
-        disconnected = set()
-        
-        # Send to global connections
-        for websocket, uid in list(self.global_connections):
-            if uid == user_id:
-                try:
-                    await websocket.send_json(self._format_message(message))
-                except Exception:
-                    disconnected.add(('global', websocket, uid))
-        
-        # Send to task connections
-        for task_id in list(self.task_connections.keys()):
-            for websocket, uid in list(self.task_connections[task_id]):
-                if uid == user_id:
-                    try:
-                        await websocket.send_json(self._format_message(message))
-                    except Exception:
-                        disconnected.add(('task', task_id, websocket, uid))
-        
-        # Send to reminder connections
-        for websocket, uid in list(self.reminder_connections):
-            if uid == user_id:
-                try:
-                    await websocket.send_json(self._format_message(message))
-                except Exception:
-                    disconnected.add(('reminder', websocket, uid))
-        
-        # Clean up disconnected connections
-        for item in disconnected:
-            if item[0] == 'global':
-                self.global_connections.discard((item[1], item[2]))
-            elif item[0] == 'task':
-                self.task_connections[item[1]].discard((item[2], item[3]))
-            elif item[0] == 'reminder':
-                self.reminder_connections.discard((item[1], item[2]))
+        await self.backplane.publish(user_channel(user_id), self.serialize(message), coalesce_key)
 
     @staticmethod
     def _format_message(message: dict[str, Any]) -> dict[str, Any]:
@@ -139,6 +237,13 @@ class ConnectionManager:
             "ts": datetime.utcnow().isoformat()
         }
 
+    @classmethod
+    def serialize(cls, message: dict[str, Any], timestamp: bool = True) -> str:
+        """Serialize a message once; the same text is sent to every recipient."""
+        if timestamp:
+            message = cls._format_message(message)
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
 
 # Global instance
 manager = ConnectionManager()
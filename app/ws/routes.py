@@ -73,7 +73,7 @@ async def ws_notifications(
     await manager.connect_global(websocket, user.id)
     
     try:
-        await websocket.send_json({
+        await manager.send_personal(websocket, {
             "type": "connected",
             "data": {"message": "Connected to notifications"},
         })
@@ -82,7 +82,7 @@ async def ws_notifications(
             data = await websocket.receive_text()
             # Handle ping/pong
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                await manager.send_personal(websocket, {"type": "pong"})
     except WebSocketDisconnect:
         manager.disconnect_global(websocket, user.id)
 
@@ -119,7 +119,7 @@ async def ws_task(
     await manager.connect_task(websocket, user.id, task_id)
     
     try:
-        await websocket.send_json({
+        await manager.send_personal(websocket, {
             "type": "connected",
             "data": {"message": f"Connected to task {task_id}"},
         })
@@ -128,7 +128,7 @@ async def ws_task(
             data = await websocket.receive_text()
             # Handle ping/pong
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                await manager.send_personal(websocket, {"type": "pong"})
     except WebSocketDisconnect:
         manager.disconnect_task(websocket, user.id, task_id)
 
@@ -154,7 +154,7 @@ async def ws_reminders(
     await manager.connect_reminders(websocket, user.id)
     
     try:
-        await websocket.send_json({
+        await manager.send_personal(websocket, {
             "type": "connected",
             "data": {"message": "Connected to reminders"},
         })
@@ -163,6 +163,6 @@ async def ws_reminders(
             data = await websocket.receive_text()
             # Handle ping/pong
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                await manager.send_personal(websocket, {"type": "pong"})
     except WebSocketDisconnect:
         manager.disconnect_reminders(websocket, user.id)
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+
+# Tests marked ``database`` run against this PostgreSQL database and are
+# skipped without it; the others only need the app to import.
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+# Settings() requires these; nothing connects to the placeholder URL.
+for name, value in {
+    "DEBUG": "false",
+    "API_TITLE": "Todo API",
+    "API_VERSION": "test",
+    "DATABASE_URL": "postgresql+asyncpg://unused@localhost/unused",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_ALGORITHM": "HS256",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_RESULT_BACKEND": "cache+memory://",
+    "MAILTRAP_API_TOKEN": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "database: needs a PostgreSQL DATABASE_URL")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="DATABASE_URL is not set")
+    for item in items:
+        if "database" in item.keywords:
+            item.add_marker(skip)
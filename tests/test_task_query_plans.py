@@ -0,0 +1,328 @@
+"""
+Query plans of the app/crud/task.py reads.
+
+Every query a crud function sends is captured and run through
+EXPLAIN (FORMAT JSON) against a seeded and analyzed database, and must read
+``tasks`` through an index rather than a sequential scan. Deep keyset pages
+must also bound the index scan at the cursor, and the single-statement bulk
+delete is compared with the per-row ORM delete it replaced.
+
+Needs a PostgreSQL DATABASE_URL; the database is migrated to head and the
+seeded rows are rolled back afterwards. Sequential scans are disabled for the
+seeded transaction so the planner's choices do not hinge on table sizes.
+Skipped without DATABASE_URL.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Iterator
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.crud import task as crud
+from app.models import Task
+from app.utils import encode_cursor
+
+
+pytestmark = pytest.mark.database
+
+USERS = 40
+TASKS_PER_USER = 1500
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+async def _seed(conn: Any) -> list[int]:
+    tag = uuid.uuid4().hex[:8]
+    result = await conn.execute(text("""
+        INSERT INTO users (email, username, hashed_password, timezone)
+        SELECT 'plan_' || :tag || '_' || i || '@example.com', 'plan_' || :tag || '_' || i, 'x', 'UTC'
+        FROM generate_series(1, :users) i
+        RETURNING id
+    """), {"tag": tag, "users": USERS})
+    user_ids = [row.id for row in result]
+
+    # One in ten tasks has no due date, the rest spread around today
+    await conn.execute(text("""
+        INSERT INTO tasks (title, description, status, priority, due_date, user_id, created_at, updated_at)
+        SELECT (ARRAY['Write report', 'Review code', 'Plan sprint', 'Call client', 'Fix bug'])[1 + i % 5] || ' ' || i,
+               'Task number ' || i,
+               CAST((ARRAY['pending', 'in_progress', 'completed'])[1 + i % 3] AS task_status),
+               CAST((ARRAY['low', 'medium', 'high'])[1 + (i / 3) % 3] AS tasks_priority),
+               CASE WHEN i % 10 = 0 THEN NULL ELSE CAST(localtimestamp AS date) + (i % 400 - 200) END,
+               u.id, localtimestamp, localtimestamp
+        FROM unnest(CAST(:user_ids AS integer[])) AS u(id), generate_series(1, :tasks) i
+    """), {"user_ids": user_ids, "tasks": TASKS_PER_USER})
+    await conn.execute(text("ANALYZE users"))
+    await conn.execute(text("ANALYZE tasks"))
+    return user_ids
+
+
+@pytest.fixture(scope="module")
+def runner() -> Iterator[asyncio.Runner]:
+    command.upgrade(Config(str(Path(__file__).parents[1] / "alembic.ini")), "head")
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.fixture(scope="module")
+def db(runner: asyncio.Runner) -> Iterator[SimpleNamespace]:
+    engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+
+    async def open_() -> SimpleNamespace:
+        conn = await engine.connect()
+        transaction = await conn.begin()
+        user_ids = await _seed(conn)
+        # Small tables may still be cheaper to scan; take that choice away so
+        # plans are stable. A query no index can serve still gets a Seq Scan.
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        # Commits inside the crud functions only release a savepoint
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        user = SimpleNamespace(id=user_ids[0], timezone="UTC")
+        return SimpleNamespace(conn=conn, transaction=transaction, session=session, user=user, user_ids=user_ids)
+
+    async def close(db: SimpleNamespace) -> None:
+        await db.session.close()
+        await db.transaction.rollback()
+        await db.conn.close()
+        await engine.dispose()
+
+    db = runner.run(open_())
+    try:
+        yield db
+    finally:
+        runner.run(close(db))
+
+
+def _nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _task_scans(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        node for node in _nodes(plan)
+        if node.get("Relation Name") == "tasks" or node.get("Index Name", "").startswith(("ix_tasks_", "tasks_pkey"))
+    ]
+
+
+async def _explain(db: SimpleNamespace, call: Callable[[], Awaitable[Any]]) -> list[dict[str, Any]]:
+    """Run ``call`` and return the plans of the statements it sent."""
+    statements: list[Any] = []
+
+    def record(state: Any) -> None:
+        statements.append(state.statement)
+
+    event.listen(db.session.sync_session, "do_orm_execute", record)
+    try:
+        await call()
+    finally:
+        event.remove(db.session.sync_session, "do_orm_execute", record)
+
+    plans = []
+    for statement in statements:
+        sql = statement.compile(dialect=db.conn.dialect, compile_kwargs={"literal_binds": True})
+        plan = (await db.conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        plans.append(plan[0]["Plan"])
+    return plans
+
+
+def _assert_index_scans(plans: list[dict[str, Any]]) -> None:
+    assert plans, "no statement was captured"
+    for plan in plans:
+        scans = _task_scans(plan)
+        dump = json.dumps(plan, indent=2)
+        assert scans, f"tasks is not read:\n{dump}"
+        assert not any(node["Node Type"] == "Seq Scan" for node in scans), f"sequential scan on tasks:\n{dump}"
+        # A full walk of an index is a sequential scan in disguise
+        assert any(node["Node Type"] in INDEX_SCANS and node.get("Index Cond") for node in scans), \
+            f"no bounded index scan on tasks:\n{dump}"
+
+
+async def _drain(stream: Any) -> None:
+    async for _ in stream:
+        pass
+
+
+CRUD_READS: dict[str, Callable[[SimpleNamespace], Awaitable[Any]]] = {
+    "get_all_tasks_of_user": lambda db: crud.get_all_tasks_of_user(db.session, db.user),
+    "get_all_tasks_of_user_status": lambda db: crud.get_all_tasks_of_user(db.session, db.user, status=crud.StatusEnum.pending),
+    "get_all_tasks_of_user_priority": lambda db: crud.get_all_tasks_of_user(db.session, db.user, priority=crud.PriorityEnum.high),
+    "get_tasks_by_status": lambda db: crud.get_tasks_by_status(db.session, db.user, "in_progress"),
+    "get_tasks_by_priority": lambda db: crud.get_tasks_by_priority(db.session, db.user, "medium"),
+    "get_todays_tasks": lambda db: crud.get_todays_tasks(db.session, db.user),
+    "get_tomorrows_tasks": lambda db: crud.get_tomorrows_tasks(db.session, db.user),
+    "get_this_weeks_tasks": lambda db: crud.get_this_weeks_tasks(db.session, db.user),
+    "get_this_months_tasks": lambda db: crud.get_this_months_tasks(db.session, db.user),
+    "get_overdue_tasks": lambda db: crud.get_overdue_tasks(db.session, db.user),
+    "search_tasks_fts": lambda db: crud.search_tasks(db.session, db.user, "report"),
+    "search_tasks_trgm": lambda db: crud.search_tasks(db.session, db.user, "reprot"),
+    "compute_task_counters": lambda db: crud.compute_task_counters(db.session, db.user.id),
+    "stream_tasks_of_user": lambda db: _drain(crud.stream_tasks_of_user(db.session, db.user)),
+}
+
+
+@pytest.mark.parametrize("name", CRUD_READS)
+def test_crud_reads_use_indexes(runner: asyncio.Runner, db: SimpleNamespace, name: str) -> None:
+    plans = runner.run(_explain(db, lambda: CRUD_READS[name](db)))
+    _assert_index_scans(plans)
+
+
+def test_get_task_by_id_uses_primary_key(runner: asyncio.Runner, db: SimpleNamespace) -> None:
+    task_id = runner.run(db.session.scalar(text("SELECT id FROM tasks WHERE user_id = :user_id LIMIT 1"), {"user_id": db.user.id}))
+    plans = runner.run(_explain(db, lambda: crud.get_task_by_task_id(db.session, task_id)))
+    _assert_index_scans(plans)
+
+
+def _index_conditions(plans: list[dict[str, Any]]) -> list[str]:
+    return [node.get("Index Cond", "") for plan in plans for node in _nodes(plan) if node["Node Type"] in INDEX_SCANS]
+
+
+def test_deep_dated_page_is_bounded_by_the_cursor(runner: asyncio.Runner, db: SimpleNamespace) -> None:
+    row = runner.run(db.session.execute(text("""
+        SELECT due_date, id FROM tasks
+        WHERE user_id = :user_id AND due_date IS NOT NULL
+        ORDER BY due_date, id OFFSET 1200 LIMIT 1
+    """), {"user_id": db.user.id})).one()
+    cursor = encode_cursor([row.due_date, row.id])
+
+    plans = runner.run(_explain(db, lambda: crud.get_all_tasks_of_user(db.session, db.user, cursor=cursor)))
+    _assert_index_scans(plans)
+    # The cursor must be an index bound, not a filter over the rows before it
+    assert any("ROW(due_date, id) >" in condition for condition in _index_conditions(plans[:1])), plans[0]
+
+
+def test_deep_undated_page_is_bounded_by_the_cursor(runner: asyncio.Runner, db: SimpleNamespace) -> None:
+    last_id = runner.run(db.session.scalar(text("""
+        SELECT id FROM tasks WHERE user_id = :user_id AND due_date IS NULL ORDER BY id OFFSET 100 LIMIT 1
+    """), {"user_id": db.user.id}))
+    cursor = encode_cursor([None, last_id])
+
+    plans = runner.run(_explain(db, lambda: crud.get_all_tasks_of_user(db.session, db.user, cursor=cursor)))
+    _assert_index_scans(plans)
+    assert len(plans) == 1
+    conditions = _index_conditions(plans)
+    assert any("due_date IS NULL" in condition and "id >" in condition for condition in conditions), plans[0]
+
+
+BULK_DELETE = 200
+SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+async def _seed_children(db: SimpleNamespace, task_ids: list[int], user_id: int) -> None:
+    # Two subtasks and a comment per task, an attachment on every tenth
+    params = {"task_ids": task_ids, "user_id": user_id}
+    await db.conn.execute(text("""
+        INSERT INTO subtasks (title, task_id)
+        SELECT 'Step ' || n, t.id FROM unnest(CAST(:task_ids AS integer[])) AS t(id), generate_series(1, 2) n
+    """), {"task_ids": task_ids})
+    await db.conn.execute(text("""
+        INSERT INTO comments (content, task_id, user_id)
+        SELECT 'Looks good', t.id, :user_id FROM unnest(CAST(:task_ids AS integer[])) AS t(id)
+    """), params)
+    await db.conn.execute(text("""
+        INSERT INTO attachments (filename, file_path, file_size, mime_type, task_id, user_id)
+        SELECT 'notes.txt', t.id || '/' || md5(random()::text) || '.txt', 10, 'TEXT_PLAIN', t.id, :user_id
+        FROM unnest(CAST(:task_ids AS integer[])) AS t(id)
+        WHERE t.id % 10 = 0
+    """), params)
+    for table in ("subtasks", "comments", "attachments"):
+        await db.conn.execute(text(f"ANALYZE {table}"))
+
+
+async def _delete_per_row(session: AsyncSession, task_ids: list[int], user_id: int) -> int:
+    """delete_bulk_task before it became one statement: load every task and delete it through the ORM."""
+    result = await session.execute(select(Task).where(Task.id.in_(task_ids), Task.user_id == user_id))
+    tasks = result.scalars().all()
+    for task in tasks:
+        await session.delete(task)
+    await session.commit()
+    return len(tasks)
+
+
+async def _measure(db: SimpleNamespace, call: Callable[[], Awaitable[Any]]) -> tuple[Any, int, float]:
+    """Run ``call`` and return its result, the statements it sent and the seconds they took."""
+    timings: list[float] = []
+    started: list[float] = []
+
+    def before(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        started.append(time.perf_counter())
+
+    def after(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        elapsed = time.perf_counter() - started.pop()
+        # Savepoints stand in for the commits of the crud functions
+        if not statement.lstrip().upper().startswith(SAVEPOINT_STATEMENTS):
+            timings.append(elapsed)
+
+    sync_conn = db.conn.sync_connection
+    event.listen(sync_conn, "before_cursor_execute", before)
+    event.listen(sync_conn, "after_cursor_execute", after)
+    try:
+        result = await call()
+    finally:
+        event.remove(sync_conn, "before_cursor_execute", before)
+        event.remove(sync_conn, "after_cursor_execute", after)
+    return result, len(timings), sum(timings)
+
+
+async def _count(db: SimpleNamespace, table: str, task_ids: list[int]) -> int:
+    column = "id" if table == "tasks" else "task_id"
+    return await db.conn.scalar(
+        text(f"SELECT count(*) FROM {table} WHERE {column} = ANY(CAST(:task_ids AS integer[]))"),
+        {"task_ids": task_ids}
+    )
+
+
+def test_bulk_delete_beats_per_row_delete(runner: asyncio.Runner, db: SimpleNamespace, monkeypatch: pytest.MonkeyPatch) -> None:
+    owner = SimpleNamespace(id=db.user_ids[1], timezone="UTC")
+    task_ids = list(runner.run(db.session.scalars(text(
+        "SELECT id FROM tasks WHERE user_id = :user_id ORDER BY id LIMIT :limit"
+    ), {"user_id": owner.id, "limit": BULK_DELETE * 2 + 10})))
+    per_row_ids, bulk_ids, explained_ids = task_ids[:BULK_DELETE], task_ids[BULK_DELETE:-10], task_ids[-10:]
+    runner.run(_seed_children(db, task_ids, owner.id))
+    foreign_id = runner.run(db.session.scalar(text("SELECT id FROM tasks WHERE user_id = :user_id LIMIT 1"), {"user_id": db.user.id}))
+
+    queued: list[list[str]] = []
+    monkeypatch.setattr(crud, "remove_media_files_task", SimpleNamespace(delay=queued.append))
+    attachment_paths = set(runner.run(db.session.scalars(
+        text("SELECT file_path FROM attachments WHERE task_id = ANY(CAST(:task_ids AS integer[]))"), {"task_ids": bulk_ids}
+    )))
+
+    per_row_count, per_row_statements, per_row_seconds = runner.run(
+        _measure(db, lambda: _delete_per_row(db.session, per_row_ids, owner.id))
+    )
+    result, bulk_statements, bulk_seconds = runner.run(
+        _measure(db, lambda: crud.delete_bulk_task(db.session, bulk_ids + [foreign_id], owner))  # type: ignore
+    )
+    report = (
+        f"per-row: {per_row_statements} statements, {per_row_seconds * 1e3:.1f}ms; "
+        f"bulk: {bulk_statements} statements, {bulk_seconds * 1e3:.1f}ms"
+    )
+    print(report)
+
+    # Both delete the same rows; the other user's task is left alone
+    assert per_row_count == BULK_DELETE
+    assert result == {"deleted_task_count": BULK_DELETE}
+    for table in ("tasks", "subtasks", "comments", "attachments"):
+        assert runner.run(_count(db, table, per_row_ids + bulk_ids)) == 0, table
+    assert runner.run(_count(db, "tasks", [foreign_id])) == 1
+    assert [set(files) for files in queued] == [attachment_paths]
+
+    assert bulk_statements == 1, report
+    assert per_row_statements > BULK_DELETE, report
+    assert bulk_seconds < per_row_seconds, report
+
+    plans = runner.run(_explain(db, lambda: crud.delete_bulk_task(db.session, explained_ids, owner)))  # type: ignore
+    _assert_index_scans(plans)
+    assert any("id = ANY" in condition for condition in _index_conditions(plans)), plans[0]
@@ -0,0 +1,148 @@
+"""
+Fan-out cost of the WebSocket ConnectionManager.
+
+Connections are stub sockets and the Redis backplane is never started, so
+every event is delivered to the local sockets directly. Sending to one user
+or one task channel must only touch the sockets that receive it, and its
+latency must stay flat from 100 to 100k connections on the worker.
+"""
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from fastapi import status
+
+from app.ws.manager import Connection, ConnectionManager, SlowConsumerPolicy
+
+
+SIZES = (100, 1_000, 10_000, 100_000)
+SENDS = 2_000
+WATCHED_TASK = 1
+WATCHERS = 10
+
+# Generous, timings on shared runners are noisy; a per-socket scan of 100k
+# connections would be orders of magnitude slower than sending to 100.
+MAX_SLOWDOWN = 5.0
+
+
+class StubSocket:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.close_code: int | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE, reason: str | None = None) -> None:
+        self.close_code = code
+
+
+class StalledSocket(StubSocket):
+    """A client that never reads: every send blocks."""
+
+    async def send_text(self, text: str) -> None:
+        await asyncio.Event().wait()
+
+
+async def _grow(manager: ConnectionManager, size: int) -> None:
+    """Add connections until there are ``size``; two sockets per user, on the global and reminders channels."""
+    for index in range(len(manager.connections), size):
+        user_id = 1_000 + index // 2
+        websocket = StubSocket()
+        if index % 2:
+            await manager.connect_reminders(websocket, user_id)  # type: ignore
+        else:
+            await manager.connect_global(websocket, user_id)  # type: ignore
+
+
+async def _per_send(sends: int, send: Any) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for index in range(sends):
+            await send(index)
+        best = min(best, (time.perf_counter() - started) / sends)
+        # Let the writers drain their queues between rounds
+        await asyncio.sleep(0)
+    return best
+
+
+def _count_enqueues(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls = [0]
+    enqueue = Connection.enqueue
+
+    def counting(self: Connection, *args: Any, **kwargs: Any) -> bool:
+        calls[0] += 1
+        return enqueue(self, *args, **kwargs)
+
+    monkeypatch.setattr(Connection, "enqueue", counting)
+    return calls
+
+
+def test_targeted_sends_stay_flat(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _count_enqueues(monkeypatch)
+
+    async def run() -> dict[int, tuple[float, float]]:
+        manager = ConnectionManager(max_queue=SENDS * 3, policy=SlowConsumerPolicy.drop_oldest)
+        for user_id in range(WATCHERS):
+            await manager.connect_task(StubSocket(), user_id, WATCHED_TASK)  # type: ignore
+
+        latencies: dict[int, tuple[float, float]] = {}
+        for size in SIZES:
+            await _grow(manager, size)
+            users = size // 2
+
+            calls[0] = 0
+            await manager.send_to_user(1_000 + users - 1, {"type": "ping"})
+            assert calls[0] == 2, "send_to_user touched sockets of other users"
+
+            calls[0] = 0
+            await manager.broadcast_task(WATCHED_TASK, {"type": "ping"})
+            assert calls[0] == WATCHERS, "broadcast_task touched sockets outside the channel"
+
+            to_user = await _per_send(SENDS, lambda index: manager.send_to_user(1_000 + index * 7919 % users, {"type": "ping"}))
+            to_task = await _per_send(SENDS, lambda index: manager.broadcast_task(WATCHED_TASK, {"type": "ping"}))
+            latencies[size] = (to_user, to_task)
+
+        for connection in manager.connections.values():
+            if connection.writer is not None:
+                connection.writer.cancel()
+        return latencies
+
+    latencies = asyncio.run(run())
+    report = ", ".join(f"{size}: {user * 1e6:.1f}/{task * 1e6:.1f}us" for size, (user, task) in latencies.items())
+    smallest, largest = latencies[SIZES[0]], latencies[SIZES[-1]]
+    print(report)
+    assert largest[0] <= smallest[0] * MAX_SLOWDOWN, f"send_to_user slows down with connections ({report})"
+    assert largest[1] <= smallest[1] * MAX_SLOWDOWN, f"broadcast_task slows down with connections ({report})"
+
+
+def test_slow_consumer_is_closed_with_1013() -> None:
+    async def run() -> tuple[ConnectionManager, StubSocket, StubSocket]:
+        manager = ConnectionManager(max_queue=2, policy=SlowConsumerPolicy.disconnect)
+        stalled, healthy = StalledSocket(), StubSocket()
+        await manager.connect_global(stalled, 1)  # type: ignore
+        await manager.connect_global(healthy, 2)  # type: ignore
+
+        for index in range(5):
+            await manager.broadcast_global({"type": "ping", "index": index})
+            await asyncio.sleep(0)
+        # Closing happens in a task of its own
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        for connection in manager.connections.values():
+            if connection.writer is not None:
+                connection.writer.cancel()
+        return manager, stalled, healthy
+
+    manager, stalled, healthy = asyncio.run(run())
+    assert stalled.close_code == status.WS_1013_TRY_AGAIN_LATER
+    assert stalled not in manager.connections
+    assert 1 not in manager.user_connections
+    assert healthy.close_code is None
+    assert len(healthy.sent) == 5